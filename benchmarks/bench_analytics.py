@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Analytics throughput and peak memory over a large run history.
+
+Builds a history of synthetic runs (or reuses --db if it already exists),
+then runs the chunked analysis and writes both report formats. Peak memory
+should stay flat as --runs grows; only the chunk size moves it.
+
+    python benchmarks/bench_analytics.py [--runs 1000000] [--chunk 100000] [--db history.db]
+"""
+
+import argparse
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from analytics import analyze, write_csv, write_html
+from run_history import RunHistory, RunRecord
+
+CAUSES = ['Lvl 2 Shard Golem', 'Lvl 3 Crystal Spider', 'Lvl 4 Shadow Wraith', 'Lvl 4 Memory Eater',
+          'Lvl 6 Void Stalker', 'Mini-Boss: Void Stalker (Lvl 5)', 'Trapped Chest',
+          'Lvl 3 Shard Golem, Lvl 3 Crystal Spider']
+
+def populate(history: RunHistory, runs: int, batch: int = 100_000) -> None:
+    rng = np.random.default_rng(0)
+    for start in range(0, runs, batch):
+        n = min(batch, runs - start)
+        tiers = rng.integers(0, 4, n)
+        rooms = np.minimum(rng.poisson(4 + tiers * 3), 60)
+        enemies = rng.binomial(rooms, 0.5)
+        durations = rooms * rng.uniform(15, 60, n)
+        causes = rng.integers(0, len(CAUSES), n)
+        history.record_many(
+            RunRecord(f"player{p}", seed, 0.0, duration, CAUSES[cause], tier, room, enemy,
+                      room * 10 + max(0, room - 5) * 5 + enemy * 5, enemy * 30, room * 20, enemy, 80, 10, 5)
+            for p, seed, duration, cause, tier, room, enemy in zip(
+                rng.integers(0, 1000, n).tolist(), rng.integers(0, 50_000, n).tolist(), durations.tolist(),
+                causes.tolist(), tiers.tolist(), rooms.tolist(), enemies.tolist()))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=1_000_000)
+    parser.add_argument('--chunk', type=int, default=100_000)
+    parser.add_argument('--db', help="History to analyze; built with --runs runs if missing")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = args.db or os.path.join(directory, 'history.db')
+        if not os.path.exists(path):
+            start = time.perf_counter()
+            history = RunHistory(path)
+            populate(history, args.runs)
+            history.close()
+            print(f"Built {args.runs} runs in {time.perf_counter() - start:.1f}s")
+        before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        start = time.perf_counter()
+        analytics = analyze(path, args.chunk)
+        elapsed = time.perf_counter() - start
+        write_html(analytics, os.path.join(directory, 'report.html'))
+        write_csv(analytics, os.path.join(directory, 'report.csv'))
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f"Analyzed {analytics.runs} runs in {elapsed:.2f}s ({analytics.runs / elapsed:,.0f} runs/s)")
+        print(f"Peak RSS {peak / 1024:.0f} MB (+{max(0, peak - before) / 1024:.0f} MB during analysis)")
+        for row in analytics.tier_summary():
+            print(row)
+
+if __name__ == '__main__':
+    main()
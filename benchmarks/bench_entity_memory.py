@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""Memory footprint and allocation time of the entity classes.
+
+Compares the slotted dataclasses in entities.py against equivalent plain
+(__dict__-backed) dataclasses, for a 100x100 world and a batch of enemies.
+
+    python benchmarks/bench_entity_memory.py [--enemies 1000000] [--size 100]
+"""
+
+import argparse
+import contextlib
+import dataclasses
+import io
+import os
+import sys
+import time
+import tracemalloc
+import types
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import entities
+import pools
+import world_gen
+from world_gen import WorldGenerator
+
+ENTITY_CLASSES = ['Stats', 'Item', 'Enemy', 'NPC', 'Room', 'Player']
+
+def make_unslotted(cls):
+    """Rebuild a dataclass with the same fields but a per-instance __dict__."""
+    spec = []
+    for f in dataclasses.fields(cls):
+        if f.default is not dataclasses.MISSING:
+            spec.append((f.name, f.type, dataclasses.field(default=f.default)))
+        elif f.default_factory is not dataclasses.MISSING:
+            spec.append((f.name, f.type, dataclasses.field(default_factory=f.default_factory)))
+        else:
+            spec.append((f.name, f.type))
+    # Keep behaviour (methods, properties, custom __init__) while dropping __slots__
+    skip = {'__slots__', '__dict__', '__weakref__', '__dataclass_fields__',
+            '__dataclass_params__', '__match_args__', '__module__', '__qualname__', '__doc__'}
+    namespace = {
+        name: value for name, value in vars(cls).items()
+        if name not in skip and not isinstance(value, types.MemberDescriptorType)
+    }
+    return dataclasses.make_dataclass(cls.__name__, spec, namespace=namespace)
+
+SLOTTED = {name: getattr(entities, name) for name in ENTITY_CLASSES}
+UNSLOTTED = {name: make_unslotted(cls) for name, cls in SLOTTED.items()}
+
+@contextlib.contextmanager
+def use_classes(classes):
+    """Make world generation build the given entity classes."""
+    factories = {
+        pools.STATS_POOL: lambda: classes['Stats'](0, 0, 0, 0),
+        pools.ENEMY_POOL: lambda: classes['Enemy'](name="", stats=None),
+        pools.ITEM_POOL: lambda: classes['Item'](template_id="", effect_value=0),
+        pools.ROOM_POOL: lambda: classes['Room'](room_type="", description=""),
+    }
+    saved = {pool: pool.factory for pool in factories}
+    saved_npc = world_gen.NPC
+    for pool, factory in factories.items():
+        pool.clear()
+        pool.factory = factory
+    world_gen.NPC = classes['NPC']
+    try:
+        yield
+    finally:
+        for pool, factory in saved.items():
+            pool.clear()
+            pool.factory = factory
+        world_gen.NPC = saved_npc
+
+def make_enemy(classes, i):
+    return classes['Enemy'](
+        name="Lvl 3 Shard Golem",
+        stats=classes['Stats'](health=40 + i % 7, max_health=47, attack=12, defense=4),
+        level=3,
+        attack_pattern=['attack', 'shield'],
+        loot_table={'health_potion': 0.45, 'damage_crystal': 0.35},
+        experience_value=30
+    )
+
+def measure(build):
+    """Return (seconds, bytes) for one call of build()."""
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    result = build()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, after - before
+
+def per_instance_bytes(classes):
+    """Bytes per bare instance of each class (nested Stats excluded)."""
+    sizes = {}
+    stats = classes['Stats'](1, 1, 1, 1)
+    samples = {
+        'Stats': lambda: classes['Stats'](1, 1, 1, 1),
+        'Item': lambda: classes['Item'](template_id='health_potion', effect_value=20, rarity='common'),
+        'Enemy': lambda: classes['Enemy']("Golem", stats),
+        'NPC': lambda: classes['NPC']("Stranger", stats),
+        'Room': lambda: classes['Room']('combat', "A room"),
+        'Player': lambda: classes['Player']("Hero", stats),
+    }
+    count = 10000
+    for name, build in samples.items():
+        tracemalloc.start()
+        before, _ = tracemalloc.get_traced_memory()
+        # Exclude the default_factory containers so only the instance itself is counted
+        keep = [build() for _ in range(count)]
+        after, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        containers = sum(
+            sys.getsizeof(getattr(keep[0], f.name)) for f in dataclasses.fields(keep[0])
+            if f.default_factory is not dataclasses.MISSING
+        )
+        sizes[name] = (after - before - sys.getsizeof(keep)) / count - containers
+        del keep
+    return sizes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--enemies', type=int, default=1_000_000)
+    parser.add_argument('--size', type=int, default=100)
+    args = parser.parse_args()
+
+    print("Bytes per instance (excluding nested objects):")
+    print(f"  {'class':<8} {'dict':>8} {'slots':>8}")
+    before, after = per_instance_bytes(UNSLOTTED), per_instance_bytes(SLOTTED)
+    for name in ENTITY_CLASSES:
+        print(f"  {name:<8} {before[name]:>8.0f} {after[name]:>8.0f}")
+
+    for label, classes in (('dict', UNSLOTTED), ('slots', SLOTTED)):
+        def build_world():
+            with use_classes(classes), contextlib.redirect_stdout(io.StringIO()):
+                return WorldGenerator(depth=args.size, width=args.size).generate_world()
+        elapsed, used = measure(build_world)
+        print(f"\n{args.size}x{args.size} world ({label}): "
+              f"{elapsed * 1000:.0f} ms, {used / 1024 / 1024:.1f} MiB")
+
+        def build_batch():
+            return [make_enemy(classes, i) for i in range(args.enemies)]
+        elapsed, used = measure(build_batch)
+        print(f"{args.enemies} enemies ({label}): {elapsed:.2f} s, "
+              f"{used / 1024 / 1024:.1f} MiB, {used / args.enemies:.0f} bytes/enemy")
+
+if __name__ == '__main__':
+    main()
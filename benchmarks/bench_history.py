@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Run history query latency as the number of recorded runs grows.
+
+Fills a fresh history with synthetic runs in batched transactions, then
+times the leaderboard, personal best and per-seed queries at each size.
+
+    python benchmarks/bench_history.py [--runs 1000000] [--samples 200]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from run_history import RunHistory, RunRecord
+
+PROFILES = 1000
+SEEDS = 50_000
+
+def synthetic(rng: random.Random) -> RunRecord:
+    rooms = rng.randint(1, 25)
+    enemies = rng.randint(0, rooms * 2)
+    return RunRecord(
+        profile=f"player{rng.randrange(PROFILES)}",
+        seed=rng.randrange(SEEDS),
+        ended=time.time(),
+        duration=rng.uniform(30, 1800),
+        cause="Lvl 3 Void Stalker",
+        upgrade_tier=rng.randint(0, 3),
+        rooms_explored=rooms,
+        enemies_defeated=enemies,
+        shards_earned=rooms * 10 + enemies * 5,
+        damage_dealt=enemies * 30,
+        damage_taken=rooms * 20,
+        fights=enemies,
+        max_health=80,
+        attack=10,
+        defense=5,
+    )
+
+def timed(fn, args) -> float:
+    samples = []
+    for arg in args:
+        start = time.perf_counter()
+        fn(arg)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=1_000_000)
+    parser.add_argument('--samples', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=50_000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        history = RunHistory(os.path.join(directory, 'history.db'))
+        filled = 0
+        size = 10_000
+        print(f"{'runs':>10} {'top 10 ms':>10} {'best ms':>9} {'seed ms':>9}")
+        while filled < args.runs:
+            target = min(size, args.runs)
+            while filled < target:
+                count = min(args.batch, target - filled)
+                history.record_many(synthetic(rng) for _ in range(count))
+                filled += count
+            top = timed(lambda _: history.leaderboard('rooms_explored'), range(args.samples))
+            best = timed(history.personal_bests, [f"player{rng.randrange(PROFILES)}" for _ in range(args.samples)])
+            seed = timed(history.seed_runs, [rng.randrange(SEEDS) for _ in range(args.samples)])
+            print(f"{filled:>10} {top:>10.3f} {best:>9.3f} {seed:>9.3f}")
+            size *= 10
+        history.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Time per plan_best_value call on the stock Memory Forge tree across budgets.
+
+The forge `plan` command and the heuristic bot's purchases call it with the
+player's shards, so every budget from nothing to the whole tree is timed.
+Exits non-zero if the slowest budget takes longer than --limit.
+
+    python benchmarks/bench_planner.py [--step 250] [--repeat 5] [--limit 10]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from game import GameManager
+from upgrades import plan_best_value
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--step', type=int, default=250, help="Shards between budgets")
+    parser.add_argument('--repeat', type=int, default=5, help="Calls per budget (the fastest counts)")
+    parser.add_argument('--limit', type=float, default=10.0, help="Slowest budget allowed, in ms")
+    args = parser.parse_args()
+
+    upgrades = GameManager._initialize_upgrades(None)  # Uses no manager state
+    everything = sum(upgrade['cost'] * upgrade['max_purchases'] for upgrade in upgrades.values())
+    by_cost = {key: upgrade['cost'] / 100 for key, upgrade in upgrades.items()}
+
+    def timed(budget, values):
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            plan_best_value(upgrades, budget, values)
+            times.append(time.perf_counter() - start)
+        return min(times) * 1000
+
+    print(f"{'budget':>7} {'count ms':>9} {'by cost ms':>11}")
+    slowest = (0.0, 0)
+    for budget in range(0, everything + args.step, args.step):
+        count = timed(budget, None)  # What the game asks for
+        print(f"{budget:>7} {count:>9.2f} {timed(budget, by_cost):>11.2f}")
+        slowest = max(slowest, (count, budget))
+    print(f"slowest: {slowest[0]:.2f} ms at {slowest[1]} shards (limit {args.limit:g} ms)")
+    if slowest[0] > args.limit:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
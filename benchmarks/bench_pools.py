@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""GC pauses with and without entity pooling over a soak of many runs.
+
+Each run generates a world, fights every combat room (without input) and
+drops loot, then ends. The pooled pass returns rooms, enemies and loot to the
+pools; the unpooled pass never releases, so every acquire allocates.
+
+    python benchmarks/bench_pools.py [--runs 10000] [--size 5]
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pools
+from combat import CombatSystem
+from entities import Player, Stats
+from world_gen import WorldGenerator
+
+class GCTimer:
+    """Collects the duration of every garbage collection via gc.callbacks."""
+
+    def __init__(self):
+        self.pauses = []
+        self._start = 0.0
+
+    def __call__(self, phase, info):
+        if phase == 'start':
+            self._start = time.perf_counter()
+        else:
+            self.pauses.append(time.perf_counter() - self._start)
+
+def fight(combat: CombatSystem) -> list:
+    """Resolve a fight without input: the player always hits the first enemy."""
+    loot = []
+    while combat.enemies:
+        target = combat.enemies[0]
+        target.stats.take_damage(combat.player.stats.attack + target.stats.defense + 20)
+        if not target.stats.is_alive():
+            combat.defeated_enemies.append(target)
+            combat.enemies.remove(target)
+            loot.append(combat.generate_loot_item('health_potion', target.level))
+    return loot
+
+def soak(runs: int, size: int, pooled: bool) -> dict:
+    for pool in pools.POOLS:
+        pool.clear()
+    gc.collect()
+    timer = GCTimer()
+    gc.callbacks.append(timer)
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(runs):
+                player = Player(name="Bot", stats=Stats(10_000, 10_000, 30, 5))
+                _, rooms = WorldGenerator(depth=size, width=size).generate_world()
+                for room in rooms:
+                    if not room.enemies:
+                        continue
+                    combat = CombatSystem(player, room.enemies)
+                    loot = fight(combat)
+                    if pooled:
+                        combat.release_defeated()
+                        for item in loot:
+                            pools.ITEM_POOL.release(item)
+                if pooled:
+                    pools.release_world(rooms)
+    finally:
+        gc.callbacks.remove(timer)
+    elapsed = time.perf_counter() - start
+    return {
+        'elapsed': elapsed,
+        'collections': len(timer.pauses),
+        'total_pause': sum(timer.pauses),
+        'max_pause': max(timer.pauses, default=0.0),
+        'pools': pools.pool_stats()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10_000)
+    parser.add_argument('--size', type=int, default=5)
+    args = parser.parse_args()
+
+    for label, pooled in (('unpooled', False), ('pooled', True)):
+        result = soak(args.runs, args.size, pooled)
+        print(f"{label}: {result['elapsed']:.2f} s, {result['collections']} collections, "
+              f"total pause {result['total_pause'] * 1000:.1f} ms, "
+              f"max pause {result['max_pause'] * 1000:.2f} ms")
+        for name, counters in result['pools'].items():
+            print(f"  {name:<6} hits={counters['hits']} misses={counters['misses']} "
+                  f"high_water={counters['high_water']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Profile store load/save latency as the number of profiles grows.
+
+Fills a fresh database with synthetic profiles in batched transactions,
+then times loading and saving randomly chosen profiles at each size.
+
+    python benchmarks/bench_profiles.py [--profiles 100000] [--samples 500]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from profile_store import ProfileStore
+
+UPGRADES = ['max_health', 'attack', 'defense', 'shard_magnet', 'quick_learner', 'crystal_affinity',
+            'battle_mastery', 'void_touched', 'shard_well', 'echo_chamber']
+
+def profile(i: int) -> dict:
+    return {
+        'player': {'stats': {'health': 80, 'max_health': 80, 'attack': 10, 'defense': 5},
+                   'memory_shards': i % 5000},
+        'upgrades': {key: (i + n) % 4 for n, key in enumerate(UPGRADES)},
+        'statistics': {'enemies_defeated': i % 300, 'deaths': i % 40},
+        'meta': {'journal_seq': 0},
+    }
+
+def timed(fn, ids) -> float:
+    samples = []
+    for profile_id in ids:
+        start = time.perf_counter()
+        fn(profile_id)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', type=int, default=100_000)
+    parser.add_argument('--samples', type=int, default=500)
+    parser.add_argument('--batch', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = ProfileStore(os.path.join(directory, 'profiles.db'))
+        filled = 0
+        size = 1000
+        print(f"{'profiles':>10} {'load ms':>9} {'save ms':>9}")
+        while filled < args.profiles:
+            target = min(size, args.profiles)
+            while filled < target:
+                count = min(args.batch, target - filled)
+                store.save_profiles((f"player{i}", profile(i)) for i in range(filled, filled + count))
+                filled += count
+            ids = [f"player{random.randrange(filled)}" for _ in range(args.samples)]
+            load = timed(store.load_profile, ids)
+            save = timed(lambda profile_id: store.save_profile(profile_id, profile(7)), ids)
+            print(f"{filled:>10} {load:>9.3f} {save:>9.3f}")
+            size *= 10
+        store.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Bytes and time per frame: diff renderer vs clearing and reprinting.
+
+Renders a fight's worth of combat screens, where only health lines and the
+last action change between frames, into an in-memory terminal.
+
+    python benchmarks/bench_screen.py [--frames 2000]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from screen import Screen
+from utils import Fore, format_health, print_colored
+
+def draw(out, turn: int) -> None:
+    print_colored("\n=== COMBAT ROOM ===", Fore.CYAN, bold=True, end='\n')
+    print("\nThe air hums with restless shards. Broken pillars ring the chamber.", file=out)
+    print(f"\nYou: Hero [HP: {format_health(80 - turn % 60, 80)}]", file=out)
+    for i in range(3):
+        health = 45 - turn % 40 if i == 0 else 45  # The first one is under attack
+        print(f"{i + 1}. Lvl 3 Void Stalker [HP: {format_health(health, 45)}]", file=out)
+    print("\nAvailable exits: north, east, south", file=out)
+    print(f"\nYou hit Lvl 3 Void Stalker for {turn % 9 + 3} damage!", file=out)
+    out.write("\nWhat would you like to do? (attack [1/2/3], use, flee): ")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=2000)
+    args = parser.parse_args()
+
+    plain = io.StringIO()
+    start = time.perf_counter()
+    stdout, sys.stdout = sys.stdout, plain
+    try:
+        for turn in range(args.frames):
+            plain.write('\x1b[H\x1b[2J\x1b[3J')  # What `clear` prints, after forking a process
+            draw(plain, turn)
+    finally:
+        sys.stdout = stdout
+    plain_time = time.perf_counter() - start
+
+    term = Screen(io.StringIO(), size=lambda: (100, 40))
+    start = time.perf_counter()
+    stdout, sys.stdout = sys.stdout, term
+    try:
+        for turn in range(args.frames):
+            term.clear()
+            draw(term, turn)
+            term.flush()
+    finally:
+        sys.stdout = stdout
+    diff_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(20):
+        os.system('true')
+    fork = (time.perf_counter() - start) / 20
+
+    print(f"{'':>10} {'bytes/frame':>12} {'us/frame':>9}")
+    print(f"{'reprint':>10} {len(plain.getvalue()) / args.frames:>12.0f} {plain_time / args.frames * 1e6:>9.1f}"
+          f"  (+{fork * 1e6:.0f} us to fork clear)")
+    print(f"{'diff':>10} {term.bytes_written / args.frames:>12.0f} {diff_time / args.frames * 1e6:>9.1f}")
+
+if __name__ == '__main__':
+    main()
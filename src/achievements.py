@@ -0,0 +1,120 @@
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from event_bus import (EventBus, GameEvent, EnemyDefeated, FightEnded, RoomExplored, RunStarted,
+                       ShardsGained, UpgradePurchased)
+
+# Achievements are compiled into counters indexed by the bus topic they
+# listen to. An event only visits the locked achievements of its own topic,
+# and a topic is unsubscribed once all of its achievements are unlocked, so
+# nothing ever rescans rooms, inventories or history.
+
+@dataclass(frozen=True, slots=True)
+class Achievement:
+    key: str
+    name: str
+    description: str
+    topic: Type[GameEvent]
+    when: Callable[[Any], bool] = lambda event: True
+    count: int = 1  # Progress needed to unlock
+    amount: Callable[[Any], int] = lambda event: 1  # Progress per matching event
+    reset_on: Tuple[Type[GameEvent], ...] = ()  # Topics that zero the progress
+
+_LEVEL_PREFIX = re.compile(r'^(Mini-Boss: )?(Lvl \d+ )?')
+_LEVEL_SUFFIX = re.compile(r' \(Lvl \d+\)$')
+
+def enemy_kind(name: str) -> str:
+    """'Lvl 3 Void Stalker' -> 'Void Stalker'."""
+    return _LEVEL_SUFFIX.sub('', _LEVEL_PREFIX.sub('', name))
+
+ACHIEVEMENTS: Tuple[Achievement, ...] = (
+    Achievement('first_blood', "First Blood", "Defeat an enemy", EnemyDefeated),
+    Achievement('stalker_bane', "Stalker Bane", "Defeat 25 Void Stalkers", EnemyDefeated,
+                when=lambda e: enemy_kind(e.name) == 'Void Stalker', count=25),
+    Achievement('rampage', "Rampage", "Defeat 10 enemies in a single run", EnemyDefeated,
+                count=10, reset_on=(RunStarted,)),
+    Achievement('bare_hands', "Bare Hands", "Defeat a mini-boss without using items", FightEnded,
+                when=lambda e: e.won and e.mini_boss and not e.items_used),
+    Achievement('cartographer', "Cartographer", "Explore every room of a world", RoomExplored,
+                when=lambda e: e.rooms_explored >= e.world_size),
+    Achievement('deep_diver', "Deep Diver", "Explore 15 rooms in a single run", RoomExplored,
+                when=lambda e: e.rooms_explored >= 15),
+    Achievement('hoarder', "Hoarder", "Collect 5000 Memory Shards", ShardsGained,
+                count=5000, amount=lambda e: e.amount),
+    Achievement('patient', "Patient", "Gather 100 Memory Shards from Shard Wells", ShardsGained,
+                when=lambda e: e.source == 'idle', count=100, amount=lambda e: e.amount),
+    Achievement('forged', "Forged Anew", "Buy 10 Memory Forge upgrades", UpgradePurchased, count=10),
+)
+
+class AchievementEngine:
+    """Tracks progress and unlocks for a set of achievements."""
+
+    def __init__(self, achievements: Tuple[Achievement, ...] = ACHIEVEMENTS,
+                 clock: Callable[[], float] = time.time):
+        self.achievements: Dict[str, Achievement] = {a.key: a for a in achievements}
+        self.clock = clock
+        self.progress: Dict[str, int] = dict.fromkeys(self.achievements, 0)
+        self.unlocked: Dict[str, float] = {}  # key -> unlock time
+        self.recent: List[str] = []  # Unlocked since the last pop_recent()
+        self.bus: Optional[EventBus] = None
+        self._by_topic: Dict[type, List[Achievement]] = {}
+        self._resets: Dict[type, List[str]] = {}
+        self._index()
+
+    def attach(self, bus: EventBus) -> None:
+        self.bus = bus
+        self._index()
+
+    def _index(self) -> None:
+        """Index locked achievements by topic and subscribe to exactly those topics."""
+        if self.bus:
+            for topic in set(self._by_topic) | set(self._resets):
+                self.bus.unsubscribe(topic, self.handle)
+        self._by_topic = {}
+        self._resets = {}
+        for achievement in self.achievements.values():
+            if achievement.key in self.unlocked:
+                continue
+            self._by_topic.setdefault(achievement.topic, []).append(achievement)
+            for topic in achievement.reset_on:
+                self._resets.setdefault(topic, []).append(achievement.key)
+        if self.bus:
+            for topic in set(self._by_topic) | set(self._resets):
+                self.bus.subscribe(topic, self.handle)
+
+    def handle(self, event: GameEvent) -> None:
+        topic = type(event)
+        for key in self._resets.get(topic, ()):
+            self.progress[key] = 0
+        unlocked = False
+        for achievement in self._by_topic.get(topic, ()):
+            if achievement.when(event):
+                self.progress[achievement.key] += achievement.amount(event)
+                if self.progress[achievement.key] >= achievement.count:
+                    self.unlocked[achievement.key] = self.clock()
+                    self.recent.append(achievement.key)
+                    unlocked = True
+        if unlocked:
+            self._index()  # Rare: drop the finished achievements from the index
+
+    def pop_recent(self) -> List[Achievement]:
+        recent = [self.achievements[key] for key in self.recent]
+        self.recent = []
+        return recent
+
+    def to_dict(self) -> Dict[str, Dict]:
+        return {
+            'unlocked': dict(self.unlocked),
+            'progress': {key: value for key, value in self.progress.items()
+                         if value and key not in self.unlocked},
+        }
+
+    def load(self, data: Dict[str, Dict]) -> None:
+        self.unlocked = {key: at for key, at in data.get('unlocked', {}).items() if key in self.achievements}
+        self.progress = dict.fromkeys(self.achievements, 0)
+        self.progress.update((key, value) for key, value in data.get('progress', {}).items()
+                             if key in self.progress)
+        self.recent = []
+        self._index()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""Balance report over the run history: death depth, shard income and killers.
+
+Runs are streamed out of the history database in chunks into NumPy arrays
+and folded into fixed-size accumulators (histograms, per-tier sums, killer
+counts), so memory is bounded by the chunk size however many runs have
+been recorded. The report is HTML, or CSV if the output ends in .csv.
+
+    python src/analytics.py saves/history.db report.html [--profile NAME] [--chunk 100000]
+"""
+
+import argparse
+import csv
+import html
+import sqlite3
+import time
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from achievements import enemy_kind
+
+MAX_DEPTH = 40  # Deaths deeper than this share the last depth bin
+MAX_TIER = 3  # Highest Memory Forge tier
+RATE_EDGES = np.array([0, 1, 2, 5, 10, 20, 50, 100, 200, np.inf])  # Shards per minute
+
+Chunk = Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List[str]]
+
+def read_chunks(path: str, chunk_size: int = 100_000, profile: Optional[str] = None) -> Iterator[Chunk]:
+    """(upgrade tier, rooms explored, shards earned, duration, causes) arrays, chunk_size runs at a time."""
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)  # The game may be writing meanwhile
+    try:
+        sql = "SELECT upgrade_tier, rooms_explored, shards_earned, duration, cause FROM runs"
+        cursor = db.execute(sql + " WHERE profile = ?", (profile,)) if profile is not None else db.execute(sql)
+        while rows := cursor.fetchmany(chunk_size):
+            tiers, depths, shards, durations, causes = zip(*rows)
+            yield (np.array(tiers, dtype=np.int64), np.array(depths, dtype=np.int64),
+                   np.array(shards, dtype=np.float64), np.array(durations, dtype=np.float64), causes)
+    finally:
+        db.close()
+
+class RunAnalytics:
+    """Aggregates over runs, fed one chunk at a time."""
+
+    def __init__(self, max_depth: int = MAX_DEPTH, max_tier: int = MAX_TIER):
+        self.max_depth = max_depth
+        self.max_tier = max_tier
+        self.runs = 0
+        self.depths = np.zeros((max_tier + 1, max_depth + 1), dtype=np.int64)  # [tier, rooms explored]
+        self.shards = np.zeros(max_tier + 1)  # Per tier
+        self.minutes = np.zeros(max_tier + 1)
+        self.rates = np.zeros(len(RATE_EDGES) - 1, dtype=np.int64)  # Runs per shards/minute bin
+        self.killers: Counter = Counter()  # Enemy kind or event -> deaths
+
+    def add(self, tiers: np.ndarray, depths: np.ndarray, shards: np.ndarray,
+            durations: np.ndarray, causes: List[str]) -> None:
+        tiers = np.clip(tiers, 0, self.max_tier)
+        depths = np.clip(depths, 0, self.max_depth)
+        width = self.max_depth + 1
+        self.depths += np.bincount(tiers * width + depths, minlength=self.depths.size).reshape(self.depths.shape)
+        minutes = durations / 60
+        self.shards += np.bincount(tiers, weights=shards, minlength=self.max_tier + 1)
+        self.minutes += np.bincount(tiers, weights=minutes, minlength=self.max_tier + 1)
+        self.rates += np.histogram(shards / np.maximum(minutes, 1 / 60), RATE_EDGES)[0]
+        for cause, count in Counter(causes).items():  # Few distinct causes per chunk
+            for killer in cause.split(', '):
+                self.killers[enemy_kind(killer)] += count
+        self.runs += len(tiers)
+
+    def depth_percentile(self, tier: int, q: float) -> int:
+        """Rooms explored by the q-quantile run of tier (capped at max_depth)."""
+        cumulative = np.cumsum(self.depths[tier])
+        return int(np.searchsorted(cumulative, q * cumulative[-1]))
+
+    def tier_summary(self) -> List[Dict[str, float]]:
+        """Runs, death depth and shard income of each upgrade tier that has runs."""
+        summary = []
+        depth = np.arange(self.max_depth + 1)
+        for tier in range(self.max_tier + 1):
+            runs = int(self.depths[tier].sum())
+            if not runs:
+                continue
+            summary.append({
+                'tier': tier,
+                'runs': runs,
+                'mean_depth': round(float(self.depths[tier] @ depth) / runs, 2),
+                'median_depth': self.depth_percentile(tier, 0.5),
+                'p90_depth': self.depth_percentile(tier, 0.9),
+                'shards_per_minute': round(float(self.shards[tier] / self.minutes[tier]), 2)
+                                     if self.minutes[tier] else 0.0,
+            })
+        return summary
+
+def analyze(path: str, chunk_size: int = 100_000, profile: Optional[str] = None) -> RunAnalytics:
+    analytics = RunAnalytics()
+    for chunk in read_chunks(path, chunk_size, profile):
+        analytics.add(*chunk)
+    return analytics
+
+def _rate_label(i: int) -> str:
+    low, high = RATE_EDGES[i], RATE_EDGES[i + 1]
+    return f"{low:g}+" if np.isinf(high) else f"{low:g}-{high:g}"
+
+def _depth_label(analytics: RunAnalytics, depth: int) -> str:
+    return f"{depth}+" if depth == analytics.max_depth else str(depth)
+
+def write_csv(analytics: RunAnalytics, path: str) -> None:
+    """One row per value: report, group, key, value."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['report', 'group', 'key', 'value'])
+        for row in analytics.tier_summary():
+            for key, value in row.items():
+                if key != 'tier':
+                    writer.writerow(['tier_summary', f"tier {row['tier']}", key, value])
+        for tier in range(analytics.max_tier + 1):
+            for depth in np.flatnonzero(analytics.depths[tier]):
+                writer.writerow(['death_depth', f"tier {tier}", _depth_label(analytics, depth),
+                                 analytics.depths[tier, depth]])
+        for i, count in enumerate(analytics.rates):
+            writer.writerow(['shard_income', '', _rate_label(i), count])
+        for killer, count in analytics.killers.most_common():
+            writer.writerow(['killers', '', killer, count])
+
+def _bars(rows: List[Tuple[str, int]]) -> str:
+    peak = max((count for _, count in rows), default=0) or 1
+    return ''.join(f"<tr><td>{html.escape(label)}</td><td>{count}</td>"
+                   f"<td><div class=bar style='width:{300 * count // peak}px'></div></td></tr>"
+                   for label, count in rows)
+
+def write_html(analytics: RunAnalytics, path: str) -> None:
+    summary = analytics.tier_summary()
+    columns = ['tier', 'runs', 'mean_depth', 'median_depth', 'p90_depth', 'shards_per_minute']
+    parts = [
+        "<!DOCTYPE html><html><head><meta charset=utf-8><title>Shardlands balance report</title>",
+        "<style>body{font-family:sans-serif}td,th{padding:2px 8px;text-align:left}"
+        ".bar{background:#c9a227;height:10px}</style></head><body>",
+        f"<h1>Balance report</h1><p>{analytics.runs} runs</p>",
+        "<h2>Runs by upgrade tier</h2><table><tr>",
+        ''.join(f"<th>{column.replace('_', ' ')}</th>" for column in columns), "</tr>",
+        ''.join("<tr>" + ''.join(f"<td>{row[column]}</td>" for column in columns) + "</tr>" for row in summary),
+        "</table>",
+    ]
+    for row in summary:
+        tier = row['tier']
+        top = int(np.flatnonzero(analytics.depths[tier]).max())
+        parts.append(f"<h2>Rooms explored at death, tier {tier}</h2><table>")
+        parts.append(_bars([(_depth_label(analytics, depth), int(analytics.depths[tier, depth]))
+                            for depth in range(top + 1)]))
+        parts.append("</table>")
+    parts.append("<h2>Shard income (shards per minute)</h2><table>")
+    parts.append(_bars([(_rate_label(i), int(count)) for i, count in enumerate(analytics.rates)]))
+    parts.append("</table><h2>Deaths by killer</h2><table>")
+    parts.append(_bars(analytics.killers.most_common()))
+    parts.append("</table></body></html>")
+    with open(path, 'w') as f:
+        f.write(''.join(parts))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('history', help="Run history database (saves/history.db)")
+    parser.add_argument('output', help="Report file, .html or .csv")
+    parser.add_argument('--profile', help="Only this profile's runs ('' for the default player)")
+    parser.add_argument('--chunk', type=int, default=100_000, help="Runs read per chunk")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    analytics = analyze(args.history, args.chunk, args.profile)
+    if args.output.endswith('.csv'):
+        write_csv(analytics, args.output)
+    else:
+        write_html(analytics, args.output)
+    elapsed = time.perf_counter() - start
+    print(f"{analytics.runs} runs in {elapsed:.1f}s ({analytics.runs / max(elapsed, 1e-9):,.0f} runs/s) "
+          f"-> {args.output}")
+
+if __name__ == '__main__':
+    main()
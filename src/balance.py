@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Balance optimizer: searches tunable constants against target metrics.
+
+Candidates are scored with parallel headless simulations (see meta_sim).
+The search is random sampling followed by successive halving: every
+candidate gets a few simulated players, the best fraction gets more, and
+so on. Parameters are snapped to a grid and scores are cached per vector,
+so repeated or nearby candidates are not simulated again.
+
+    python src/balance.py --target tier2_run=8 --target clear_rate=0.5 [--samples 32]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import statistics
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import bot
+import meta_sim
+import world_gen
+
+@dataclass(frozen=True)
+class Parameter:
+    name: str
+    default: float
+    low: float
+    high: float
+    steps: int = 40  # Grid resolution over low..high; values snap to it
+
+    def snap(self, value: float) -> float:
+        """Nearest grid value, with the grid anchored at the default."""
+        step = (self.high - self.low) / self.steps
+        value = self.default + round((value - self.default) / step) * step
+        return round(min(self.high, max(self.low, value)), 6)
+
+PARAMETERS: Dict[str, Parameter] = {p.name: p for p in (
+    Parameter('enemy_health_base', 25, 12, 40),
+    Parameter('enemy_attack_base', 8, 4, 12),
+    Parameter('enemy_defense_base', 3, 1, 6),
+    Parameter('enemy_health_exponent', 1.5, 1.2, 1.8),
+    Parameter('enemy_attack_exponent', 1.3, 1.0, 1.6),
+    Parameter('boss_health_base', 50, 25, 80),
+    Parameter('boss_attack_base', 15, 8, 24),
+    Parameter('upgrade_cost_scale', 1.0, 0.5, 2.0),
+    Parameter('event_reward_scale', 1.0, 0.5, 2.0),
+)}
+
+_DEFAULT_CURVES = (dict(world_gen.ENEMY_STAT_CURVES), dict(world_gen.MINI_BOSS_STAT_CURVES))
+
+def apply_parameters(params: Dict[str, float]) -> Callable[[Any], None]:
+    """Set the world generation curves for params and return a GameManager setup hook."""
+    values = {name: p.default for name, p in PARAMETERS.items()}
+    values.update(params)
+    enemy, boss = (dict(curves) for curves in _DEFAULT_CURVES)
+    enemy['health'] = (values['enemy_health_base'], values['enemy_health_exponent'])
+    enemy['attack'] = (values['enemy_attack_base'], values['enemy_attack_exponent'])
+    enemy['defense'] = (values['enemy_defense_base'], enemy['defense'][1])
+    boss['health'] = (values['boss_health_base'], boss['health'][1])
+    boss['attack'] = (values['boss_attack_base'], boss['attack'][1])
+    world_gen.ENEMY_STAT_CURVES.update(enemy)
+    world_gen.MINI_BOSS_STAT_CURVES.update(boss)
+
+    def setup(manager: Any) -> None:
+        for upgrade in manager.memory_forge_upgrades.values():
+            upgrade['cost'] = max(1, round(upgrade['cost'] * values['upgrade_cost_scale']))
+        for event in manager.event_system.events.values():
+            for choice in event.choices:
+                choice.shard_reward = round(choice.shard_reward * values['event_reward_scale'])
+    return setup
+
+# Metrics over meta_sim rows. Lower run numbers are earlier; players that
+# never get there count as runs + 1.
+def _first_run(tier: int) -> Callable[[List[Dict[str, Any]], int, int], float]:
+    def metric(rows: List[Dict[str, Any]], players: int, runs: int) -> float:
+        firsts = meta_sim.first_run_reaching(rows, 'max_tier', tier)
+        firsts += [runs + 1] * (players - len(firsts))
+        return statistics.median(firsts)
+    return metric
+
+def _clear_rate(rows: List[Dict[str, Any]], players: int, runs: int) -> float:
+    return sum(row['outcome'] == 'cleared' for row in rows) / max(1, len(rows))
+
+def _mean_depth(rows: List[Dict[str, Any]], players: int, runs: int) -> float:
+    depths = [row['rooms_explored'] for row in rows if row['outcome'] != 'crashed']
+    return statistics.fmean(depths) if depths else 0.0
+
+METRICS: Dict[str, Callable[[List[Dict[str, Any]], int, int], float]] = {
+    'tier2_run': _first_run(2),
+    'tier3_run': _first_run(3),
+    'clear_rate': _clear_rate,
+    'mean_depth': _mean_depth,
+}
+
+def _simulate(args: tuple) -> List[Dict[str, Any]]:
+    params, player, policy_name, runs, seed = args
+    setup = apply_parameters(params)
+    return meta_sim.simulate_player((player, policy_name, runs, seed), setup=setup)
+
+class BalanceOptimizer:
+    """Random search with successive halving over PARAMETERS."""
+
+    def __init__(self, targets: Dict[str, float], names: Optional[List[str]] = None,
+                 policy_name: str = 'heuristic', runs: int = 30, workers: int = 0,
+                 seed: int = 0, cache_path: Optional[str] = None):
+        unknown = set(targets) - set(METRICS)
+        if unknown:
+            raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))}")
+        self.targets = targets
+        self.parameters = [PARAMETERS[name] for name in (names or PARAMETERS)]
+        self.policy_name = policy_name
+        self.runs = runs
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.cache_path = cache_path
+        # (param vector, players) -> metrics
+        self.cache: Dict[Tuple[Tuple[float, ...], int], Dict[str, float]] = {}
+        self.simulated = 0
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                saved = json.load(f)
+            # Scores only carry over between identical simulation settings
+            if saved.get('config') == self._config():
+                for key, metrics in saved['entries']:
+                    self.cache[(tuple(key[0]), key[1])] = metrics
+
+    def _config(self) -> List[Any]:
+        return [self.policy_name, self.runs, self.seed, [p.name for p in self.parameters]]
+
+    def vector(self, params: Dict[str, float]) -> Tuple[float, ...]:
+        return tuple(p.snap(params.get(p.name, p.default)) for p in self.parameters)
+
+    def sample(self, rng: random.Random) -> Dict[str, float]:
+        return {p.name: p.snap(rng.uniform(p.low, p.high)) for p in self.parameters}
+
+    def score(self, metrics: Dict[str, float]) -> float:
+        """Sum of squared relative misses; 0 hits every target."""
+        return sum(((metrics[name] - goal) / (abs(goal) or 1)) ** 2 for name, goal in self.targets.items())
+
+    def evaluate(self, candidates: List[Dict[str, float]], players: int) -> List[float]:
+        """Score candidates, simulating only vectors missing from the cache."""
+        keys = [(self.vector(params), players) for params in candidates]
+        missing = list(dict.fromkeys(key for key in keys if key not in self.cache))
+        if missing:
+            # Same seeds for every candidate, so differences come from the parameters
+            jobs = [(dict(zip((p.name for p in self.parameters), vector)), player,
+                     self.policy_name, self.runs, self.seed)
+                    for vector, _ in missing for player in range(players)]
+            with multiprocessing.Pool(self.workers, initializer=bot._worker_init) as pool:
+                results = pool.map(_simulate, jobs)
+            self.simulated += len(jobs)
+            for i, key in enumerate(missing):
+                rows = [row for rows in results[i * players:(i + 1) * players] for row in rows]
+                self.cache[key] = {name: METRICS[name](rows, players, self.runs) for name in METRICS}
+            self.save_cache()
+        return [self.score(self.cache[key]) for key in keys]
+
+    def save_cache(self) -> None:
+        if self.cache_path:
+            with open(self.cache_path, 'w') as f:
+                json.dump({
+                    'config': self._config(),
+                    'entries': [[[list(vector), players], metrics]
+                                for (vector, players), metrics in self.cache.items()]
+                }, f)
+
+    def search(self, samples: int = 32, min_players: int = 2, eta: int = 2,
+               rungs: int = 3) -> Tuple[Dict[str, float], float, Dict[str, float]]:
+        """Return (best params, score, metrics) after successive halving."""
+        rng = random.Random(self.seed)
+        candidates = [{p.name: p.snap(p.default) for p in self.parameters}]
+        candidates += [self.sample(rng) for _ in range(samples - 1)]
+        players = min_players
+        for rung in range(rungs):
+            scores = self.evaluate(candidates, players)
+            ranked = sorted(zip(scores, range(len(candidates))))
+            if rung < rungs - 1:
+                keep = max(1, len(candidates) // eta)
+                candidates = [candidates[i] for _, i in ranked[:keep]]
+                players *= eta
+        best_score, best = ranked[0]
+        params = candidates[best]
+        return params, best_score, self.cache[(self.vector(params), players)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--target', action='append', default=[], metavar='METRIC=VALUE',
+                        help=f"metrics: {', '.join(METRICS)}")
+    parser.add_argument('--params', nargs='*', choices=sorted(PARAMETERS), help="default: all")
+    parser.add_argument('--samples', type=int, default=32)
+    parser.add_argument('--rungs', type=int, default=3)
+    parser.add_argument('--runs', type=int, default=30, help="runs per simulated player")
+    parser.add_argument('--policy', choices=sorted(bot.POLICIES), default='heuristic')
+    parser.add_argument('--workers', type=int, default=0, help="default: one per CPU")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cache', default=None, help="JSON file to keep scores between invocations")
+    args = parser.parse_args()
+
+    targets = {}
+    for target in args.target or ['tier2_run=8']:
+        name, _, value = target.partition('=')
+        targets[name] = float(value)
+    optimizer = BalanceOptimizer(targets, args.params, args.policy, args.runs, args.workers,
+                                 args.seed, args.cache and os.path.abspath(args.cache))
+    params, score, metrics = optimizer.search(args.samples, rungs=args.rungs)
+    print(f"Best score {score:.4f} ({optimizer.simulated} simulated players)")
+    for name, value in params.items():
+        default = PARAMETERS[name].default
+        print(f"  {name:<22} {value:>8g}  (default {default:g})")
+    print("Metrics: " + ', '.join(f"{name}={value:g}" for name, value in metrics.items()))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""Headless bot player for full-run soak testing.
+
+Plays complete runs (start_new_run -> rooms, combat, events, treasure ->
+handle_death -> memory_forge) through the real game logic. Every prompt is
+answered by a policy, screen clears are skipped and output is discarded.
+
+    python src/bot.py [--policy heuristic] [--runs 2000] [--workers 4]
+"""
+
+import argparse
+import builtins
+import contextlib
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+import traceback
+from collections import Counter, deque
+from typing import Any, Callable, Dict, List, Optional
+
+import combat
+import events
+import game
+from idle import IdleGenerator
+from modifiers import DERIVED_STATS
+from upgrades import plan_best_value
+
+class RunOver(Exception):
+    """Raised by the bot to end a run that cannot end in death."""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason  # 'cleared' or 'stuck'
+
+class Policy:
+    """Answers game prompts. Subclasses override the situations they care about."""
+    name = 'random'
+
+    def __init__(self, seed: int = 0):
+        self.rng = random.Random(seed)
+
+    def room_action(self, manager: Any, exits: List[str]) -> str:
+        return f"move {self.rng.choice(exits)}"
+
+    def combat_action(self, manager: Any, enemies: List[Any]) -> str:
+        return f"attack {self.rng.randint(1, len(enemies))}"
+
+    def event_choice(self, manager: Any, choices: List[Any]) -> int:
+        return self.rng.randint(1, len(choices))
+
+    def forge_choice(self, manager: Any, available: List[str]) -> Optional[str]:
+        """Upgrade key to buy next, or None to leave the forge."""
+        if available and self.rng.random() < 0.5:
+            return self.rng.choice(available)
+        return None
+
+    def pick(self, options: List[str]) -> str:
+        return self.rng.choice(options)
+
+def _unvisited_direction(room: Any) -> Optional[str]:
+    """First step towards the nearest unvisited room (breadth-first)."""
+    seen = {id(room)}
+    queue = deque((direction, neighbour) for direction, neighbour in room.connections.items())
+    while queue:
+        first, current = queue.popleft()
+        if id(current) in seen:
+            continue
+        seen.add(id(current))
+        if not current.visited:
+            return first
+        queue.extend((first, neighbour) for neighbour in current.connections.values())
+    return None
+
+class GreedyPolicy(Policy):
+    """Explores the nearest unvisited room, hits the weakest enemy, takes the biggest reward."""
+    name = 'greedy'
+
+    def room_action(self, manager: Any, exits: List[str]) -> str:
+        direction = _unvisited_direction(manager.current_room)
+        return f"move {direction or self.rng.choice(exits)}"
+
+    def combat_action(self, manager: Any, enemies: List[Any]) -> str:
+        weakest = min(range(len(enemies)), key=lambda i: enemies[i].stats.health)
+        return f"attack {weakest + 1}"
+
+    def event_choice(self, manager: Any, choices: List[Any]) -> int:
+        return max(range(len(choices)), key=lambda i: choices[i].shard_reward) + 1
+
+    def forge_choice(self, manager: Any, available: List[str]) -> Optional[str]:
+        upgrades = manager.memory_forge_upgrades
+        shards = manager.player_entity.memory_shards
+        affordable = [key for key in available if upgrades[key]['cost'] <= shards]
+        return min(affordable, key=lambda key: upgrades[key]['cost']) if affordable else None
+
+class HeuristicPolicy(GreedyPolicy):
+    """Greedy play plus healing when low, expected-value events and planned purchases."""
+    name = 'heuristic'
+
+    def combat_action(self, manager: Any, enemies: List[Any]) -> str:
+        player = manager.player_entity
+        if player.stats.health * 3 < player.stats.max_health:
+            stack = player.inventory.best('heal')
+            if stack is not None:
+                return f"item {player.inventory.index_of(stack) + 1}"
+        return super().combat_action(manager, enemies)
+
+    def event_choice(self, manager: Any, choices: List[Any]) -> int:
+        return max(range(len(choices)),
+                   key=lambda i: choices[i].success_chance * choices[i].shard_reward) + 1
+
+    def forge_choice(self, manager: Any, available: List[str]) -> Optional[str]:
+        _, purchases = plan_best_value(manager.memory_forge_upgrades, manager.player_entity.memory_shards)
+        return purchases[0] if purchases and purchases[0] in available else None
+
+POLICIES: Dict[str, type] = {cls.name: cls for cls in (Policy, GreedyPolicy, HeuristicPolicy)}
+
+def check_invariants(manager: Any) -> List[str]:
+    """Cheap consistency checks on the player and the upgrades."""
+    player = manager.player_entity
+    stats = player.stats
+    problems = []
+    if not 0 <= stats.health <= stats.max_health:
+        problems.append(f"health {stats.health} outside 0..{stats.max_health}")
+    modifiers = player.modifiers
+    for stat in DERIVED_STATS:
+        if getattr(stats, stat) != modifiers.base[stat] + modifiers.bonus(stat):
+            problems.append(f"{stat} out of sync with its modifiers")
+    if len(player.inventory) > player.max_inventory:
+        problems.append(f"{len(player.inventory)} inventory slots used of {player.max_inventory}")
+    for stack in player.inventory.stacks:
+        if not 0 < stack.count <= player.inventory.max_stack:
+            problems.append(f"stack of {stack.count} {stack.item.name}")
+    if player.memory_shards < 0:
+        problems.append(f"negative memory shards ({player.memory_shards})")
+    for key, upgrade in manager.memory_forge_upgrades.items():
+        if not 0 <= upgrade['purchased'] <= upgrade['max_purchases']:
+            problems.append(f"upgrade {key} purchased {upgrade['purchased']} times")
+    return problems
+
+class _NullWriter:
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+class Bot:
+    """Stands in for get_input, dispatching each prompt to a policy."""
+
+    def __init__(self, policy: Policy, max_decisions: int = 5000):
+        self.policy = policy
+        self.max_decisions = max_decisions
+        self.manager: Any = None
+        self.decisions = 0  # This run
+        self.total_decisions = 0
+        self.violations: List[str] = []
+
+    def get_input(self, prompt: str, valid_options: Optional[List[str]] = None,
+                  allow_compound: bool = False) -> str:
+        self.decisions += 1
+        self.total_decisions += 1
+        if self.decisions > self.max_decisions:
+            raise RunOver('stuck')
+        if not valid_options:
+            return ""
+        manager, policy = self.manager, self.policy
+
+        if 'move' in valid_options:
+            # Room prompt: a good point to check invariants
+            self.violations.extend(check_invariants(manager))
+            # Generated worlds are not always connected, so 'cleared' means
+            # nothing unvisited is reachable any more
+            if _unvisited_direction(manager.current_room) is None:
+                raise RunOver('cleared')
+            return policy.room_action(manager, list(manager.current_room.connections))
+        if 'attack' in valid_options:
+            return policy.combat_action(manager, manager.current_room.enemies)
+        if 'choose' in valid_options:
+            choices = manager.event_system.events[manager.current_room.event_id].choices
+            return f"choose {policy.event_choice(manager, choices)}"
+        if 'plan' in valid_options:
+            key = policy.forge_choice(manager, manager._forge_menu()[1])
+            if key is None:
+                return 'back'
+            return str(manager._forge_menu()[1].index(key) + 1)
+        if 'back' in valid_options:
+            return 'back'
+        return policy.pick(valid_options)
+
+@contextlib.contextmanager
+def headless(bot: Bot):
+    """Route the game's prompts to bot and silence its output."""
+    patches = [(module, 'get_input', bot.get_input) for module in (game, combat, events)]
+    patches.append((game, 'clear_screen', lambda: None))
+    patches.append((builtins, 'input', lambda prompt="": ""))
+    saved = [(module, name, getattr(module, name)) for module, name, _ in patches]
+    for module, name, replacement in patches:
+        setattr(module, name, replacement)
+    try:
+        with contextlib.redirect_stdout(_NullWriter()):
+            yield bot
+    finally:
+        for module, name, original in saved:
+            setattr(module, name, original)
+
+def _new_manager(setup: Optional[Callable[[Any], None]]) -> Any:
+    manager = game.GameManager()
+    # Headless runs take no wall time worth paying for; idle accrual would
+    # only make seeded runs irreproducible
+    manager.idle = IdleGenerator(clock=lambda: 0.0)
+    manager.autosave = False  # Simulated runs are never resumed
+    manager.history = None  # Nor ranked
+    if setup:
+        setup(manager)
+    return manager
+
+def play(policy_name: str, runs: int, seed: int = 0, max_decisions: int = 5000,
+         on_run: Optional[Callable[[Any, int, str], None]] = None,
+         setup: Optional[Callable[[Any], None]] = None) -> Dict[str, Any]:
+    """Play runs consecutive runs as one player, buying upgrades in between.
+
+    Each run is seeded with seed + index so any crash can be replayed.
+    setup(manager) is called on every new GameManager before it plays and
+    on_run(manager, index, outcome) after every completed run.
+    Returns counters, crashes and invariant violations.
+    """
+    bot = Bot(POLICIES[policy_name](seed), max_decisions)
+    outcomes: Counter = Counter()
+    crashes: List[Dict[str, Any]] = []
+    violations: Counter = Counter()
+    start = time.perf_counter()
+    with headless(bot):
+        manager = bot.manager = _new_manager(setup)
+        for index in range(runs):
+            run_seed = seed + index
+            random.seed(run_seed)
+            bot.policy.rng.seed(run_seed)
+            bot.decisions = 0
+            bot.violations = []
+            try:
+                try:
+                    manager.start_new_run()
+                    outcome = 'died'
+                except RunOver as over:
+                    # Bank the run as if it had ended here
+                    outcome = over.reason
+                    manager.handle_death(over.reason)
+                bot.decisions = 0
+                manager.memory_forge()
+            except RunOver:
+                outcome = 'stuck'
+            except Exception:
+                outcomes['crashed'] += 1
+                crashes.append({'policy': policy_name, 'seed': run_seed,
+                                'traceback': traceback.format_exc()})
+                manager = bot.manager = _new_manager(setup)
+                continue
+            outcomes[outcome] += 1
+            for problem in bot.violations + check_invariants(manager):
+                violations[problem] += 1
+            if on_run:
+                on_run(manager, index, outcome)
+    return {
+        'runs': runs,
+        'outcomes': dict(outcomes),
+        'decisions': bot.total_decisions,
+        'elapsed': time.perf_counter() - start,
+        'crashes': crashes,
+        'violations': dict(violations)
+    }
+
+def _play_chunk(args: tuple) -> Dict[str, Any]:
+    return play(*args)
+
+def _worker_init() -> None:
+    # Saves and the stash use relative paths; keep them away from the real ones
+    os.chdir(tempfile.mkdtemp(prefix='shardlands-bot-'))
+
+def soak(policy_name: str, runs: int, workers: int = 0, runs_per_player: int = 50,
+         seed: int = 0, max_decisions: int = 5000) -> Dict[str, Any]:
+    """Spread runs over worker processes and merge their reports."""
+    workers = workers or os.cpu_count() or 1
+    chunks = [(policy_name, min(runs_per_player, runs - start), seed + start, max_decisions)
+              for start in range(0, runs, runs_per_player)]
+    start = time.perf_counter()
+    with multiprocessing.Pool(workers, initializer=_worker_init) as pool:
+        reports = pool.map(_play_chunk, chunks)
+
+    merged: Dict[str, Any] = {'runs': runs, 'outcomes': Counter(), 'decisions': 0,
+                              'crashes': [], 'violations': Counter()}
+    for report in reports:
+        merged['outcomes'].update(report['outcomes'])
+        merged['decisions'] += report['decisions']
+        merged['crashes'].extend(report['crashes'])
+        merged['violations'].update(report['violations'])
+    merged['elapsed'] = time.perf_counter() - start
+    return merged
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='heuristic')
+    parser.add_argument('--runs', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=0, help="default: one per CPU")
+    parser.add_argument('--runs-per-player', type=int, default=50,
+                        help="consecutive runs sharing one save (upgrades carry over)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-decisions', type=int, default=5000)
+    args = parser.parse_args()
+
+    report = soak(args.policy, args.runs, args.workers, args.runs_per_player, args.seed, args.max_decisions)
+    elapsed = report['elapsed']
+    print(f"{args.runs} runs ({args.policy}) in {elapsed:.1f} s: "
+          f"{args.runs / elapsed * 60:.0f} runs/min, {report['decisions'] / elapsed:.0f} decisions/s")
+    print("Outcomes: " + ', '.join(f"{name}={count}" for name, count in sorted(report['outcomes'].items())))
+    for problem, count in report['violations'].most_common():
+        print(f"VIOLATION x{count}: {problem}")
+    for crash in report['crashes'][:10]:
+        print(f"\nCRASH (policy={crash['policy']}, seed={crash['seed']}):\n{crash['traceback']}")
+    if len(report['crashes']) > 10:
+        print(f"... and {len(report['crashes']) - 10} more crashes")
+    raise SystemExit(1 if report['crashes'] or report['violations'] else 0)
+
+if __name__ == '__main__':
+    main()
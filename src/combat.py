@@ -1,12 +1,17 @@
 from typing import List, Optional, Tuple
 from entities import Player, Enemy, Item
+from templates import loot_item_template
+from pools import acquire_item, release_enemy
+from event_bus import EventBus, DamageDealt, DamageTaken, EnemyDefeated, FightEnded, FightStarted, ItemUsed
 from utils import print_colored, get_input, roll_dice, Fore, chance, format_command_help
 
 class CombatSystem:
-    def __init__(self, player: Player, enemies: List[Enemy]):
+    def __init__(self, player: Player, enemies: List[Enemy], bus: Optional[EventBus] = None):
         self.player = player
         self.enemies = enemies
+        self.bus = bus or EventBus()
         self.turn_count = 0
+        self.items_used = 0
         self.defeated_enemies: List[Enemy] = []  # Track defeated enemies for loot
         
     def generate_loot_item(self, item_name: str, enemy_level: int) -> Item:
@@ -36,30 +41,19 @@ class CombatSystem:
         
         value = int(base_value * multiplier * (1 + enemy_level * 0.2))
         
-        # Special legendary variations
-        if rarity == 'legendary':
-            if item_name == 'health_potion':
-                name = "Phoenix Elixir"
-                description = "A legendary potion that provides massive healing"
-            elif item_name == 'damage_crystal':
-                name = "Void Shard"
-                description = "A crystal infused with void energy"
-            else:
-                name = f"Legendary {item_name.replace('_', ' ').title()}"
-                description = f"A legendary item of immense power"
-        else:
-            name = f"{rarity.capitalize()} {item_name.replace('_', ' ').title()}"
-            description = f"A {rarity} item that provides {value} {item_name.split('_')[0]}"
-            
-        return Item(
-            name=name,
-            description=description,
-            effect_type=item_name.split('_')[0],
+        return acquire_item(
+            template_id=loot_item_template(item_name, legendary=(rarity == 'legendary')),
             effect_value=value,
             rarity=rarity,
             durability=roll_dice(3, 5) if chance(0.3) else None
         )
         
+    def release_defeated(self) -> None:
+        """Return defeated enemies to the pool once the fight has been processed."""
+        for enemy in self.defeated_enemies:
+            release_enemy(enemy)
+        self.defeated_enemies = []
+        
     def player_turn(self) -> bool:
         """Handle player's turn. Returns True if player flees."""
         print_colored("\nYour turn!", Fore.CYAN, bold=True)
@@ -103,6 +97,7 @@ class CombatSystem:
             base_damage = self.player.stats.attack
             damage = roll_dice(base_damage - 2, base_damage + 2)
             actual_damage = target.stats.take_damage(damage)
+            self.bus.emit(DamageDealt, actual_damage)
             
             print_colored(
                 f"\nYou attack {target.name} for {actual_damage} damage!",
@@ -111,9 +106,7 @@ class CombatSystem:
             
             # Check if enemy died
             if not target.stats.is_alive():
-                print_colored(f"{target.name} was defeated!", Fore.GREEN)
-                self.defeated_enemies.append(target)
-                self.enemies.remove(target)
+                self.defeat(target)
                 
         elif command == 'item':
             if not self.player.inventory:
@@ -121,8 +114,9 @@ class CombatSystem:
                 return self.player_turn()  # Try again
                 
             print("\nInventory:")
-            for i, item in enumerate(self.player.inventory, 1):
-                print(f"{i}. {item.name} - {item.description}")
+            for i, stack in enumerate(self.player.inventory.stacks, 1):
+                count = f" x{stack.count}" if stack.count > 1 else ""
+                print(f"{i}. {stack.item.name}{count} - {stack.item.description}")
                 
             if args and args[0] in actions['item']:
                 item_idx = int(args[0])
@@ -137,6 +131,8 @@ class CombatSystem:
                 
             item = self.player.remove_item(item_idx - 1)
             if item:
+                self.items_used += 1
+                self.bus.emit(ItemUsed, item.name, True)
                 if item.effect_type in ['heal', 'buff']:
                     result = item.use(self.player)
                 else:
@@ -152,12 +148,13 @@ class CombatSystem:
                                 valid_options=[str(i) for i in range(1, len(self.enemies) + 1)]
                             )) - 1
                         target = self.enemies[target_idx]
+                    health_before = target.stats.health
                     result = item.use(target)
+                    dealt = max(0, health_before - target.stats.health)
+                    self.bus.emit(DamageDealt, dealt)
                     
                     if not target.stats.is_alive():
-                        print_colored(f"{target.name} was defeated!", Fore.GREEN)
-                        self.defeated_enemies.append(target)
-                        self.enemies.remove(target)
+                        self.defeat(target)
                         
                 print_colored(result, Fore.YELLOW)
                 
@@ -169,6 +166,13 @@ class CombatSystem:
             
         return False
         
+    def defeat(self, enemy: Enemy) -> None:
+        """Take a slain enemy out of the fight and report it."""
+        print_colored(f"{enemy.name} was defeated!", Fore.GREEN)
+        self.defeated_enemies.append(enemy)
+        self.enemies.remove(enemy)
+        self.bus.emit(EnemyDefeated, enemy.name, enemy.level, enemy.is_mini_boss)
+        
     def enemy_turn(self) -> None:
         """Handle enemies' turns."""
         for enemy in self.enemies:
@@ -180,6 +184,7 @@ class CombatSystem:
                 base_damage = enemy.stats.attack
                 damage = roll_dice(base_damage - 1, base_damage + 1)
                 actual_damage = self.player.stats.take_damage(damage)
+                self.bus.emit(DamageTaken, actual_damage)
                 
                 print_colored(
                     f"{enemy.name} attacks you for {actual_damage} damage!",
@@ -188,6 +193,18 @@ class CombatSystem:
                 
     def run_combat(self) -> Tuple[bool, List[Item]]:
         """Run the complete combat sequence. Returns (player_survived, loot)."""
+        mini_boss = any(enemy.is_mini_boss for enemy in self.enemies)
+        self.bus.emit(FightStarted, len(self.enemies), mini_boss)
+        won = False
+        try:
+            survived, loot = self._combat_loop()
+            won = survived and not self.enemies
+            return survived, loot
+        finally:
+            self.bus.emit(FightEnded, won, mini_boss, self.items_used, self.turn_count)
+            self.bus.flush()
+                
+    def _combat_loop(self) -> Tuple[bool, List[Item]]:
         print_colored("\nCombat started!", Fore.RED, bold=True)
         self.defeated_enemies = []  # Reset defeated enemies list
         
@@ -238,4 +255,5 @@ class CombatSystem:
                 print_colored("\nYou have been defeated!", Fore.RED, bold=True)
                 return False, []
                 
-            self.turn_count += 1 
\ No newline at end of file
+            self.turn_count += 1
+            self.bus.flush()  # Observers see each round as one batch 
\ No newline at end of file
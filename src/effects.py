@@ -0,0 +1,332 @@
+import re
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from utils import roll_dice
+from modifiers import PERMANENT, Modifier
+
+# Small effect/condition language shared by items, events, upgrades and dialogue.
+#
+#   program := stmt (';' stmt)*
+#   stmt    := 'if' cond ':' stmt | target ('=' | '+=' | '-=') expr | expr
+#   cond    := expr ('>=' | '<=' | '>' | '<' | '==' | '!=') expr
+#   expr    := term (('+' | '-') term)*
+#   term    := factor (('*' | '//') factor)*
+#   factor  := INT | INT '..' INT | INT 'd' INT | name | call | '(' expr ')' | '-' factor
+#
+# Names: 'value' (the bound parameter, e.g. an item's effect_value), 'shards'
+# (target.memory_shards), 'stat.<field>' (target.stats.<field>) and locals.
+# 'mod.<field> += expr' adds a stat modifier tagged with the source and
+# lifetime passed to Effect.apply; targets without a modifier stack (enemies)
+# get the amount added to their stats directly.
+# Programs are compiled once into a list of closures; running one is a plain
+# sequence of function calls with no string comparisons.
+
+class EffectError(ValueError):
+    """Raised when an effect or condition fails to compile."""
+
+_TOKEN_RE = re.compile(r"""
+    \s*(?:
+        (?P<dice>\d+d\d+)
+      | (?P<number>\d+)
+      | (?P<name>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)?)
+      | (?P<op>\.\.|//|\+=|-=|>=|<=|==|!=|[-+*()<>=:;,])
+    )""", re.VERBOSE)
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    '>=': lambda a, b: a >= b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '<': lambda a, b: a < b,
+    '==': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+}
+
+class EffectContext:
+    """Runtime state for one effect application."""
+    __slots__ = ('target', 'value', 'host', 'source', 'lifetime', 'vars')
+
+    def __init__(self, target: Any, value: Any = 0, host: Any = None,
+                 source: str = "", lifetime: str = PERMANENT):
+        self.target = target
+        self.value = value
+        self.host = host
+        self.source = source
+        self.lifetime = lifetime
+        self.vars: Dict[str, Any] = {}
+
+# name -> fn(ctx, *args); resolved at compile time
+BUILTINS: Dict[str, Callable[..., Any]] = {}
+
+def builtin(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Register a function callable from effect programs."""
+    def register(fn: Callable[..., Any]) -> Callable[..., Any]:
+        BUILTINS[name] = fn
+        return fn
+    return register
+
+@builtin('heal')
+def _heal(ctx: EffectContext, amount: int) -> int:
+    return ctx.target.stats.heal(amount)
+
+@builtin('damage')
+def _damage(ctx: EffectContext, amount: int) -> int:
+    return ctx.target.stats.take_damage(amount)
+
+@builtin('min')
+def _min(ctx: EffectContext, *values: int) -> int:
+    return min(values)
+
+@builtin('max')
+def _max(ctx: EffectContext, *values: int) -> int:
+    return max(values)
+
+@builtin('end_dialogue')
+def _end_dialogue(ctx: EffectContext) -> None:
+    ctx.host.end_dialogue()
+
+def _tokenize(source: str) -> List[Tuple[str, str]]:
+    tokens = []
+    pos = 0
+    source = source.rstrip()
+    while pos < len(source):
+        match = _TOKEN_RE.match(source, pos)
+        if not match:
+            raise EffectError(f"Unexpected character {source[pos:].strip()[:1]!r} in {source!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+    return tokens
+
+class _Parser:
+    """Recursive-descent compiler from source text to closures."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.tokens = _tokenize(source)
+        self.pos = 0
+        self.locals: set = set()
+
+    def peek(self) -> Optional[str]:
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos][1]
+        return None
+
+    def next(self) -> Tuple[str, str]:
+        if self.pos >= len(self.tokens):
+            raise EffectError(f"Unexpected end of {self.source!r}")
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expect(self, text: str) -> None:
+        kind, token = self.next()
+        if token != text:
+            raise EffectError(f"Expected {text!r} but found {token!r} in {self.source!r}")
+
+    def program(self) -> List[Callable[[EffectContext], Any]]:
+        ops = []
+        while self.peek() is not None:
+            if self.peek() == ';':
+                self.next()
+                continue
+            ops.append(self.statement())
+            if self.peek() not in (None, ';'):
+                raise EffectError(f"Unexpected {self.peek()!r} in {self.source!r}")
+        return ops
+
+    def statement(self) -> Callable[[EffectContext], Any]:
+        if self.peek() == 'if':
+            self.next()
+            cond = self.condition()
+            self.expect(':')
+            body = self.statement()
+            def run_if(ctx: EffectContext) -> None:
+                if cond(ctx):
+                    body(ctx)
+            return run_if
+
+        if (self.pos + 1 < len(self.tokens) and self.tokens[self.pos][0] == 'name'
+                and self.tokens[self.pos + 1][1] in ('=', '+=', '-=')):
+            _, name = self.next()
+            _, op = self.next()
+            return self.assignment(name, op, self.expr())
+
+        return self.expr()
+
+    def assignment(self, name: str, op: str, expr: Callable[[EffectContext], Any]) -> Callable[[EffectContext], Any]:
+        if name == 'shards':
+            def get(ctx): return ctx.target.memory_shards
+            def put(ctx, v): ctx.target.memory_shards = v
+        elif name.startswith('stat.'):
+            attr = name[5:]
+            def get(ctx): return getattr(ctx.target.stats, attr)
+            def put(ctx, v): setattr(ctx.target.stats, attr, v)
+        elif name.startswith('mod.'):
+            return self.modifier(name[4:], op, expr)
+        elif name == 'value' or '.' in name or name in BUILTINS:
+            raise EffectError(f"Cannot assign to {name!r} in {self.source!r}")
+        else:
+            if op != '=' and name not in self.locals:
+                raise EffectError(f"Undefined name {name!r} in {self.source!r}")
+            self.locals.add(name)
+            def get(ctx): return ctx.vars[name]
+            def put(ctx, v): ctx.vars[name] = v
+
+        if op == '=':
+            def run_set(ctx: EffectContext) -> None:
+                put(ctx, expr(ctx))
+            return run_set
+        sign = 1 if op == '+=' else -1
+        def run_update(ctx: EffectContext) -> None:
+            put(ctx, get(ctx) + sign * expr(ctx))
+        return run_update
+
+    def modifier(self, stat: str, op: str, expr: Callable[[EffectContext], Any]) -> Callable[[EffectContext], Any]:
+        if op == '=':
+            raise EffectError(f"Modifiers only support += and -= in {self.source!r}")
+        sign = 1 if op == '+=' else -1
+        def run_modifier(ctx: EffectContext) -> None:
+            amount = sign * expr(ctx)
+            modifiers = getattr(ctx.target, 'modifiers', None)
+            if modifiers is None:
+                setattr(ctx.target.stats, stat, getattr(ctx.target.stats, stat) + amount)
+            else:
+                modifiers.add(Modifier(stat, amount, ctx.source, ctx.lifetime))
+        return run_modifier
+
+    def condition(self) -> Callable[[EffectContext], bool]:
+        left = self.expr()
+        _, op = self.next()
+        if op not in _COMPARISONS:
+            raise EffectError(f"Expected comparison but found {op!r} in {self.source!r}")
+        compare = _COMPARISONS[op]
+        right = self.expr()
+        return lambda ctx: compare(left(ctx), right(ctx))
+
+    def expr(self) -> Callable[[EffectContext], Any]:
+        node = self.term()
+        while self.peek() in ('+', '-'):
+            _, op = self.next()
+            left, right = node, self.term()
+            if op == '+':
+                node = lambda ctx, l=left, r=right: l(ctx) + r(ctx)
+            else:
+                node = lambda ctx, l=left, r=right: l(ctx) - r(ctx)
+        return node
+
+    def term(self) -> Callable[[EffectContext], Any]:
+        node = self.factor()
+        while self.peek() in ('*', '//'):
+            _, op = self.next()
+            left, right = node, self.factor()
+            if op == '*':
+                node = lambda ctx, l=left, r=right: l(ctx) * r(ctx)
+            else:
+                node = lambda ctx, l=left, r=right: l(ctx) // r(ctx)
+        return node
+
+    def factor(self) -> Callable[[EffectContext], Any]:
+        kind, token = self.next()
+
+        if kind == 'dice':
+            count, sides = (int(part) for part in token.split('d'))
+            return lambda ctx: sum(roll_dice(1, sides) for _ in range(count))
+
+        if kind == 'number':
+            low = int(token)
+            if self.peek() == '..':
+                self.next()
+                kind, token = self.next()
+                if kind != 'number':
+                    raise EffectError(f"Range bound must be a number in {self.source!r}")
+                high = int(token)
+                return lambda ctx: roll_dice(low, high)
+            return lambda ctx: low
+
+        if token == '(':
+            node = self.expr()
+            self.expect(')')
+            return node
+
+        if token == '-':
+            operand = self.factor()
+            return lambda ctx: -operand(ctx)
+
+        if kind != 'name':
+            raise EffectError(f"Unexpected {token!r} in {self.source!r}")
+
+        if self.peek() == '(':
+            return self.call(token)
+        if token == 'value':
+            return lambda ctx: ctx.value
+        if token == 'shards':
+            return lambda ctx: ctx.target.memory_shards
+        if token.startswith('stat.'):
+            attr = token[5:]
+            return lambda ctx: getattr(ctx.target.stats, attr)
+        if token not in self.locals:
+            raise EffectError(f"Undefined name {token!r} in {self.source!r}")
+        return lambda ctx: ctx.vars[token]
+
+    def call(self, name: str) -> Callable[[EffectContext], Any]:
+        if name not in BUILTINS:
+            raise EffectError(f"Unknown function {name!r} in {self.source!r}")
+        fn = BUILTINS[name]
+        self.expect('(')
+        args = []
+        while self.peek() != ')':
+            args.append(self.expr())
+            if self.peek() == ',':
+                self.next()
+        self.expect(')')
+
+        if not args:
+            return lambda ctx: fn(ctx)
+        if len(args) == 1:
+            arg = args[0]
+            return lambda ctx: fn(ctx, arg(ctx))
+        return lambda ctx: fn(ctx, *(arg(ctx) for arg in args))
+
+class Effect:
+    """A compiled effect program and the message template it reports.
+
+    The message is formatted with the program's locals plus 'target' (the
+    target's name) and 'value'.
+    """
+
+    def __init__(self, source: str, message: str = ""):
+        self.source = source
+        self.message = message
+        self._ops = _Parser(source).program()
+
+    def apply(self, target: Any, value: Any = 0, host: Any = None,
+              source: str = "", lifetime: str = PERMANENT) -> str:
+        """Run the program against target and return the formatted message.
+
+        source and lifetime tag any modifiers the program adds.
+        """
+        ctx = EffectContext(target, value, host, source, lifetime)
+        for op in self._ops:
+            op(ctx)
+        if not self.message:
+            return ""
+        return self.message.format(target=getattr(target, 'name', ''), value=value, **ctx.vars)
+
+    def __repr__(self) -> str:
+        return f"Effect({self.source!r})"
+
+def compile_effect(source: str, message: str = "") -> Effect:
+    """Compile an effect program."""
+    return Effect(source, message)
+
+def compile_condition(source: str) -> Callable[..., bool]:
+    """Compile a condition such as 'stat.attack >= 15' into a predicate.
+
+    The predicate is called as predicate(target, value=0).
+    """
+    parser = _Parser(source)
+    cond = parser.condition()
+    if parser.peek() is not None:
+        raise EffectError(f"Unexpected {parser.peek()!r} in {source!r}")
+    def predicate(target: Any, value: Any = 0) -> bool:
+        return cond(EffectContext(target, value))
+    return predicate
@@ -1,8 +1,12 @@
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from utils import format_health, roll_dice
+from effects import Effect, compile_effect
+from inventory import Inventory
+from modifiers import RUN, ModifierStack
+from templates import ITEM_TEMPLATES, NPC_TEMPLATES, ItemTemplate, NPCTemplate, intern_item_template
 
-@dataclass
+@dataclass(slots=True)
 class Stats:
     health: int
     max_health: int
@@ -24,7 +28,7 @@ class Stats:
         self.health = min(self.max_health, self.health + amount)
         return self.health - before
 
-@dataclass
+@dataclass(slots=True)
 class Entity:
     name: str
     stats: Stats
@@ -33,37 +37,64 @@ class Entity:
     def __str__(self) -> str:
         return f"{self.name} [HP: {format_health(self.stats.health, self.stats.max_health)}]"
 
-@dataclass
+# Item behaviour by effect_type, compiled once at import
+ITEM_EFFECTS: Dict[str, Effect] = {
+    'heal': compile_effect("amount = heal(value)", "{target} healed for {amount} HP"),
+    'damage': compile_effect("amount = damage(value)", "{target} took {amount} damage"),
+    # Attack/defense buffs last until the end of the run
+    'attack': compile_effect("mod.attack += value", "{target} gained {value} attack power"),
+    'defense': compile_effect("mod.defense += value", "{target} gained {value} defense"),
+}
+
+@dataclass(slots=True, init=False)
 class Item:
-    name: str
-    description: str
-    effect_type: str  # 'heal', 'damage', 'buff', etc.
+    template_id: str  # Shared ItemTemplate with name, description and effect type
     effect_value: int
     rarity: str  # 'common', 'uncommon', 'rare', 'legendary'
     durability: Optional[int] = None
-    special_effect: Optional[str] = None  # For legendary items
+    
+    def __init__(self, name: Optional[str] = None, description: Optional[str] = None,
+                 effect_type: Optional[str] = None, effect_value: int = 0, rarity: str = 'common',
+                 durability: Optional[int] = None, special_effect: Optional[str] = None,
+                 template_id: Optional[str] = None):
+        if template_id is None:
+            template_id = intern_item_template(name or "", description or "", effect_type or "", special_effect)
+        self.template_id = template_id
+        self.effect_value = effect_value
+        self.rarity = rarity
+        self.durability = durability
+    
+    @property
+    def template(self) -> ItemTemplate:
+        return ITEM_TEMPLATES[self.template_id]
+    
+    @property
+    def name(self) -> str:
+        return self.template.render_name(self.rarity, self.effect_value)
+    
+    @property
+    def description(self) -> str:
+        return self.template.render_description(self.rarity, self.effect_value)
+    
+    @property
+    def effect_type(self) -> str:  # 'heal', 'damage', 'buff', etc.
+        return self.template.effect_type
+    
+    @property
+    def special_effect(self) -> Optional[str]:  # For legendary items
+        return self.template.special_effect
+    
+    @property
+    def stack_key(self) -> tuple:
+        """Items with equal keys are interchangeable and may share a stack."""
+        return (self.template_id, self.rarity, self.effect_value, self.durability)
     
     def use(self, target: 'Entity') -> str:
         """Use item on target and return result message."""
-        if self.effect_type == 'heal':
-            amount = target.stats.heal(self.effect_value)
-            return f"{target.name} healed for {amount} HP"
-            
-        elif self.effect_type == 'damage':
-            amount = target.stats.take_damage(self.effect_value)
-            return f"{target.name} took {amount} damage"
-            
-        elif self.effect_type == 'attack':
-            # Temporary attack buff
-            target.stats.attack += self.effect_value
-            return f"{target.name} gained {self.effect_value} attack power"
-            
-        elif self.effect_type == 'defense':
-            # Temporary defense buff
-            target.stats.defense += self.effect_value
-            return f"{target.name} gained {self.effect_value} defense"
-            
-        return "Item had no effect"
+        effect = ITEM_EFFECTS.get(self.template.effect_type)
+        if effect is None:
+            return "Item had no effect"
+        return effect.apply(target, self.effect_value, source=f"item:{self.template_id}", lifetime=RUN)
     
     def can_target_self(self) -> bool:
         """Whether this item can be used on the player."""
@@ -73,31 +104,36 @@ class Item:
         """Whether this item can be used on enemies."""
         return self.effect_type in ['damage']
 
-@dataclass
+@dataclass(slots=True)
 class Player(Entity):
     memory_shards: int = 0
-    inventory: List[Item] = field(default_factory=list)
-    max_inventory: int = 10
+    inventory: Inventory = field(default_factory=Inventory)
+    max_inventory: int = 10  # Slots; identical items stack within a slot
+    modifiers: Optional[ModifierStack] = field(default=None, repr=False)
+    
+    def __post_init__(self):
+        # stats holds the cached final values; modifiers owns the base values
+        if self.modifiers is None:
+            self.modifiers = ModifierStack(self.stats)
     
-    def can_add_item(self) -> bool:
-        return len(self.inventory) < self.max_inventory
+    def can_add_item(self, item: Optional[Item] = None) -> bool:
+        return self.inventory.can_add(item, self.max_inventory)
         
     def add_item(self, item: Item) -> bool:
-        if not self.can_add_item():
+        if not self.can_add_item(item):
             return False
-        self.inventory.append(item)
+        self.inventory.add(item)
         return True
         
     def remove_item(self, index: int) -> Optional[Item]:
-        if 0 <= index < len(self.inventory):
-            return self.inventory.pop(index)
-        return None
+        return self.inventory.take(index)
 
-@dataclass
+@dataclass(slots=True)
 class Enemy(Entity):
     attack_pattern: List[str] = field(default_factory=list)
     loot_table: Dict[str, float] = field(default_factory=dict)  # item_name: drop_chance
     experience_value: int = 0
+    is_mini_boss: bool = False
     
     def get_next_action(self) -> str:
         """Get the next action from the attack pattern."""
@@ -105,7 +141,7 @@ class Enemy(Entity):
             return 'attack'  # Default action
         return self.attack_pattern[0]  # In a real implementation, we'd rotate the pattern
 
-@dataclass
+@dataclass(slots=True)
 class Room:
     room_type: str  # 'combat', 'treasure', 'event'
     description: str
@@ -124,8 +160,34 @@ class Room:
         if direction in reverse_dir:
             room.connections[reverse_dir[direction]] = self
 
-@dataclass
+@dataclass(slots=True)
 class NPC(Entity): # Inherits name and stats from Entity
-    dialogue_id: str = "" # ID to link to dialogue data
-    sprite_id: Optional[str] = None # For future sprite rendering
-    # NPC-specific fields can be added here later
\ No newline at end of file
+    template_id: str = "" # Shared NPCTemplate with dialogue and sprite ids
+    # NPC-specific fields can be added here later
+    
+    @classmethod
+    def from_template(cls, template_id: str) -> 'NPC':
+        """Create an NPC whose name and stats are shared with its template.
+        
+        NPCs never fight, so every NPC of a template uses the same Stats.
+        """
+        template = NPC_TEMPLATES[template_id]
+        stats = _NPC_STATS.get(template_id)
+        if stats is None:
+            stats = _NPC_STATS[template_id] = Stats(template.health, template.health, 0, 0)
+        return cls(name=template.name, stats=stats, template_id=template_id)
+    
+    @property
+    def template(self) -> NPCTemplate:
+        return NPC_TEMPLATES[self.template_id]
+    
+    @property
+    def dialogue_id(self) -> str: # ID to link to dialogue data
+        return self.template.dialogue_id
+    
+    @property
+    def sprite_id(self) -> Optional[str]: # For future sprite rendering
+        return self.template.sprite_id
+
+# Stats shared by all NPCs of a template
+_NPC_STATS: Dict[str, Stats] = {}
@@ -0,0 +1,196 @@
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from entities import Stats, Entity, Enemy
+
+# Columns with one value per enemy
+STAT_COLUMNS = ('health', 'max_health', 'attack', 'defense')
+ID_COLUMNS = ('level', 'archetype', 'pattern', 'loot', 'experience', 'name', 'mini_boss')
+
+class EnemyStore:
+    """Struct-of-arrays storage for all enemies of a world or simulation batch.
+
+    Each enemy is a row index. Stats live in int32 columns; names, archetypes,
+    attack patterns and loot tables are interned and referenced by id. Use
+    view(row) wherever an Enemy is expected.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self.count = 0
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.zeros(capacity, dtype=np.int32)
+            for name in STAT_COLUMNS + ID_COLUMNS
+        }
+        self.names: List[str] = []
+        self.archetypes: List[str] = []
+        self.patterns: List[List[str]] = []
+        self.loot_tables: List[Dict[str, float]] = []
+        self._ids: Dict[Tuple[str, object], int] = {}
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _intern(self, table: List, kind: str, key: object, value: object) -> int:
+        """Return the id of value in table, adding it on first use."""
+        ident = self._ids.get((kind, key))
+        if ident is None:
+            ident = len(table)
+            table.append(value)
+            self._ids[(kind, key)] = ident
+        return ident
+
+    def _grow(self, needed: int) -> None:
+        capacity = len(self.columns['health'])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, column in self.columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.count] = column[:self.count]
+            self.columns[name] = grown
+
+    def add(self, name: str, stats: Stats, level: int = 1, archetype: str = '',
+            attack_pattern: Optional[List[str]] = None, loot_table: Optional[Dict[str, float]] = None,
+            experience_value: int = 0, is_mini_boss: bool = False) -> 'EnemyView':
+        """Append an enemy and return a view onto its row."""
+        self._grow(self.count + 1)
+        row = self.count
+        self.count += 1
+
+        pattern = list(attack_pattern or [])
+        loot = dict(loot_table or {})
+        values = {
+            'health': stats.health,
+            'max_health': stats.max_health,
+            'attack': stats.attack,
+            'defense': stats.defense,
+            'level': level,
+            'archetype': self._intern(self.archetypes, 'archetype', archetype, archetype),
+            'pattern': self._intern(self.patterns, 'pattern', tuple(pattern), pattern),
+            'loot': self._intern(self.loot_tables, 'loot', tuple(sorted(loot.items())), loot),
+            'experience': experience_value,
+            'name': self._intern(self.names, 'name', name, name),
+            'mini_boss': int(is_mini_boss),
+        }
+        for column, value in values.items():
+            self.columns[column][row] = value
+        return EnemyView(self, row)
+
+    def add_enemy(self, enemy: Enemy, archetype: str = '') -> 'EnemyView':
+        """Copy an existing Enemy object into the store."""
+        return self.add(enemy.name, enemy.stats, enemy.level, archetype, enemy.attack_pattern,
+                        enemy.loot_table, enemy.experience_value, enemy.is_mini_boss)
+
+    def view(self, row: int) -> 'EnemyView':
+        return EnemyView(self, row)
+
+    def clear(self) -> None:
+        """Drop all rows, keeping capacity and interned tables."""
+        self.count = 0
+
+    def column(self, name: str) -> np.ndarray:
+        """Live slice of a column covering the stored enemies."""
+        return self.columns[name][:self.count]
+
+    def has_ability(self, ability: str) -> np.ndarray:
+        """Boolean mask of enemies whose attack pattern contains ability."""
+        lookup = np.array([ability in pattern for pattern in self.patterns] or [False])
+        return lookup[self.column('pattern')]
+
+    def regenerate(self, amount: int) -> None:
+        """Heal every living enemy with the 'regenerate' ability by amount."""
+        if not self.count:
+            return
+        mask = self.has_ability('regenerate') & (self.column('health') > 0)
+        health = self.column('health')
+        health[mask] = np.minimum(self.column('max_health')[mask], health[mask] + amount)
+
+class StatsView:
+    """Stats-compatible accessor for one row of an EnemyStore."""
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store: EnemyStore, row: int):
+        self._store = store
+        self._row = row
+
+    def _get(self, column: str) -> int:
+        return int(self._store.columns[column][self._row])
+
+    def _set(self, column: str, value: int) -> None:
+        self._store.columns[column][self._row] = value
+
+    health = property(lambda self: self._get('health'), lambda self, v: self._set('health', v))
+    max_health = property(lambda self: self._get('max_health'), lambda self, v: self._set('max_health', v))
+    attack = property(lambda self: self._get('attack'), lambda self, v: self._set('attack', v))
+    defense = property(lambda self: self._get('defense'), lambda self, v: self._set('defense', v))
+
+    is_alive = Stats.is_alive
+    take_damage = Stats.take_damage
+    heal = Stats.heal
+
+    def __repr__(self) -> str:
+        return (f"StatsView(health={self.health}, max_health={self.max_health}, "
+                f"attack={self.attack}, defense={self.defense})")
+
+class EnemyView:
+    """Enemy-compatible view of one EnemyStore row.
+
+    attack_pattern and loot_table are shared with every enemy using the same
+    pattern or table and must not be mutated through a view.
+    """
+    __slots__ = ('_store', '_row', 'stats')
+
+    def __init__(self, store: EnemyStore, row: int):
+        self._store = store
+        self._row = row
+        self.stats = StatsView(store, row)
+
+    @property
+    def row(self) -> int:
+        return self._row
+
+    @property
+    def name(self) -> str:
+        return self._store.names[self._store.columns['name'][self._row]]
+
+    @property
+    def level(self) -> int:
+        return int(self._store.columns['level'][self._row])
+
+    @property
+    def archetype(self) -> str:
+        return self._store.archetypes[self._store.columns['archetype'][self._row]]
+
+    @property
+    def attack_pattern(self) -> List[str]:
+        return self._store.patterns[self._store.columns['pattern'][self._row]]
+
+    @property
+    def loot_table(self) -> Dict[str, float]:
+        return self._store.loot_tables[self._store.columns['loot'][self._row]]
+
+    @property
+    def experience_value(self) -> int:
+        return int(self._store.columns['experience'][self._row])
+
+    @property
+    def is_mini_boss(self) -> bool:
+        return bool(self._store.columns['mini_boss'][self._row])
+
+    get_next_action = Enemy.get_next_action
+    __str__ = Entity.__str__
+
+    def __repr__(self) -> str:
+        return f"EnemyView({self.name!r}, row={self._row})"
+
+    def to_enemy(self) -> Enemy:
+        """Materialize a standalone Enemy object."""
+        return Enemy(
+            name=self.name,
+            stats=Stats(self.stats.health, self.stats.max_health, self.stats.attack, self.stats.defense),
+            level=self.level,
+            attack_pattern=list(self.attack_pattern),
+            loot_table=dict(self.loot_table),
+            experience_value=self.experience_value,
+            is_mini_boss=self.is_mini_boss
+        )
@@ -0,0 +1,119 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Tuple, Type, TypeVar
+
+# Typed pub/sub for cross-cutting observers (achievements, telemetry, logging).
+# Each event class is its own topic. emit() only builds and queues an event
+# when its topic has subscribers, so an unobserved emit is one dict lookup;
+# queued events are delivered in order by flush(), once per frame or turn.
+
+@dataclass(frozen=True, slots=True)
+class GameEvent:
+    """Base class for bus events."""
+
+@dataclass(frozen=True, slots=True)
+class RunStarted(GameEvent):
+    pass
+
+@dataclass(frozen=True, slots=True)
+class RunEnded(GameEvent):
+    died: bool
+    rooms_explored: int
+    enemies_defeated: int
+
+@dataclass(frozen=True, slots=True)
+class RoomExplored(GameEvent):
+    room_type: str
+    rooms_explored: int  # This run, including this room
+    world_size: int
+
+@dataclass(frozen=True, slots=True)
+class FightStarted(GameEvent):
+    enemies: int
+    mini_boss: bool
+
+@dataclass(frozen=True, slots=True)
+class FightEnded(GameEvent):
+    won: bool  # False when the player died or fled
+    mini_boss: bool
+    items_used: int
+    turns: int
+
+@dataclass(frozen=True, slots=True)
+class EnemyDefeated(GameEvent):
+    name: str
+    level: int
+    mini_boss: bool
+
+@dataclass(frozen=True, slots=True)
+class DamageDealt(GameEvent):
+    amount: int
+
+@dataclass(frozen=True, slots=True)
+class DamageTaken(GameEvent):
+    amount: int
+
+@dataclass(frozen=True, slots=True)
+class ItemUsed(GameEvent):
+    name: str
+    in_combat: bool
+
+@dataclass(frozen=True, slots=True)
+class EventResolved(GameEvent):
+    event_id: str
+    success: bool
+
+@dataclass(frozen=True, slots=True)
+class ShardsGained(GameEvent):
+    amount: int
+    source: str  # 'exploration', 'event', 'run_end', 'idle'
+
+@dataclass(frozen=True, slots=True)
+class UpgradePurchased(GameEvent):
+    key: str
+    purchased: int  # Level after the purchase
+
+E = TypeVar('E', bound=GameEvent)
+
+class EventBus:
+    """Per-topic subscriber lists with queued, batched delivery."""
+
+    def __init__(self):
+        # Tuples, so handlers may (un)subscribe while being delivered to
+        self._subscribers: Dict[type, Tuple[Callable[[Any], None], ...]] = {}
+        self._queue: Deque[GameEvent] = deque()
+
+    def subscribe(self, topic: Type[E], handler: Callable[[E], None]) -> None:
+        self._subscribers[topic] = self._subscribers.get(topic, ()) + (handler,)
+
+    def unsubscribe(self, topic: Type[E], handler: Callable[[E], None]) -> None:
+        handlers = tuple(h for h in self._subscribers.get(topic, ()) if h != handler)
+        if handlers:
+            self._subscribers[topic] = handlers
+        else:
+            self._subscribers.pop(topic, None)  # Unobserved topics stay free to emit
+
+    def wants(self, topic: Type[GameEvent]) -> bool:
+        return topic in self._subscribers
+
+    def emit(self, topic: Type[E], *args: Any) -> None:
+        """Queue topic(*args) for the next flush if anyone is listening."""
+        if topic in self._subscribers:
+            self._queue.append(topic(*args))
+
+    def flush(self) -> int:
+        """Deliver queued events in order; returns how many were delivered.
+
+        Events emitted by handlers are delivered in the same flush.
+        """
+        delivered = 0
+        while self._queue:
+            event = self._queue.popleft()
+            for handler in self._subscribers.get(type(event), ()):
+                handler(event)
+            delivered += 1
+        return delivered
+
+    def clear(self) -> None:
+        """Drop undelivered events."""
+        self._queue.clear()
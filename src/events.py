@@ -1,8 +1,26 @@
 from typing import Dict, List, Optional, Tuple, Callable
 from dataclasses import dataclass
 from entities import Player, Item
+from effects import Effect, compile_effect
+from event_bus import EventBus, EventResolved, ShardsGained
 from utils import print_colored, get_input, roll_dice, chance, Fore, format_command_help
 
+# Special reward effects by reward type, compiled once at import
+SPECIAL_REWARDS: Dict[str, Effect] = {
+    'health_boost': compile_effect("amount = 20 + 10..30; heal(amount)",
+                                   "You are healed for {amount} HP!"),
+    'knowledge': compile_effect("bonus = 10..25; shards += bonus",
+                                "You gain {bonus} additional Memory Shards from the knowledge!"),
+    'treasure': compile_effect("bonus = 20..40; shards += bonus",
+                               "The treasure contained {bonus} Memory Shards!"),
+    'power': compile_effect("boost = 2..5; mod.attack += boost",
+                            "Your attack power increases by {boost}!"),
+    'shards': compile_effect("bonus = 30..50; shards += bonus",
+                             "You gather {bonus} Memory Shards from the crystal!"),
+    'time': compile_effect("amount = stat.max_health // 2; heal(amount)",
+                           "Time reverses around your wounds, healing you for {amount} HP!"),
+}
+
 @dataclass
 class EventChoice:
     description: str
@@ -25,8 +43,9 @@ class Event:
     difficulty: int = 1  # Event difficulty level
 
 class EventSystem:
-    def __init__(self):
+    def __init__(self, bus: Optional[EventBus] = None):
         self.events = self._initialize_events()
+        self.bus = bus or EventBus()
         
     def _initialize_events(self) -> Dict[str, Event]:
         """Initialize all possible events."""
@@ -204,37 +223,10 @@ class EventSystem:
         
     def apply_special_reward(self, reward_type: str, player: Player) -> str:
         """Apply a special reward effect and return a description."""
-        if reward_type == "health_boost":
-            heal_amount = 20 + roll_dice(10, 30)
-            player.stats.heal(heal_amount)
-            return f"You are healed for {heal_amount} HP!"
-            
-        elif reward_type == "knowledge":
-            bonus_shards = roll_dice(10, 25)
-            player.memory_shards += bonus_shards
-            return f"You gain {bonus_shards} additional Memory Shards from the knowledge!"
-            
-        elif reward_type == "treasure":
-            bonus_shards = roll_dice(20, 40)
-            player.memory_shards += bonus_shards
-            return f"The treasure contained {bonus_shards} Memory Shards!"
-            
-        elif reward_type == "power":
-            attack_boost = roll_dice(2, 5)
-            player.stats.attack += attack_boost
-            return f"Your attack power increases by {attack_boost}!"
-            
-        elif reward_type == "shards":
-            bonus_shards = roll_dice(30, 50)
-            player.memory_shards += bonus_shards
-            return f"You gather {bonus_shards} Memory Shards from the crystal!"
-            
-        elif reward_type == "time":
-            heal_amount = player.stats.max_health // 2
-            player.stats.heal(heal_amount)
-            return f"Time reverses around your wounds, healing you for {heal_amount} HP!"
-            
-        return "No special effect."
+        effect = SPECIAL_REWARDS.get(reward_type)
+        if effect is None:
+            return "No special effect."
+        return effect.apply(player, source=f"event:{reward_type}")
         
     def handle_event(self, event_id: str, player: Player) -> bool:
         """Handle an event. Returns True if player survived the event."""
@@ -243,6 +235,7 @@ class EventSystem:
             return True
             
         event = self.events[event_id]
+        shards_before = player.memory_shards
         
         print_colored(f"\n=== {event.title} ===", Fore.CYAN, bold=True)
         print(f"\n{event.description}\n")
@@ -318,5 +311,9 @@ class EventSystem:
             consolation = 5
             player.memory_shards += consolation
             print_colored(f"\nConsolation: +{consolation} Memory Shards", Fore.YELLOW)
+            
+        self.bus.emit(EventResolved, event_id, success)
+        if player.memory_shards > shards_before:
+            self.bus.emit(ShardsGained, player.memory_shards - shards_before, 'event')
                 
         return True  # For now, events can't kill the player 
\ No newline at end of file
@@ -1,13 +1,30 @@
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from entities import Player, Room, Stats, Item, NPC
 from world_gen import WorldGenerator
 from combat import CombatSystem
 from events import EventSystem
-from utils import print_colored, get_input, clear_screen, Fore, roll_dice, format_command_help
+from utils import print_colored, get_input, clear_screen, Fore, roll_dice, chance, format_command_help
+from effects import Effect, compile_effect
+from modifiers import DERIVED_STATS, COMBAT, PERMANENT, RUN, Modifier
+from pools import ITEM_POOL, release_enemy, release_world
+from snapshots import Timeline, saved_items
+from run_stats import RunStats
+from idle import IdleGenerator
+from achievements import AchievementEngine
+from save_service import SAVES
+from journal import Journal
+from run_save import capture_run, restore_run
+from profile_store import ProfileStore
+from run_history import RunHistory, RunRecord, run_record
+import save_format
+from event_bus import (DamageDealt, EventBus, ItemUsed, RoomExplored, RunEnded, RunStarted, ShardsGained,
+                       UpgradePurchased)
+from upgrades import UpgradeGraph, plan_best_value, plan_cheapest
+from inventory import PickupRules, ProfileStash, Stash, RARITY_RANK, auto_pickup
 from dialogue_data import dialogues
 from palette import SOLAR_GOLD, SUNBEAM_YELLOW, ANCIENT_STONE_GREY, RUSTIC_BROWN, FAE_PINK # Import NPC color
-import os
 import json
+import os
 import random
 import pygame # Added for Pygame functionalities
 
@@ -35,10 +52,47 @@ PLAYER_COLOR = (0, 150, 200)  # A shade of blue
 PLAYER_SIZE = 30
 PLAYER_SPEED = 5 # Player movement speed
 
+SAVE_PATH = 'saves/save.dat'
+LEGACY_SAVE_PATH = 'saves/save.json'  # Read when there is no binary save yet
+RUN_PATH = 'saves/run.dat'  # The run in progress; deleted when the run ends
+
+# Inventory colors and target labels by effect type
+INVENTORY_STYLES = {
+    'heal': (Fore.GREEN, "(Self)"),
+    'damage': (Fore.RED, "(Enemy)"),
+    'attack': (Fore.CYAN, "(Self)"),
+    'defense': (Fore.CYAN, "(Self)"),
+}
+
 class GameManager:
-    def __init__(self):
+    def __init__(self, journal: bool = True, profile: Optional[str] = None,
+                 profile_store: Optional[ProfileStore] = None):
+        # Observers subscribe here; delivered once per frame or turn by update()
+        self.bus = EventBus()
+        # Game statistics, fed by the bus; first, so later observers see them up to date
+        self.run_stats = RunStats()
+        self.run_stats.attach(self.bus)
+        self.achievements = AchievementEngine()
+        self.achievements.attach(self.bus)
+        # With a profile, saves go to a row set in the profile database
+        # instead of saves/save.dat (and its journal)
+        self.profile = profile
+        self.profile_store = profile_store
+        if profile and profile_store is None:
+            self.profile_store = ProfileStore()
+        self.run_path = RUN_PATH if profile is None else f'saves/runs/{profile}.dat'
+        # Journal mode: progression changes are appended between full saves
+        self.journal: Optional[Journal] = None
+        if journal and profile is None:
+            self.journal = Journal('saves/journal.log')
+            self.bus.subscribe(ShardsGained, self._journal_progress)
+            self.bus.subscribe(UpgradePurchased, self._journal_progress)
+        self.autosave = True  # Save the run on every room transition
+        # Every finished run is recorded here for leaderboards (None: not recorded)
+        self.history: Optional[RunHistory] = RunHistory('saves/history.db')
+        self.run_seed = 0  # Seeds the world and every roll of the current run
         self.world_gen = WorldGenerator()
-        self.event_system = EventSystem()
+        self.event_system = EventSystem(self.bus)
         self.player_entity = self._create_player() # Ensures this is player_entity
         # Initialize current_room with a starting room
         self.current_room: Optional[Room]
@@ -79,18 +133,51 @@ class GameManager:
         
         self._load_npcs_for_current_room() # Load NPCs for the starting room
         
+        # Rewindable run history; enemies defeated this run wait here for release
+        self.timeline = Timeline(max_snapshots=10)
+        self.spent_enemies: List = []
+        
+        # Inventory and cross-run stash (a profile's lives in its rows)
+        self.pickup_rules = PickupRules()
+        self.stash = ProfileStash(self.profile_store, profile) if profile else Stash('saves/stash')
+        self._inventory_cache: List[str] = []
+        self._inventory_cache_version = -1
+        
         self.memory_forge_upgrades = self._initialize_upgrades()
-        # Game statistics
-        self.stats = {
-            'enemies_defeated': 0,
-            'rooms_explored': 0,
-            'memory_shards_collected': 0,
-            'upgrades_purchased': 0,
-            'total_damage_dealt': 0,
-            'total_damage_taken': 0,
-            'play_time': 0,  # In seconds
-            'deaths': 0
+        self.upgrade_graph = UpgradeGraph(self.memory_forge_upgrades)
+        self.idle = IdleGenerator()
+        self._forge_cache: tuple = ([], [])
+        self._forge_cache_version = -1
+        # Compile content effects once; saves only carry purchase counts
+        self.upgrade_effects: Dict[str, Effect] = {
+            key: compile_effect(upgrade['effect'])
+            for key, upgrade in self.memory_forge_upgrades.items()
+            if upgrade.get('effect')
         }
+        self.dialogue_actions: Dict[tuple, Effect] = {
+            (node_id, i): compile_effect(option['action'])
+            for node_id, node in dialogues.items()
+            for i, option in enumerate(node['player_options'])
+            if option.get('action')
+        }
+        
+    # Run counters live in run_stats; assignment (run start, rewind) only
+    # changes the current run, never the lifetime totals
+    @property
+    def enemies_defeated(self) -> int:
+        return self.run_stats.run['enemies_defeated']
+    
+    @enemies_defeated.setter
+    def enemies_defeated(self, value: int) -> None:
+        self.run_stats.run['enemies_defeated'] = value
+        
+    @property
+    def rooms_explored(self) -> int:
+        return self.run_stats.run['rooms_explored']
+    
+    @rooms_explored.setter
+    def rooms_explored(self, value: int) -> None:
+        self.run_stats.run['rooms_explored'] = value
         
     def _create_player(self) -> Player: # This refers to the data class Player
         """Create a new player with starting stats."""
@@ -115,7 +202,8 @@ class GameManager:
                 'value': 20,
                 'purchased': 0,
                 'max_purchases': 5,
-                'tier': 1
+                'tier': 1,
+                'effect': 'mod.max_health += value; stat.health = stat.max_health'
             },
             'attack': {
                 'name': 'Enhanced Strike',
@@ -124,7 +212,8 @@ class GameManager:
                 'value': 5,
                 'purchased': 0,
                 'max_purchases': 3,
-                'tier': 1
+                'tier': 1,
+                'effect': 'mod.attack += value'
             },
             'defense': {
                 'name': 'Hardened Shell',
@@ -133,7 +222,8 @@ class GameManager:
                 'value': 3,
                 'purchased': 0,
                 'max_purchases': 3,
-                'tier': 1
+                'tier': 1,
+                'effect': 'mod.defense += value'
             },
             'shard_magnet': {
                 'name': 'Shard Magnetism',
@@ -184,12 +274,33 @@ class GameManager:
                 'max_purchases': 1,
                 'tier': 3,
                 'requires': {'crystal_affinity': 2, 'battle_mastery': 1}
+            },
+            # Generators are passive: idle.py credits their shards over time
+            'shard_well': {
+                'name': 'Shard Well',
+                'description': 'Gather a Memory Shard every 20 seconds, even while away',
+                'cost': 250,
+                'value': 0.05,
+                'purchased': 0,
+                'max_purchases': 5,
+                'tier': 1
+            },
+            'echo_chamber': {
+                'name': 'Echo Chamber',
+                'description': 'Shard Wells produce 50% more',
+                'cost': 600,
+                'value': 0.5,
+                'purchased': 0,
+                'max_purchases': 3,
+                'tier': 2,
+                'requires': {'shard_well': 2}
             }
         }
         
     def save_game(self) -> None:
-        """Save game progress."""
-        save_data = {
+        """Save game progress. Snapshots state here; the file is written in the background."""
+        self._report_save_errors()
+        sections = {
             'player': {
                 'stats': {
                     'health': self.player_entity.stats.health,
@@ -197,29 +308,195 @@ class GameManager:
                     'attack': self.player_entity.stats.attack,
                     'defense': self.player_entity.stats.defense
                 },
+                # Upgrade modifiers are rebuilt from the purchase counts on load
+                'base_stats': dict(self.player_entity.modifiers.base),
+                'modifiers': [
+                    [m.stat, m.amount, m.source]
+                    for m in self.player_entity.modifiers.modifiers
+                    if m.lifetime == PERMANENT and not m.source.startswith('upgrade:')
+                ],
                 'memory_shards': self.player_entity.memory_shards
             },
-            'upgrades': self.memory_forge_upgrades
+            # Upgrade content comes from code; only purchase counts are saved
+            'upgrades': {key: upgrade['purchased'] for key, upgrade in self.memory_forge_upgrades.items()},
+            'statistics': self.run_stats.to_dict(),
+            'idle': self.idle.to_dict(),
+            'achievements': self.achievements.to_dict(),
+            'meta': {'journal_seq': 0}
         }
         
-        os.makedirs('saves', exist_ok=True)
-        with open('saves/save.json', 'w') as f:
-            json.dump(save_data, f, indent=2)
+        if self.profile:
+            profile, store = self.profile, self.profile_store
+            SAVES.submit(self._profile_key(), sections, write=lambda data: store.save_profile(profile, data))
+            return
+        if self.journal is None:
+            SAVES.submit(SAVE_PATH, sections, encode=save_format.encode)
+            return
+        # A full save compacts the journal: records it covers go once it is written
+        journal = self.journal
+        sections['meta']['journal_seq'] = seq = journal.seq
+        journal.compacting = True
+        SAVES.submit(SAVE_PATH, sections, encode=save_format.encode,
+                     on_written=lambda: journal.truncate(seq), on_failed=lambda error: journal.compaction_failed())
+
+    def _report_save_errors(self) -> None:
+        """Warn about background writes that failed since the last check; they are lost."""
+        for path, error in SAVES.take_errors():
+            print_colored(f"\nWarning: could not save {path}: {error}", Fore.RED, bold=True)
+
+    def _profile_key(self) -> str:
+        # Coalesces background saves per profile
+        return f"{self.profile_store.path}#{self.profile}"
+
+    def _open_save(self) -> Optional[Any]:
+        """The current save, or a pre-binary JSON save converted on the fly."""
+        if self.profile:
+            SAVES.wait(self._profile_key())
+            self._report_save_errors()
+            sections = self.profile_store.load_profile(self.profile)
+            return None if sections is None else save_format.SaveFile.from_sections(sections)
+        SAVES.wait(SAVE_PATH)
+        self._report_save_errors()
+        try:
+            return save_format.read(SAVE_PATH)
+        except FileNotFoundError:
+            pass
+        except save_format.SaveFormatError as error:
+            self._set_aside(SAVE_PATH, error)
+            return None
+        try:
+            with open(LEGACY_SAVE_PATH, 'r') as f:
+                return save_format.from_json(json.load(f))
+        except FileNotFoundError:
+            return None
+
+    def _set_aside(self, path: str, error: Exception) -> None:
+        """Move an unreadable save out of the way, keeping it, so the game can start fresh."""
+        aside = path + '.unreadable'
+        os.replace(path, aside)
+        print_colored(f"\n{error}. It was moved to {aside}; starting fresh.", Fore.RED, bold=True)
+
+    def _journal_progress(self, event) -> None:
+        """Append the progression state an event changed."""
+        if isinstance(event, UpgradePurchased):
+            self.journal.append('upgrade', event.key, event.purchased)
+        # Absolute values, so replay is idempotent and a rewind can't double count
+        idle = self.idle.to_dict()
+        self.journal.append('shards', self.player_entity.memory_shards, idle['last_seen'], idle['remainder'])
+        if self.journal.needs_compaction():
+            self.save_game()
+
+    def _replay_journal(self, after: int) -> Optional[Dict[str, float]]:
+        """Apply journal records newer than the save; returns the latest idle state."""
+        idle = None
+        for record in self.journal.records(after):
+            kind = record[1]
+            if kind == 'upgrade' and record[2] in self.memory_forge_upgrades:
+                self.memory_forge_upgrades[record[2]]['purchased'] = record[3]
+            elif kind == 'shards':
+                self.player_entity.memory_shards = record[2]
+                idle = {'last_seen': record[3], 'remainder': record[4]}
+        return idle
             
     def load_game(self) -> bool:
         """Load game progress. Returns True if successful."""
-        try:
-            with open('saves/save.json', 'r') as f:
-                save_data = json.load(f)
-                
-            player_stats = save_data['player']['stats']
-            self.player_entity.stats = Stats(**player_stats)
-            self.player_entity.memory_shards = save_data['player']['memory_shards']
-            self.memory_forge_upgrades = save_data['upgrades']
-            return True
-        except FileNotFoundError:
+        save = self._open_save()
+        if save is None:
             return False
+        with save:
+            player_data = save['player']
+            base = player_data.get('base_stats', player_data['stats'])
+            modifiers = self.player_entity.modifiers
+            modifiers.restore((
+                {stat: base[stat] for stat in DERIVED_STATS},
+                [Modifier(stat, amount, source) for stat, amount, source in player_data.get('modifiers', [])]
+            ))
+            self.player_entity.memory_shards = player_data['memory_shards']
+            for key, purchased in save['upgrades'].items():
+                if key in self.memory_forge_upgrades:
+                    self.memory_forge_upgrades[key]['purchased'] = purchased
+            idle = save.get('idle')
+            if self.journal:
+                journal_seq = save.get('meta', {}).get('journal_seq', 0)
+                idle = self._replay_journal(journal_seq) or idle
+                self.journal.resume_after(journal_seq)
+            self.upgrade_graph.rebuild(self.memory_forge_upgrades)
+            self.run_stats.load(save.get('statistics', {}))
+            self.achievements.load(save.get('achievements', {}))
+            self._apply_upgrade_modifiers()
+            if 'base_stats' not in player_data:
+                # Older saves stored final stats with every bonus baked in
+                for stat in DERIVED_STATS:
+                    modifiers.set_base(stat, player_data['stats'][stat] - modifiers.bonus(stat))
+            self.player_entity.stats.health = player_data['stats']['health']
+            if idle:
+                self.idle.remainder = idle['remainder']
+                gained = self.idle.catch_up(self.player_entity, self.memory_forge_upgrades, idle['last_seen'])
+                if gained:
+                    print_colored(f"Your Shard Wells gathered {gained} Memory Shards while you were away.", Fore.CYAN)
+        return True
             
+    def update(self) -> None:
+        """Per-frame (or per-prompt) housekeeping: idle accrual, then event delivery."""
+        self.update_idle()
+        self.bus.flush()
+
+    def update_idle(self) -> None:
+        """Credit idle shards generated since the last update."""
+        gained = self.idle.tick(self.player_entity, self.memory_forge_upgrades)
+        if gained:
+            self.bus.emit(ShardsGained, gained, 'idle')
+
+    def show_new_achievements(self) -> None:
+        for achievement in self.achievements.pop_recent():
+            print_colored(f"Achievement unlocked: {achievement.name} - {achievement.description}",
+                          Fore.MAGENTA, bold=True)
+
+    def show_achievements(self) -> None:
+        """List every achievement with its progress."""
+        clear_screen()
+        print_colored("\n=== ACHIEVEMENTS ===", Fore.CYAN, bold=True)
+        engine = self.achievements
+        for key, achievement in engine.achievements.items():
+            if key in engine.unlocked:
+                print_colored(f"[x] {achievement.name} - {achievement.description}", Fore.GREEN)
+            else:
+                progress = f" ({engine.progress[key]}/{achievement.count})" if achievement.count > 1 else ""
+                print(f"[ ] {achievement.name} - {achievement.description}{progress}")
+        input("\nPress Enter to continue...")
+
+    def show_history(self) -> None:
+        """Show the leaderboard, personal bests and other runs on the best run's seed."""
+        clear_screen()
+        print_colored("\n=== RUN HISTORY ===", Fore.CYAN, bold=True)
+        if not self.history:
+            print("\nRun history is disabled.")
+            input("\nPress Enter to continue...")
+            return
+        def line(rank: int, run: RunRecord) -> str:
+            who = f"{run.profile}: " if run.profile else ""
+            return (f"{rank:>2}. {who}{run.shards_earned} shards, {run.rooms_explored} rooms, "
+                    f"{run.enemies_defeated} enemies - slain by {run.cause} (seed {run.seed})")
+        print_colored("\nTop Runs:", Fore.YELLOW)
+        top = self.history.leaderboard()
+        for rank, run in enumerate(top, 1):
+            print(line(rank, run))
+        if not top:
+            print("No runs yet.")
+        bests = self.history.personal_bests(self.profile or '')
+        if bests:
+            print_colored("\nPersonal Bests:", Fore.YELLOW)
+            for metric, value in bests.items():
+                print(f"{metric.replace('_', ' ').title()}: {value}")
+            seed = self.history.personal_best(self.profile or '').seed
+            print_colored(f"\nOn Your Best Seed ({seed}):", Fore.YELLOW)
+            for rank, run in enumerate(self.history.seed_runs(seed, limit=5), 1):
+                print(line(rank, run))
+        input("\nPress Enter to continue...")
+
+    def _on_room_explored(self) -> None:
+        self.bus.emit(RoomExplored, self.current_room.room_type, self.rooms_explored + 1, len(self.all_rooms))
+
     def calculate_shard_multiplier(self) -> float:
         """Calculate the current Memory Shard gain multiplier."""
         base_multiplier = 1.0
@@ -230,15 +507,53 @@ class GameManager:
             )
         return base_multiplier
         
+    def _apply_upgrade_modifiers(self) -> None:
+        """Rebuild the stat modifiers granted by purchased upgrades."""
+        self.player_entity.modifiers.remove_sources('upgrade:')
+        for key, effect in self.upgrade_effects.items():
+            upgrade = self.memory_forge_upgrades.get(key)
+            for _ in range(upgrade['purchased'] if upgrade else 0):
+                effect.apply(self.player_entity, upgrade['value'], source=f"upgrade:{key}")
+        
     def apply_run_stats(self) -> None:
-        """Apply run-based stat bonuses."""
+        """Apply run-based stat bonuses.
+        
+        Sets the bonus rather than adding to it, so calling this every loop
+        only touches the stats when enemies_defeated has changed.
+        """
         if 'battle_mastery' in self.memory_forge_upgrades and self.memory_forge_upgrades['battle_mastery']['purchased'] > 0:
             bonus = self.enemies_defeated * self.memory_forge_upgrades['battle_mastery']['value']
-            self.player_entity.stats.attack += bonus
-            self.player_entity.stats.defense += bonus
-            if bonus > 0:
+            modifiers = self.player_entity.modifiers
+            changed = modifiers.set('run:battle_mastery', 'attack', bonus, RUN)
+            changed = modifiers.set('run:battle_mastery', 'defense', bonus, RUN) or changed
+            if changed and bonus > 0:
                 print_colored(f"\nBattle Mastery: +{bonus} to attack and defense!", Fore.CYAN)
                 
+    def try_resurrect(self) -> bool:
+        """Spend a 'resurrect' item to rewind to entering the current room."""
+        inventory = self.player_entity.inventory
+        # The rewind restores the inventory as it was on entering the room, so
+        # an item picked up since can't pay for it
+        saved = self.timeline.peek(self.player_entity)
+        items = saved_items(saved) if saved else list(inventory)
+        if not any(item.special_effect == 'resurrect' for item in items):
+            return False
+        run_state = self.timeline.rewind()
+        if run_state is None:
+            return False
+        
+        self.current_room = run_state['current_room']
+        self.enemies_defeated = run_state['enemies_defeated']
+        self.rooms_explored = run_state['rooms_explored']
+        # The rewind restored the inventory as it was, so spend the item afterwards
+        for index, item in enumerate(inventory):
+            if item.special_effect == 'resurrect':
+                spent = self.player_entity.remove_item(index)
+                break
+        print_colored(f"\n{spent.name} shatters and time folds back around you!", Fore.MAGENTA, bold=True)
+        input("\nPress Enter to continue...")
+        return True
+        
     def check_item_preservation(self) -> bool:
         """Check if an item should be preserved after use."""
         if 'crystal_affinity' in self.memory_forge_upgrades:
@@ -249,16 +564,21 @@ class GameManager:
             return chance(preservation_chance)
         return False
         
-    def start_new_run(self) -> None:
-        """Start a new run in the Shardlands."""
+    def start_new_run(self, seed: Optional[int] = None) -> None:
+        """Start a new run in the Shardlands, on seed's world if given."""
+        # Runs on the same seed generate the same world, so they can be compared
+        self.run_seed = random.getrandbits(32) if seed is None else seed
+        random.seed(self.run_seed)
+        
         # Reset run statistics
-        self.enemies_defeated = 0
-        self.rooms_explored = 0
+        self.bus.emit(RunStarted)
         
-        # Generate new world
+        # Return the previous world to the entity pools, then generate a new one
+        self._release_world()
         self.current_room, self.all_rooms = self.world_gen.generate_world()
         
-        # Reset player health but keep upgrades
+        # Drop last run's bonuses and reset player health but keep upgrades
+        self.player_entity.modifiers.expire(RUN)
         self.player_entity.stats.health = self.player_entity.stats.max_health
         
         # Apply Void Touched (start with legendary item)
@@ -270,30 +590,87 @@ class GameManager:
         
         print_colored("\nYou enter the Shardlands...", Fore.CYAN, bold=True)
         
-        # Run the game session until death
+        self._play_run()
+        
+    def _play_run(self) -> None:
+        """Run the game session until death."""
         while True:
             if not self.handle_room():  # handle_room now returns False on death
                 break  # Exit the run loop on death
+
+    def _release_world(self) -> None:
+        self.timeline.clear()
+        in_rooms = {id(enemy) for room in self.all_rooms for enemy in room.enemies}
+        for enemy in self.spent_enemies:
+            if id(enemy) not in in_rooms:
+                release_enemy(enemy)
+        self.spent_enemies = []
+        release_world(self.all_rooms)
+
+    def autosave_run(self) -> None:
+        """Queue a save of the whole run; only the capture runs on this thread."""
+        if self.autosave:
+            self._report_save_errors()
+            SAVES.submit(self.run_path, capture_run(self), encode=save_format.encode)
+
+    def has_saved_run(self) -> bool:
+        SAVES.wait(self.run_path)
+        return os.path.exists(self.run_path)
+
+    def continue_run(self) -> bool:
+        """Resume the autosaved run. Returns False if there is none."""
+        SAVES.wait(self.run_path)
+        self._report_save_errors()
+        try:
+            save = save_format.read(self.run_path)
+        except FileNotFoundError:
+            return False
+        except save_format.SaveFormatError as error:
+            self._set_aside(self.run_path, error)
+            return False
+        with save:
+            self._release_world()
+            restore_run(self, save)
+        self._load_npcs_for_current_room()
+        print_colored("\nYou return to the Shardlands...", Fore.CYAN, bold=True)
+        self._play_run()
+        return True
         
     def handle_room(self) -> bool:
         """Handle player interactions in the current room.
         Returns False if the player died, True otherwise."""
+        self.bus.flush()  # The autosave and the rewind point read counters the bus feeds
+        self.autosave_run()
+        if not self.current_room.visited:
+            # Entering a new room is a rewind point (O(1) until something changes)
+            self.timeline.snapshot(
+                self.current_room.room_type,
+                current_room=self.current_room,
+                enemies_defeated=self.enemies_defeated,
+                rooms_explored=self.rooms_explored
+            )
         while True:
+            # Only the current room and the player change below, starting with the idle tick
+            self.timeline.touch(self.current_room)
+            self.timeline.touch(self.player_entity)
+            self.update()
             clear_screen()
             
             # Apply run-based stat bonuses
             self.apply_run_stats()
             
             if not self.current_room.visited:
-                self.rooms_explored += 1
+                self._on_room_explored()
                 # Quick Learner bonus
                 if ('quick_learner' in self.memory_forge_upgrades and 
                     self.memory_forge_upgrades['quick_learner']['purchased'] > 0):
                     bonus = self.memory_forge_upgrades['quick_learner']['value']
                     self.player_entity.memory_shards += bonus
+                    self.bus.emit(ShardsGained, bonus, 'exploration')
                     print_colored(f"Quick Learner: +{bonus} Memory Shards!", Fore.YELLOW)
             
             print_colored(f"\n=== {self.current_room.room_type.upper()} ROOM ===", Fore.CYAN, bold=True)
+            self.show_new_achievements()
             print(f"\n{self.current_room.description}")
             print(f"\nYou: {self.player_entity}")
             
@@ -307,39 +684,44 @@ class GameManager:
             # Handle room based on type
             if not self.current_room.visited:
                 if self.current_room.room_type == 'combat' and self.current_room.enemies:
-                    combat = CombatSystem(self.player_entity, self.current_room.enemies)
+                    combat = CombatSystem(self.player_entity, self.current_room.enemies, self.bus)
                     survived, loot = combat.run_combat()
+                    self.player_entity.modifiers.expire(COMBAT)
                     if not survived:
-                        self.handle_death()
+                        if self.try_resurrect():
+                            return True  # Replay the room from the rewind point
+                        killers = [enemy.name for enemy in self.current_room.enemies if enemy.stats.is_alive()]
+                        self.handle_death(', '.join(killers) or 'unknown')
                         return False  # Signal player death
                     else:
-                        self.enemies_defeated += len(combat.defeated_enemies)
+                        # Released at the end of the run; a rewind may bring them back
+                        self.spent_enemies.extend(combat.defeated_enemies)
                         # Handle loot
                         if loot:
                             print("\nCollecting loot...")
-                            for item in loot:
-                                if self.player_entity.can_add_item():
-                                    self.player_entity.add_item(item)
-                                    print_colored(f"Added {item.name} to inventory!", Fore.GREEN)
-                                else:
-                                    print_colored("Inventory full! Cannot pick up more items.", Fore.RED)
-                                    break
+                            picked, left = auto_pickup(self.player_entity, loot, self.pickup_rules)
+                            for item in picked:
+                                print_colored(f"Added {item.name} to inventory!", Fore.GREEN)
+                            if left:
+                                print_colored(f"Inventory full! Left {len(left)} item(s) behind.", Fore.RED)
+                            for item in left:
+                                ITEM_POOL.release(item)
                             input("\nPress Enter to continue...")
                         
                 elif self.current_room.room_type == 'treasure' and self.current_room.items:
                     print("\nYou found items!")
-                    for item in self.current_room.items:
-                        if self.player_entity.can_add_item():
-                            self.player_entity.add_item(item)
-                            print_colored(f"Added {item.name} to inventory!", Fore.GREEN)
-                        else:
-                            print_colored("Inventory full! Cannot pick up more items.", Fore.RED)
-                            break
+                    picked, left = auto_pickup(self.player_entity, self.current_room.items, self.pickup_rules)
+                    for item in picked:
+                        print_colored(f"Added {item.name} to inventory!", Fore.GREEN)
+                    if left:
+                        print_colored(f"Inventory full! Left {len(left)} item(s) behind.", Fore.RED)
+                    # Picked-up items leave the room so release_world won't recycle them
+                    self.current_room.items[:] = left
                             
                 elif self.current_room.room_type == 'event' and self.current_room.event_id:
                     survived = self.event_system.handle_event(self.current_room.event_id, self.player_entity)
                     if not survived:
-                        self.handle_death()
+                        self.handle_death(self.event_system.events[self.current_room.event_id].title)
                         return False  # Signal player death
                         
                 self.current_room.visited = True
@@ -396,22 +778,8 @@ class GameManager:
             return
             
         print("\nInventory:")
-        for i, item in enumerate(self.player_entity.inventory, 1):
-            # Color code items based on their target type
-            if item.effect_type == 'heal':
-                color = Fore.GREEN
-                target = "(Self)"
-            elif item.effect_type == 'damage':
-                color = Fore.RED
-                target = "(Enemy)"
-            elif item.effect_type in ['attack', 'defense']:
-                color = Fore.CYAN
-                target = "(Self)"
-            else:
-                color = Fore.WHITE
-                target = ""
-                
-            print(f"{i}. {color}{item.name} {target}{Fore.WHITE} - {item.description}")
+        for line in self._inventory_lines():
+            print(line)
             
         # Available commands for inventory
         commands = {
@@ -462,28 +830,102 @@ class GameManager:
                         valid_options=[str(i) for i in range(1, len(self.current_room.enemies) + 1)]
                     )) - 1
                     target = self.current_room.enemies[target_idx]
+                    health_before = target.stats.health
                     result = item.use(target)
+                    self.bus.emit(DamageDealt, max(0, health_before - target.stats.health))
                     
-                    # Check if enemy died
+                    # A kill counts as in combat; the enemy is released with the run
                     if not target.stats.is_alive():
-                        print_colored(f"{target.name} was defeated!", Fore.GREEN)
-                        self.current_room.enemies.remove(target)
+                        combat = CombatSystem(self.player_entity, self.current_room.enemies, self.bus)
+                        combat.defeat(target)
+                        self.spent_enemies.extend(combat.defeated_enemies)
                 else:  # Healing and buff items ALWAYS target player
                     result = item.use(self.player_entity)
                         
                 print_colored(result, Fore.YELLOW)
+                self.bus.emit(ItemUsed, item.name, bool(in_combat))
                 
                 # Check for item preservation
                 if self.check_item_preservation():
                     self.player_entity.add_item(item)
                     print_colored("Crystal Affinity preserved the item!", Fore.CYAN)
                 
+    def _inventory_lines(self) -> List[str]:
+        """Rendered inventory lines, rebuilt only when the inventory changes."""
+        inventory = self.player_entity.inventory
+        if self._inventory_cache_version != inventory.version:
+            lines = []
+            for i, stack in enumerate(inventory.stacks, 1):
+                item = stack.item
+                # Color code items based on their target type
+                color, target = INVENTORY_STYLES.get(item.effect_type, (Fore.WHITE, ""))
+                count = f" x{stack.count}" if stack.count > 1 else ""
+                lines.append(f"{i}. {color}{item.name}{count} {target}{Fore.WHITE} - {item.description}")
+            self._inventory_cache = lines
+            self._inventory_cache_version = inventory.version
+        return self._inventory_cache
+        
+    def stash_menu(self) -> None:
+        """Move items between the inventory and the persistent stash."""
+        while True:
+            clear_screen()
+            print_colored("\n=== STASH ===", Fore.CYAN, bold=True)
+            entries = sorted(self.stash.entries(),
+                             key=lambda entry: (-RARITY_RANK.get(entry[0][1], 0), entry[0][0], -entry[0][2]))
+            if entries:
+                for i, (key, count) in enumerate(entries, 1):
+                    item = Item(template_id=key[0], effect_value=key[2], rarity=key[1], durability=key[3])
+                    print(f"{i}. {item.name} x{count} - {item.description}")
+            else:
+                print("\nThe stash is empty.")
+            
+            print("\nInventory:")
+            for line in self._inventory_lines():
+                print(line)
+            
+            commands = {
+                'deposit': [str(i) for i in range(1, len(self.player_entity.inventory) + 1)],
+                'withdraw': [str(i) for i in range(1, len(entries) + 1)],
+                'back': []
+            }
+            action = get_input(
+                f"\nWhat would you like to do? ({format_command_help(commands)})",
+                valid_options=list(commands.keys()),
+                allow_compound=True
+            )
+            parts = action.split()
+            command = parts[0]
+            args = parts[1:] if len(parts) > 1 else []
+            
+            if command == 'back':
+                break
+            if not commands[command]:
+                print_colored("Nothing to move!", Fore.RED)
+                continue
+            if args and args[0] in commands[command]:
+                index = int(args[0]) - 1
+            else:
+                index = int(get_input("Choose item number", valid_options=commands[command])) - 1
+                
+            if command == 'deposit':
+                item = self.player_entity.remove_item(index)
+                self.stash.deposit(item)
+            else:
+                key = entries[index][0]
+                item = self.stash.withdraw(key)
+                if not self.player_entity.add_item(item):
+                    self.stash.deposit(item)
+                    print_colored("Inventory full!", Fore.RED)
+            self.stash.save()
+            
     def show_status(self) -> None:
         """Display player status."""
         print(f"\nHealth: {self.player_entity.stats.health}/{self.player_entity.stats.max_health}")
         print(f"Attack: {self.player_entity.stats.attack}")
         print(f"Defense: {self.player_entity.stats.defense}")
-        print(f"Memory Shards: {self.player_entity.memory_shards}")
+        print(f"Memory Shards: {self.player_entity.memory_shards} "
+              f"({self.run_stats.shards_per_minute:.1f} per minute)")
+        print(f"Rooms explored: {self.rooms_explored}, enemies defeated: {self.enemies_defeated}")
         
     def _handle_easter_egg(self) -> None:
         """Handle the secret '137' input easter egg."""
@@ -493,13 +935,11 @@ class GameManager:
         print("\nThe fine-structure constant of the universe whispers its secrets...")
         
         # Give the player a special reward
-        special_stats = {
-            'health': self.player_entity.stats.health + 37,
-            'max_health': self.player_entity.stats.max_health + 37,
-            'attack': self.player_entity.stats.attack + 13,
-            'defense': self.player_entity.stats.defense + 7
-        }
-        self.player_entity.stats = Stats(**special_stats)
+        modifiers = self.player_entity.modifiers
+        modifiers.add(Modifier('max_health', 37, 'easter_egg'))
+        modifiers.add(Modifier('attack', 13, 'easter_egg'))
+        modifiers.add(Modifier('defense', 7, 'easter_egg'))
+        self.player_entity.stats.health += 37
         self.player_entity.memory_shards += 137
         
         print_colored("\nYou feel your being resonate with cosmic energy!", Fore.CYAN)
@@ -513,24 +953,40 @@ class GameManager:
     def main_menu(self) -> None:
         """Display and handle the main menu."""
         while True:
+            self.update()
             clear_screen()
             print_colored("\n=== ECHOES OF THE SHARDLANDS ===", Fore.CYAN, bold=True)
-            print("\n1. New Run")
+            saved_run = self.has_saved_run()
+            self._report_save_errors()
+            print("\n1. Continue Run" if saved_run else "\n1. New Run")
             print("2. Memory Forge")
-            print("3. Quit")
+            print("3. Stash")
+            print("4. Achievements")
+            print("5. Run History")
+            print("6. Quit")
+            self.show_new_achievements()
             
             action = get_input(
                 "\nChoose action",
-                valid_options=['1', '2', '3', '137']  # Secretly accept '137'
+                valid_options=['1', '2', '3', '4', '5', '6', '137']  # Secretly accept '137'
             )
             
             if action == '137':
                 self._handle_easter_egg()
             elif action == '1':
-                self.start_new_run()
+                if not (saved_run and self.continue_run()):
+                    self.start_new_run()
             elif action == '2':
                 self.memory_forge()
             elif action == '3':
+                self.stash_menu()
+            elif action == '4':
+                self.show_achievements()
+            elif action == '5':
+                self.show_history()
+            elif action == '6':
+                SAVES.wait()
+                self._report_save_errors()
                 print_colored("\nThanks for playing!", Fore.YELLOW)
                 break
                 
@@ -539,23 +995,40 @@ class GameManager:
         print_colored(f"\n+{shards} Memory Shards from {source}!", Fore.YELLOW, bold=True)
         print_colored(f"Total Memory Shards: {self.player_entity.memory_shards}", Fore.CYAN)
         
-    def handle_death(self) -> None:
-        """Handle player death."""
+    def handle_death(self, cause: str = 'unknown') -> None:
+        """Handle player death; cause is what killed the player."""
         print_colored("\nYou have been defeated!", Fore.RED, bold=True)
+        self.bus.flush()  # The counters read below are fed by the bus
+        SAVES.discard(self.run_path)  # The run is over; nothing to continue
         
         # Calculate Memory Shard rewards with bonuses
-        rooms_explored = len([r for r in self.all_rooms if r.visited])
+        rooms_explored = self.rooms_explored
         base_shards = rooms_explored * 10
         depth_bonus = max(0, rooms_explored - 5) * 5  # Bonus for exploring deeper
         enemy_bonus = self.enemies_defeated * 5  # Bonus for defeated enemies
         
         total_shards = base_shards + depth_bonus + enemy_bonus
         self.player_entity.memory_shards += total_shards
+        self.bus.emit(ShardsGained, total_shards, 'run_end')
+        self.bus.emit(RunEnded, True, rooms_explored, self.enemies_defeated)
+        self.bus.flush()  # The run is over; observers see it before the summary
         
         # Show run summary
         print_colored("\n=== RUN SUMMARY ===", Fore.CYAN, bold=True)
         print("\nYour journey into the Shardlands has ended...")
         print(f"You explored {rooms_explored} rooms and defeated {self.enemies_defeated} enemies")
+        run = self.run_stats.run
+        print(f"Damage dealt: {run['total_damage_dealt']}, taken: {run['total_damage_taken']} "
+              f"over {run['fights']} fights (avg {self.run_stats.mean_damage_per_fight:.1f} per fight)")
+        print(f"Run time: {int(run['play_time']) // 60}m {int(run['play_time']) % 60}s")
+        print(f"Slain by: {cause} (seed {self.run_seed})")
+        if self.history:
+            record = run_record(self, cause)
+            best = self.history.personal_best(record.profile)
+            self.history.record(record)
+            if best is None or record.shards_earned > best.shards_earned:
+                print_colored("New personal best!", Fore.YELLOW, bold=True)
+        self.show_new_achievements()
         
         # Show final stats
         print_colored("\nFinal Stats:", Fore.YELLOW)
@@ -573,106 +1046,110 @@ class GameManager:
         print_colored(f"\nTotal Shards Earned: {total_shards}", Fore.YELLOW, bold=True)
         
         self.save_game()
+        self.stash.save()
         input("\nPress Enter to return to main menu...")
         
     def check_upgrade_requirements(self, upgrade_key: str) -> bool:
         """Check if requirements are met for an upgrade."""
-        upgrade = self.memory_forge_upgrades[upgrade_key]
-        if 'requires' not in upgrade:
-            return True
-            
-        for req_key, req_amount in upgrade['requires'].items():
-            if self.memory_forge_upgrades[req_key]['purchased'] < req_amount:
-                return False
-        return True
+        return self.upgrade_graph.requirements_met(upgrade_key)
+        
+    def _forge_menu(self) -> tuple:
+        """Rendered forge lines and the purchasable keys in menu order.
+        
+        Rebuilt only after a purchase or load changes the upgrade graph.
+        """
+        graph = self.upgrade_graph
+        if self._forge_cache_version != graph.version:
+            lines, available_upgrades = [], []
+            for tier, keys in graph.open_by_tier().items():
+                lines.append((f"\nTier {tier} Upgrades:", Fore.YELLOW, True))
+                for key in keys:
+                    upgrade = self.memory_forge_upgrades[key]
+                    if graph.requirements_met(key):
+                        available_upgrades.append(key)
+                        lines.append((f"{len(available_upgrades)}. {upgrade['name']} "
+                                      f"({upgrade['description']}) - Cost: {upgrade['cost']} "
+                                      f"[{upgrade['purchased']}/{upgrade['max_purchases']}]", Fore.WHITE, False))
+                    else:
+                        reqs = []
+                        for req_key, req_amount in upgrade['requires'].items():
+                            req_name = self.memory_forge_upgrades[req_key]['name']
+                            current = self.memory_forge_upgrades[req_key]['purchased']
+                            reqs.append(f"{req_name} ({current}/{req_amount})")
+                        lines.append((f"? {upgrade['name']} - Requires: {', '.join(reqs)}", Fore.RED, False))
+            self._forge_cache = (lines, available_upgrades)
+            self._forge_cache_version = graph.version
+        return self._forge_cache
 
     def memory_forge(self) -> None:
         """Handle the Memory Forge upgrade system."""
         while True:
+            self.update()
             clear_screen()
             print_colored("\n=== MEMORY FORGE ===", Fore.CYAN, bold=True)
+            self.show_new_achievements()
             print(f"\nMemory Shards: {self.player_entity.memory_shards}")
             
-            # Group upgrades by tier
-            upgrades_by_tier: Dict[int, List[str]] = {}
-            for key, upgrade in self.memory_forge_upgrades.items():
-                if upgrade['purchased'] < upgrade['max_purchases']:
-                    tier = upgrade.get('tier', 1)
-                    if tier not in upgrades_by_tier:
-                        upgrades_by_tier[tier] = []
-                    upgrades_by_tier[tier].append(key)
-            
-            if not upgrades_by_tier:
+            # Upgrades grouped by tier, maintained by the upgrade graph
+            lines, available_upgrades = self._forge_menu()
+            if not lines:
                 print_colored("\nAll upgrades maxed out!", Fore.YELLOW)
                 break
             
-            # Display upgrades by tier
-            available_upgrades = []
-            for tier in sorted(upgrades_by_tier.keys()):
-                print_colored(f"\nTier {tier} Upgrades:", Fore.YELLOW, bold=True)
-                for key in upgrades_by_tier[tier]:
-                    upgrade = self.memory_forge_upgrades[key]
-                    meets_requirements = self.check_upgrade_requirements(key)
-                    
-                    if meets_requirements:
-                        available_upgrades.append(key)
-                        print(f"{len(available_upgrades)}. {upgrade['name']} "
-                              f"({upgrade['description']}) - Cost: {upgrade['cost']} "
-                              f"[{upgrade['purchased']}/{upgrade['max_purchases']}]")
-                    else:
-                        print_colored(f"? {upgrade['name']} - Requires: ", Fore.RED, end='')
-                        reqs = []
-                        for req_key, req_amount in upgrade['requires'].items():
-                            req_name = self.memory_forge_upgrades[req_key]['name']
-                            current = self.memory_forge_upgrades[req_key]['purchased']
-                            reqs.append(f"{req_name} ({current}/{req_amount})")
-                        print_colored(', '.join(reqs), Fore.RED)
+            for text, color, bold in lines:
+                print_colored(text, color, bold=bold)
             
-            actions = ['back'] + [str(i) for i in range(1, len(available_upgrades) + 1)]
+            actions = ['back', 'plan'] + [str(i) for i in range(1, len(available_upgrades) + 1)]
             action = get_input(
-                "\nChoose upgrade to purchase (number or 'back')",
+                "\nChoose upgrade to purchase (number, 'plan' or 'back')",
                 valid_options=actions
             )
             
             if action == 'back':
                 break
+            if action == 'plan':
+                self.show_upgrade_plan()
+                continue
                 
             upgrade_key = available_upgrades[int(action) - 1]
             upgrade = self.memory_forge_upgrades[upgrade_key]
             
             if self.player_entity.memory_shards >= upgrade['cost']:
                 self.player_entity.memory_shards -= upgrade['cost']
-                upgrade['purchased'] += 1
+                self.upgrade_graph.purchase(upgrade_key)
+                self.bus.emit(UpgradePurchased, upgrade_key, upgrade['purchased'])
                 
-                # Apply upgrade
-                if upgrade_key == 'max_health':
-                    self.player_entity.stats.max_health += upgrade['value']
-                    self.player_entity.stats.health = self.player_entity.stats.max_health
-                elif upgrade_key == 'attack':
-                    self.player_entity.stats.attack += upgrade['value']
-                elif upgrade_key == 'defense':
-                    self.player_entity.stats.defense += upgrade['value']
-                elif upgrade_key == 'shard_magnet':
-                    # This will be applied in reward calculations
-                    pass
-                elif upgrade_key == 'quick_learner':
-                    # This will be applied in room exploration
-                    pass
-                elif upgrade_key == 'battle_mastery':
-                    # This will be applied in combat
-                    pass
-                elif upgrade_key == 'crystal_affinity':
-                    # This will be applied in item usage
-                    pass
-                elif upgrade_key == 'void_touched':
-                    # This will be applied at run start
-                    pass
+                # Apply upgrade; passive upgrades have no effect and are
+                # read where they apply (rewards, exploration, combat, items, run start)
+                effect = self.upgrade_effects.get(upgrade_key)
+                if effect:
+                    effect.apply(self.player_entity, upgrade['value'], source=f"upgrade:{upgrade_key}")
                     
                 print_colored(f"\nPurchased {upgrade['name']}!", Fore.GREEN)
-                self.save_game()
+                self.bus.flush()  # Counts and journals the purchase now rather than at the next prompt
+                if not self.journal:
+                    self.save_game()
             else:
                 print_colored("\nNot enough Memory Shards!", Fore.RED)
                 
+    def show_upgrade_plan(self) -> None:
+        """Suggest purchase orders for the current shards and locked upgrades."""
+        names = {key: upgrade['name'] for key, upgrade in self.memory_forge_upgrades.items()}
+        shards = self.player_entity.memory_shards
+        _, purchases = plan_best_value(self.memory_forge_upgrades, shards)
+        print_colored(f"\nMost upgrades for {shards} shards:", Fore.CYAN, bold=True)
+        print(' -> '.join(names[key] for key in purchases) if purchases else "Nothing affordable yet")
+        
+        print_colored("\nCheapest path to locked upgrades:", Fore.CYAN, bold=True)
+        for key in self.upgrade_graph.order:
+            if self.upgrade_graph.requirements_met(key):
+                continue
+            plan = plan_cheapest(self.memory_forge_upgrades, key)
+            if plan:
+                cost, path = plan
+                print(f"{names[key]} ({cost} shards): {' -> '.join(names[step] for step in path)}")
+        input("\nPress Enter to continue...")
+        
     def run(self) -> None:
         """Start the game."""
         # Try to load saved game
@@ -756,42 +1233,21 @@ class GameManager:
                 self.npc_rects.append(npc_rect)
                 print(f"Loaded NPC: {npc_data.name} at {npc_rect.topleft}")
 
-# Helper function for text wrapping (can be moved to utils.py later)
-def render_text_wrapped(surface, text, font, color, rect, aa=False, bkg=None):
-    lines = text.splitlines()
-    y = rect.top
-    for line in lines:
-        while line:
-            i = 1
-            # determine if the row of text will be outside our area
-            if y + font.size(line)[1] > rect.bottom - 5: # Added a small margin
-                break
-            # determine maximum width of line
-            while font.size(line[:i])[0] < rect.width - 10 and i < len(line): # Added a small margin
-                i += 1
-            # if we've wrapped the text, then adjust the wrap to the last word      
-            if i < len(line): 
-                i = line.rfind(" ", 0, i) + 1
-            if i == 0: # Handles case where a single word is longer than the line width
-                i = len(line) 
-            # render the line and blit it to the surface
-            image = font.render(line[:i], aa, color, bkg)
-            surface.blit(image, (rect.left + 5, y)) # Added small left padding
-            y += font.size(line[:i])[1]
-            line = line[i:]
-    return y
-
+    def end_dialogue(self) -> None:
+        """Leave dialogue and return control to the player."""
+        self.current_game_state = 'playing'
+        self.active_npc = None
+        self.active_npc_rect = None
+        self.current_dialogue_node_id = None
 
     def handle_dialogue(self, surface: pygame.Surface, events: list):
         """Handles the display and interaction of dialogue."""
         if not self.active_npc or not self.current_dialogue_node_id or self.current_dialogue_node_id not in dialogues:
-            self.current_game_state = 'playing'
-            self.active_npc = None
-            self.active_npc_rect = None
-            self.current_dialogue_node_id = None
+            self.end_dialogue()
             return
 
-        node = dialogues[self.current_dialogue_node_id]
+        node_id = self.current_dialogue_node_id
+        node = dialogues[node_id]
         npc_text = node['npc_text']
         player_options = node['player_options']
 
@@ -838,44 +1294,19 @@ def render_text_wrapped(surface, text, font, color, rect, aa=False, bkg=None):
                     if 0 <= selected_option_index < len(player_options):
                         chosen_option = player_options[selected_option_index]
 
-                        if chosen_option.get('action') == 'end_dialogue':
-                            self.current_game_state = 'playing'
-                            self.active_npc = None
-                            self.active_npc_rect = None
-                            self.current_dialogue_node_id = None
-                            return # Exit immediately
-                        elif 'next_node' in chosen_option:
+                        if 'next_node' in chosen_option:
                             self.current_dialogue_node_id = chosen_option['next_node']
                             # If the next node doesn't exist, it will be caught at the start of this func
-                        # Add other actions here, e.g., 'start_quest'
+                        action = self.dialogue_actions.get((node_id, selected_option_index))
+                        if action:
+                            action.apply(self.player_entity, host=self)
                         break # Processed one key press for dialogue
 
-
     def move_player(self, direction: str) -> None:
         """Moves the player rectangle, handles room transitions, and ensures it stays within ROOM_RECT."""
         if self.current_game_state != 'playing':
             return # Disable player movement if not in 'playing' state
 
-            
-        # self.main_menu() # Main menu is text-based, will be replaced/integrated with Pygame later
-
-    def draw_current_room(self, surface: pygame.Surface) -> None:
-        """Draws the current room onto the given Pygame surface."""
-        if self.current_room:
-            pygame.draw.rect(surface, ROOM_COLOR, ROOM_RECT)
-            # Later, we can add more details like room type, name, etc.
-            # font = pygame.font.Font(None, 36)
-            # text = font.render(f"Room: {self.current_room.room_type}", True, (255, 255, 255))
-            # text_rect = text.get_rect(center=(ROOM_RECT.centerx, ROOM_RECT.top + 30))
-            # surface.blit(text, text_rect)
-
-    def draw_player(self, surface: pygame.Surface) -> None:
-        """Draws the player onto the given Pygame surface."""
-        pygame.draw.rect(surface, PLAYER_COLOR, self.player_rect)
-
-    def move_player(self, direction: str) -> None:
-        """Moves the player rectangle, handles room transitions, and ensures it stays within ROOM_RECT."""
-
         if direction == 'left':
             self.player_rect.x -= PLAYER_SPEED
         elif direction == 'right':
@@ -890,9 +1321,13 @@ def render_text_wrapped(surface, text, font, color, rect, aa=False, bkg=None):
             if self.current_room.connections['west']: # Ensure connection is not None
                 self.current_room = self.current_room.connections['west']
                 self.player_rect.right = ROOM_RECT.right - PLAYER_SPEED 
+                self.timeline.touch(self.current_room)
+                if not self.current_room.visited:
+                    self._on_room_explored()
                 self.current_room.visited = True
 
                 self._load_npcs_for_current_room() # Load NPCs for new room
+                self.autosave_run()
 
                 print(f"Moved to room in the west. New room type: {self.current_room.room_type}")
                 return
@@ -900,17 +1335,25 @@ def render_text_wrapped(surface, text, font, color, rect, aa=False, bkg=None):
             if self.current_room.connections['east']:
                 self.current_room = self.current_room.connections['east']
                 self.player_rect.left = ROOM_RECT.left + PLAYER_SPEED
+                self.timeline.touch(self.current_room)
+                if not self.current_room.visited:
+                    self._on_room_explored()
                 self.current_room.visited = True
                 self._load_npcs_for_current_room() # Load NPCs for new room
+                self.autosave_run()
                 print(f"Moved to room in the east. New room type: {self.current_room.room_type}")
                 return
         elif self.player_rect.top <= ROOM_RECT.top and 'north' in self.current_room.connections:
             if self.current_room.connections['north']:
                 self.current_room = self.current_room.connections['north']
                 self.player_rect.bottom = ROOM_RECT.bottom - PLAYER_SPEED
+                self.timeline.touch(self.current_room)
+                if not self.current_room.visited:
+                    self._on_room_explored()
                 self.current_room.visited = True
 
                 self._load_npcs_for_current_room() # Load NPCs for new room
+                self.autosave_run()
   
                 print(f"Moved to room in the north. New room type: {self.current_room.room_type}")
                 return
@@ -918,8 +1361,12 @@ def render_text_wrapped(surface, text, font, color, rect, aa=False, bkg=None):
             if self.current_room.connections['south']:
                 self.current_room = self.current_room.connections['south']
                 self.player_rect.top = ROOM_RECT.top + PLAYER_SPEED
+                self.timeline.touch(self.current_room)
+                if not self.current_room.visited:
+                    self._on_room_explored()
                 self.current_room.visited = True
                 self._load_npcs_for_current_room() # Load NPCs for new room
+                self.autosave_run()
  
                 print(f"Moved to room in the south. New room type: {self.current_room.room_type}")
                 return
@@ -929,8 +1376,7 @@ def render_text_wrapped(surface, text, font, color, rect, aa=False, bkg=None):
 
     def calculate_difficulty_tier(self) -> int:
         """Calculate current difficulty tier based on total upgrades purchased."""
-        total_upgrades = sum(upgrade['purchased'] for upgrade in self.memory_forge_upgrades.values())
-        return max(1, total_upgrades // 3)  # Every 3 upgrades increases difficulty tier
+        return self.upgrade_graph.difficulty_tier
 
     def show_help(self, commands: Dict[str, List[str]]) -> None:
         """Show help text for available commands."""
@@ -940,4 +1386,30 @@ def render_text_wrapped(surface, text, font, color, rect, aa=False, bkg=None):
         print("  status         - View player status")
         print("  help           - Show this help text")
         print("\nTip: You can combine commands with arguments (e.g., 'move north')")
-        input("\nPress Enter to continue...")
\ No newline at end of file
+        input("\nPress Enter to continue...")
+
+
+# Helper function for text wrapping (can be moved to utils.py later)
+def render_text_wrapped(surface, text, font, color, rect, aa=False, bkg=None):
+    lines = text.splitlines()
+    y = rect.top
+    for line in lines:
+        while line:
+            i = 1
+            # determine if the row of text will be outside our area
+            if y + font.size(line)[1] > rect.bottom - 5: # Added a small margin
+                break
+            # determine maximum width of line
+            while font.size(line[:i])[0] < rect.width - 10 and i < len(line): # Added a small margin
+                i += 1
+            # if we've wrapped the text, then adjust the wrap to the last word      
+            if i < len(line): 
+                i = line.rfind(" ", 0, i) + 1
+            if i == 0: # Handles case where a single word is longer than the line width
+                i = len(line) 
+            # render the line and blit it to the surface
+            image = font.render(line[:i], aa, color, bkg)
+            surface.blit(image, (rect.left + 5, y)) # Added small left padding
+            y += font.size(line[:i])[1]
+            line = line[i:]
+    return y
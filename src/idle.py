@@ -0,0 +1,56 @@
+import time
+from typing import Any, Callable, Dict
+
+# Passive shard generation from the Shard Well and Echo Chamber upgrades.
+# Accrual is linear in time, so any span - one frame or a month offline - is
+# resolved in closed form. Fractions of a shard carry over between updates.
+
+OFFLINE_EFFICIENCY = 0.5  # Share of the live rate earned while the game is closed
+OFFLINE_CAP_SECONDS = 7 * 24 * 3600  # Offline time beyond a week earns nothing
+
+def shards_per_second(upgrades: Dict[str, Dict]) -> float:
+    """Live generation rate from the purchased generator upgrades."""
+    well = upgrades.get('shard_well')
+    if not well or not well['purchased']:
+        return 0.0
+    rate = well['value'] * well['purchased']
+    echo = upgrades.get('echo_chamber')
+    if echo:
+        rate *= 1 + echo['value'] * echo['purchased']
+    return rate
+
+def offline_shards(upgrades: Dict[str, Dict], elapsed: float) -> float:
+    """Shards earned over elapsed seconds away from the game."""
+    return shards_per_second(upgrades) * OFFLINE_EFFICIENCY * min(max(0.0, elapsed), OFFLINE_CAP_SECONDS)
+
+class IdleGenerator:
+    """Credits idle shards to a player, live (once per frame) and offline."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock  # Wall time, so offline spans survive restarts
+        self.last_tick = clock()
+        self.remainder = 0.0  # Fraction of a shard not yet credited
+
+    def _credit(self, player: Any, amount: float) -> int:
+        self.remainder += amount
+        whole = int(self.remainder)
+        if whole:
+            self.remainder -= whole
+            player.memory_shards += whole
+        return whole
+
+    def tick(self, player: Any, upgrades: Dict[str, Dict]) -> int:
+        """Credit everything generated since the last tick; returns whole shards added."""
+        now = self.clock()
+        elapsed = max(0.0, now - self.last_tick)  # The wall clock may step backwards
+        self.last_tick = now
+        return self._credit(player, shards_per_second(upgrades) * elapsed)
+
+    def catch_up(self, player: Any, upgrades: Dict[str, Dict], last_seen: float) -> int:
+        """Credit offline generation since last_seen (a saved clock() value)."""
+        now = self.clock()
+        self.last_tick = now
+        return self._credit(player, offline_shards(upgrades, now - last_seen))
+
+    def to_dict(self) -> Dict[str, float]:
+        return {'last_seen': self.clock(), 'remainder': self.remainder}
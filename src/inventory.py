@@ -0,0 +1,267 @@
+import bisect
+import json
+import os
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from save_service import write_atomic
+from templates import resolve_item_template
+
+# Inventories hold stacks of interchangeable items. Items are interchangeable
+# when their stack_key (template, rarity, value, durability) matches.
+
+RARITY_RANK = {'common': 0, 'uncommon': 1, 'rare': 2, 'legendary': 3}
+
+@dataclass(slots=True, eq=False)
+class ItemStack:
+    item: Any  # Representative Item; the others are identical copies
+    count: int = 1
+
+class Inventory:
+    """Slot-based inventory with stacking and per-effect-type indexes.
+
+    Behaves like a sequence of items (one entry per stack) so code that
+    enumerates or indexes the inventory keeps working.
+    """
+
+    def __init__(self, max_stack: int = 5):
+        self.max_stack = max_stack
+        self.stacks: List[ItemStack] = []
+        self.version = 0  # Bumped on every change, for render caches
+        self._by_key: Dict[tuple, List[ItemStack]] = {}
+        self._by_effect: Dict[str, List[ItemStack]] = {}
+
+    def __len__(self) -> int:
+        return len(self.stacks)
+
+    def __iter__(self) -> Iterator[Any]:
+        return (stack.item for stack in self.stacks)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.stacks[index].item
+
+    @property
+    def total_items(self) -> int:
+        return sum(stack.count for stack in self.stacks)
+
+    def _open_stack(self, key: tuple) -> Optional[ItemStack]:
+        stacks = self._by_key.get(key)
+        if stacks and stacks[-1].count < self.max_stack:
+            return stacks[-1]
+        return None
+
+    def can_add(self, item: Any, max_slots: int) -> bool:
+        """Whether item fits, either on an existing stack or in a free slot."""
+        if item is not None and self._open_stack(item.stack_key):
+            return True
+        return len(self.stacks) < max_slots
+
+    def add(self, item: Any) -> ItemStack:
+        """Add item, merging it into an open stack when possible."""
+        self.version += 1
+        key = item.stack_key
+        stack = self._open_stack(key)
+        if stack:
+            stack.count += 1
+            return stack
+
+        stack = ItemStack(item)
+        self.stacks.append(stack)
+        self._by_key.setdefault(key, []).append(stack)
+        bisect.insort(self._by_effect.setdefault(item.effect_type, []), stack,
+                      key=lambda s: s.item.effect_value)
+        return stack
+
+    def _drop(self, stack: ItemStack) -> None:
+        self.stacks.remove(stack)
+        key = stack.item.stack_key
+        self._by_key[key].remove(stack)
+        if not self._by_key[key]:
+            del self._by_key[key]
+        self._by_effect[stack.item.effect_type].remove(stack)
+
+    def take(self, index: int) -> Optional[Any]:
+        """Remove one item from the stack at index and return it."""
+        if not 0 <= index < len(self.stacks):
+            return None
+        self.version += 1
+        stack = self.stacks[index]
+        if stack.count > 1:
+            stack.count -= 1
+            item = stack.item
+            return type(item)(template_id=item.template_id, effect_value=item.effect_value,
+                              rarity=item.rarity, durability=item.durability)
+        self._drop(stack)
+        return stack.item
+
+    def index_of(self, stack: ItemStack) -> int:
+        return self.stacks.index(stack)
+
+    def count(self, index: int) -> int:
+        return self.stacks[index].count
+
+    def best(self, effect_type: str) -> Optional[ItemStack]:
+        """Stack with the highest effect_value for effect_type, in O(1)."""
+        stacks = self._by_effect.get(effect_type)
+        return stacks[-1] if stacks else None
+
+    def take_best(self, effect_type: str) -> Optional[Any]:
+        stack = self.best(effect_type)
+        if stack is None:
+            return None
+        return self.take(self.index_of(stack))
+
+    def clear(self) -> None:
+        self.version += 1
+        self.stacks.clear()
+        self._by_key.clear()
+        self._by_effect.clear()
+
+    def load_stacks(self, stacks: List[Tuple[Any, int]]) -> None:
+        """Replace the contents with (item, count) pairs, in slot order."""
+        self.clear()
+        for item, count in stacks:
+            stack = ItemStack(item, count)
+            self.stacks.append(stack)
+            self._by_key.setdefault(item.stack_key, []).append(stack)
+            bisect.insort(self._by_effect.setdefault(item.effect_type, []), stack,
+                          key=lambda s: s.item.effect_value)
+
+@dataclass
+class PickupRules:
+    """Which loot to pick up automatically, and in what order."""
+    min_rarity: str = 'common'
+    effect_types: Optional[List[str]] = None  # None picks up every effect type
+
+    def accepts(self, item: Any) -> bool:
+        if RARITY_RANK.get(item.rarity, 0) < RARITY_RANK.get(self.min_rarity, 0):
+            return False
+        return self.effect_types is None or item.effect_type in self.effect_types
+
+def auto_pickup(player: Any, items: List[Any], rules: Optional[PickupRules] = None) -> Tuple[List[Any], List[Any]]:
+    """Move acceptable items into the player's inventory, best first.
+
+    Keeps going after a full slot, since later items may still stack.
+    Returns (picked_up, left_behind).
+    """
+    rules = rules or PickupRules()
+    ordered = sorted(items, key=lambda i: (RARITY_RANK.get(i.rarity, 0), i.effect_value), reverse=True)
+    picked, left = [], []
+    for item in ordered:
+        if rules.accepts(item) and player.add_item(item):
+            picked.append(item)
+        else:
+            left.append(item)
+    return picked, left
+
+class Stash:
+    """Large cross-run item storage persisted in hashed bucket files.
+
+    Stacks are spread over a fixed number of buckets by a stable hash of
+    their key. Buckets load on first access and only changed buckets are
+    rewritten on save(), so the cost of a deposit does not grow with the
+    size of the stash.
+    """
+
+    def __init__(self, path: str = 'saves/stash', buckets: int = 64):
+        self.path = path
+        self.num_buckets = buckets
+        self._buckets: Dict[int, Dict[tuple, int]] = {}  # bucket -> key -> count
+        self._dirty: set = set()
+
+    def _bucket_of(self, key: tuple) -> int:
+        return zlib.crc32(repr(key).encode()) % self.num_buckets
+
+    def _bucket_file(self, bucket: int) -> str:
+        return os.path.join(self.path, f"bucket_{bucket:03d}.json")
+
+    def _load(self, bucket: int) -> Dict[tuple, int]:
+        contents = self._buckets.get(bucket)
+        if contents is None:
+            contents = {}
+            try:
+                with open(self._bucket_file(bucket), 'r') as f:
+                    for key, count in json.load(f):
+                        # Loot templates are registered lazily; ad-hoc ones die with their session
+                        if resolve_item_template(key[0]):
+                            contents[tuple(key)] = count
+                        else:
+                            self._dirty.add(bucket)  # Purge on the next save
+            except FileNotFoundError:
+                pass
+            self._buckets[bucket] = contents
+        return contents
+
+    def deposit(self, item: Any, count: int = 1) -> None:
+        key = item.stack_key
+        bucket = self._bucket_of(key)
+        contents = self._load(bucket)
+        contents[key] = contents.get(key, 0) + count
+        self._dirty.add(bucket)
+
+    def withdraw(self, key: tuple) -> Optional[Any]:
+        """Remove one item with the given stack key and return it."""
+        from entities import Item  # entities imports this module
+        bucket = self._bucket_of(key)
+        contents = self._load(bucket)
+        if not contents.get(key):
+            return None
+        contents[key] -= 1
+        if not contents[key]:
+            del contents[key]
+        self._dirty.add(bucket)
+        template_id, rarity, effect_value, durability = key
+        return Item(template_id=template_id, effect_value=effect_value,
+                    rarity=rarity, durability=durability)
+
+    def count(self, key: tuple) -> int:
+        return self._load(self._bucket_of(key)).get(key, 0)
+
+    def entries(self) -> Iterator[Tuple[tuple, int]]:
+        """All (stack_key, count) pairs; loads every bucket."""
+        for bucket in range(self.num_buckets):
+            yield from self._load(bucket).items()
+
+    def save(self) -> None:
+        """Write the buckets changed since the last save."""
+        for bucket in sorted(self._dirty):
+            contents = [[list(key), count] for key, count in self._buckets[bucket].items()]
+            write_atomic(self._bucket_file(bucket), json.dumps(contents).encode())
+        self._dirty.clear()
+
+class ProfileStash(Stash):
+    """Stash kept in a profile's rows of a ProfileStore instead of bucket files.
+
+    Everything loads on first access; save() writes only the counts that
+    changed since the last load or save.
+    """
+
+    def __init__(self, store: Any, profile: str):
+        super().__init__(path='', buckets=1)
+        self.store = store
+        self.profile = profile
+        self._saved: Dict[tuple, int] = {}  # Counts the store holds
+
+    def _bucket_of(self, key: tuple) -> int:
+        return 0
+
+    def _load(self, bucket: int) -> Dict[tuple, int]:
+        contents = self._buckets.get(bucket)
+        if contents is None:
+            rows = self.store.stash(self.profile)
+            self._saved = dict(rows)
+            contents = self._buckets[bucket] = {key: count for key, count in rows if resolve_item_template(key[0])}
+            if len(contents) < len(rows):
+                self._dirty.add(bucket)  # Purge what no longer resolves on the next save
+        return contents
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        contents = self._buckets[0]
+        self.store.update_stash(self.profile, [(key, contents.get(key, 0))
+                                               for key in self._saved.keys() | contents.keys()
+                                               if contents.get(key, 0) != self._saved.get(key, 0)])
+        self._saved = dict(contents)
+        self._dirty.clear()
@@ -0,0 +1,97 @@
+import json
+import os
+import threading
+from typing import Any, Iterator, List, Optional, TextIO
+
+from save_service import write_atomic
+
+# Append-only progression log. Each record is one JSON line [seq, kind, ...].
+# A full save records the last seq it covers; loading replays the records
+# after it, and once that save is on disk the covered records are dropped
+# (compaction). Appends cost O(record size) however large the save grows.
+
+class Journal:
+    """Sequenced JSON-lines log with compaction."""
+
+    def __init__(self, path: str = 'saves/journal.log', compact_bytes: int = 64 * 1024):
+        self.path = os.path.abspath(path)
+        self.compact_bytes = compact_bytes  # Log size that triggers a compaction
+        self.compacting = False  # A compacting save has been requested but not written
+        self._lock = threading.Lock()
+        self._file: Optional[TextIO] = None
+        self.seq = 0
+        self.size = 0
+        if os.path.exists(self.path):
+            self._drop_torn_tail()
+            self.size = os.path.getsize(self.path)
+        for record in self.records():  # Bounded by compact_bytes
+            self.seq = record[0]
+
+    def _drop_torn_tail(self) -> None:
+        """Cut a partial last line (crash mid-append) so the next append starts on a fresh line."""
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+
+    def records(self, after: int = 0) -> Iterator[List[Any]]:
+        """Records with seq > after, in order. A torn last line (crash mid-append) is skipped."""
+        try:
+            with open(self.path, 'r') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record[0] > after:
+                yield record
+
+    def append(self, kind: str, *values: Any) -> int:
+        """Append one record and return its seq."""
+        with self._lock:
+            self.seq += 1
+            line = json.dumps([self.seq, kind, *values], separators=(',', ':')) + '\n'
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = open(self.path, 'a')
+            self._file.write(line)
+            self._file.flush()
+            self.size += len(line)
+            return self.seq
+
+    def resume_after(self, seq: int) -> None:
+        """Number new records after seq, the last one a save covers.
+
+        Compaction can leave the log empty, so a fresh process would otherwise
+        restart at 0 and write records the save claims to already include.
+        """
+        with self._lock:
+            self.seq = max(self.seq, seq)
+
+    def needs_compaction(self) -> bool:
+        return self.size >= self.compact_bytes and not self.compacting
+
+    def compaction_failed(self) -> None:
+        """The compacting save was not written; the next change may request another."""
+        self.compacting = False
+
+    def truncate(self, upto: int) -> None:
+        """Drop records with seq <= upto; call once a save covering them is on disk."""
+        with self._lock:
+            kept = ''.join(json.dumps(record, separators=(',', ':')) + '\n'
+                           for record in self.records(upto))
+            if self._file:
+                self._file.close()
+                self._file = None  # Reopened on the next append, on the new file
+            write_atomic(self.path, kept.encode())
+            self.size = len(kept)
+            self.compacting = False
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
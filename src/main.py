@@ -60,7 +60,9 @@ def main():
         if keys[pygame.K_DOWN]:
             game.move_player('down')
 
-            
+        # Idle accrual and event delivery, batched once per frame
+        game.update()
+
         # For now, fill the screen with black
         screen.fill((0, 0, 0))
         
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Meta-progression simulator: many consecutive runs per simulated player.
+
+Each simulated player plays headless runs with a bot policy and buys
+upgrades between runs with the same policy. Players are spread over a
+process pool; one CSV row is written per player per run.
+
+    python src/meta_sim.py [--players 32] [--runs 200] [--policy heuristic] [--out progression.csv]
+"""
+
+import argparse
+import csv
+import multiprocessing
+import os
+import statistics
+from typing import Any, Callable, Dict, List, Optional
+
+import bot
+
+FIELDS = [
+    'player', 'run', 'outcome', 'rooms_explored', 'enemies_defeated', 'shards_earned',
+    'shards', 'upgrades_owned', 'max_tier', 'difficulty_tier', 'shard_multiplier'
+]
+
+# Keeps players' run seeds apart
+PLAYER_SEED_STRIDE = 1_000_003
+
+def _row(player: int, manager: Any, index: int, outcome: str) -> Dict[str, Any]:
+    upgrades = manager.memory_forge_upgrades
+    return {
+        'player': player,
+        'run': index + 1,
+        'outcome': outcome,
+        'rooms_explored': manager.rooms_explored,
+        'enemies_defeated': manager.enemies_defeated,
+        'shards_earned': manager.run_stats.run['memory_shards_collected'],
+        'shards': manager.player_entity.memory_shards,  # After this run's purchases
+        'upgrades_owned': manager.upgrade_graph.total_purchased,
+        'max_tier': max((u.get('tier', 1) for u in upgrades.values() if u['purchased']), default=0),
+        'difficulty_tier': manager.calculate_difficulty_tier(),
+        'shard_multiplier': round(manager.calculate_shard_multiplier(), 2)
+    }
+
+def simulate_player(args: tuple, setup: Optional[Callable[[Any], None]] = None) -> List[Dict[str, Any]]:
+    """All runs of one simulated player, starting from a fresh save."""
+    player, policy_name, runs, seed = args
+    rows: List[Dict[str, Any]] = []
+    player_seed = seed + player * PLAYER_SEED_STRIDE
+    report = bot.play(policy_name, runs, player_seed, setup=setup,
+                      on_run=lambda manager, index, outcome: rows.append(_row(player, manager, index, outcome)))
+    for crash in report['crashes']:
+        rows.append({'player': player, 'run': crash['seed'] - player_seed + 1, 'outcome': 'crashed'})
+    rows.sort(key=lambda row: row['run'])
+    return rows
+
+def simulate(players: int, runs: int, policy_name: str = 'heuristic', workers: int = 0,
+             seed: int = 0) -> List[Dict[str, Any]]:
+    """Simulate players in parallel and return their rows ordered by player and run."""
+    workers = workers or os.cpu_count() or 1
+    jobs = [(player, policy_name, runs, seed) for player in range(players)]
+    with multiprocessing.Pool(workers, initializer=bot._worker_init) as pool:
+        results = pool.map(simulate_player, jobs)
+    return [row for rows in results for row in rows]
+
+def write_csv(rows: List[Dict[str, Any]], path: str) -> None:
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS, restval='')
+        writer.writeheader()
+        writer.writerows(rows)
+
+def first_run_reaching(rows: List[Dict[str, Any]], field: str, value: int) -> List[int]:
+    """For each player that got there, the first run with rows[field] >= value."""
+    firsts: Dict[int, int] = {}
+    for row in rows:
+        if row['outcome'] != 'crashed' and row[field] >= value:
+            firsts.setdefault(row['player'], row['run'])
+    return list(firsts.values())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=32)
+    parser.add_argument('--runs', type=int, default=200)
+    parser.add_argument('--policy', choices=sorted(bot.POLICIES), default='heuristic')
+    parser.add_argument('--workers', type=int, default=0, help="default: one per CPU")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', default='progression.csv')
+    args = parser.parse_args()
+
+    rows = simulate(args.players, args.runs, args.policy, args.workers, args.seed)
+    write_csv(rows, os.path.abspath(args.out))
+    print(f"Wrote {len(rows)} rows to {args.out}")
+    for tier in (1, 2, 3):
+        firsts = first_run_reaching(rows, 'max_tier', tier)
+        if firsts:
+            print(f"Tier {tier}: reached by {len(firsts)}/{args.players} players, "
+                  f"median run {statistics.median(firsts):g}")
+        else:
+            print(f"Tier {tier}: never reached")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+# Derived stats: base values plus typed modifiers. The final values are written
+# straight into the entity's Stats object whenever a modifier is added or
+# removed, so combat keeps reading plain attributes.
+
+DERIVED_STATS = ('max_health', 'attack', 'defense')
+
+# Modifier lifetimes
+PERMANENT = 'permanent'  # Saved with the game
+RUN = 'run'  # Cleared when a new run starts
+COMBAT = 'combat'  # Cleared when a fight ends
+
+@dataclass(frozen=True, slots=True)
+class Modifier:
+    stat: str  # One of DERIVED_STATS
+    amount: int
+    source: str  # e.g. 'upgrade:attack', 'run:battle_mastery', 'item:power_fragment'
+    lifetime: str = PERMANENT
+
+class ModifierStack:
+    """Base stats plus modifiers, with cached totals written into stats."""
+
+    def __init__(self, stats: Any):
+        self.stats = stats
+        self.base: Dict[str, int] = {stat: getattr(stats, stat) for stat in DERIVED_STATS}
+        self.modifiers: List[Modifier] = []
+        self._bonus: Dict[str, int] = {stat: 0 for stat in DERIVED_STATS}
+
+    def bonus(self, stat: str) -> int:
+        """Sum of all modifiers on stat."""
+        return self._bonus[stat]
+
+    def _refresh(self, stat: str) -> None:
+        value = self.base[stat] + self._bonus[stat]
+        setattr(self.stats, stat, value)
+        if stat == 'max_health' and self.stats.health > value:
+            self.stats.health = value
+
+    def add(self, modifier: Modifier) -> None:
+        self.modifiers.append(modifier)
+        self._bonus[modifier.stat] += modifier.amount
+        self._refresh(modifier.stat)
+
+    def _remove_where(self, predicate) -> None:
+        kept, touched = [], set()
+        for modifier in self.modifiers:
+            if predicate(modifier):
+                self._bonus[modifier.stat] -= modifier.amount
+                touched.add(modifier.stat)
+            else:
+                kept.append(modifier)
+        self.modifiers = kept
+        for stat in touched:
+            self._refresh(stat)
+
+    def remove_source(self, source: str) -> None:
+        self._remove_where(lambda m: m.source == source)
+
+    def remove_sources(self, prefix: str) -> None:
+        """Remove every modifier whose source starts with prefix."""
+        self._remove_where(lambda m: m.source.startswith(prefix))
+
+    def expire(self, lifetime: str) -> None:
+        """Remove every modifier with the given lifetime."""
+        self._remove_where(lambda m: m.lifetime == lifetime)
+
+    def set(self, source: str, stat: str, amount: int, lifetime: str = RUN) -> bool:
+        """Make source contribute exactly amount to stat. Returns True if it changed."""
+        current = sum(m.amount for m in self.modifiers if m.source == source and m.stat == stat)
+        if current == amount:
+            return False
+        self._remove_where(lambda m: m.source == source and m.stat == stat)
+        if amount:
+            self.add(Modifier(stat, amount, source, lifetime))
+        return True
+
+    def set_base(self, stat: str, value: int) -> None:
+        self.base[stat] = value
+        self._refresh(stat)
+
+    def state(self) -> Tuple[Dict[str, int], List[Modifier]]:
+        """Copy of the base values and modifiers, for snapshots."""
+        return dict(self.base), list(self.modifiers)
+
+    def restore(self, state: Tuple[Dict[str, int], List[Modifier]]) -> None:
+        base, modifiers = state
+        self.base = dict(base)
+        self.modifiers = list(modifiers)
+        self._bonus = {stat: 0 for stat in DERIVED_STATS}
+        for modifier in self.modifiers:
+            self._bonus[modifier.stat] += modifier.amount
+        for stat in DERIVED_STATS:
+            self._refresh(stat)
@@ -0,0 +1,160 @@
+from typing import Callable, Dict, Generic, Iterable, List, Optional, TypeVar
+from entities import Stats, Enemy, Item, Room
+
+T = TypeVar('T')
+
+class ObjectPool(Generic[T]):
+    """Free list of reusable objects with hit/miss accounting.
+
+    acquire() hands back a released object when one is available (a hit) or
+    builds a blank one with factory (a miss). release() runs reset, which must
+    drop every reference the object holds, and keeps it for the next acquire.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T], reset: Callable[[T], None],
+                 max_size: int = 10000):
+        self.name = name
+        self.factory = factory
+        self.reset = reset
+        self.max_size = max_size
+        self._free: List[T] = []
+        self.hits = 0
+        self.misses = 0
+        self.releases = 0
+        self.in_use = 0
+        self.high_water = 0
+
+    def acquire(self) -> T:
+        if self._free:
+            self.hits += 1
+            obj = self._free.pop()
+        else:
+            self.misses += 1
+            obj = self.factory()
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return obj
+
+    def release(self, obj: T) -> None:
+        self.reset(obj)
+        self.releases += 1
+        self.in_use = max(0, self.in_use - 1)
+        if len(self._free) < self.max_size:
+            self._free.append(obj)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'releases': self.releases,
+            'in_use': self.in_use,
+            'high_water': self.high_water,
+            'free': len(self._free)
+        }
+
+    def clear(self) -> None:
+        """Drop free objects and reset counters."""
+        self._free.clear()
+        self.hits = self.misses = self.releases = self.in_use = self.high_water = 0
+
+def _reset_stats(stats: Stats) -> None:
+    stats.health = stats.max_health = stats.attack = stats.defense = 0
+
+def _reset_enemy(enemy: Enemy) -> None:
+    enemy.name = ""
+    enemy.stats = None
+    enemy.level = 1
+    enemy.attack_pattern.clear()
+    enemy.loot_table.clear()
+    enemy.experience_value = 0
+    enemy.is_mini_boss = False
+
+def _reset_item(item: Item) -> None:
+    item.template_id = ""
+    item.effect_value = 0
+    item.rarity = 'common'
+    item.durability = None
+
+def _reset_room(room: Room) -> None:
+    room.room_type = ""
+    room.description = ""
+    room.enemies.clear()
+    room.items.clear()
+    room.event_id = None
+    room.visited = False
+    room.connections.clear()
+    room.npcs.clear()
+
+STATS_POOL: ObjectPool[Stats] = ObjectPool('stats', lambda: Stats(0, 0, 0, 0), _reset_stats)
+ENEMY_POOL: ObjectPool[Enemy] = ObjectPool('enemy', lambda: Enemy(name="", stats=None), _reset_enemy)
+ITEM_POOL: ObjectPool[Item] = ObjectPool('item', lambda: Item(template_id="", effect_value=0), _reset_item)
+ROOM_POOL: ObjectPool[Room] = ObjectPool('room', lambda: Room(room_type="", description=""), _reset_room)
+
+POOLS = [STATS_POOL, ENEMY_POOL, ITEM_POOL, ROOM_POOL]
+
+def acquire_stats(health: int, max_health: int, attack: int, defense: int) -> Stats:
+    stats = STATS_POOL.acquire()
+    stats.health = health
+    stats.max_health = max_health
+    stats.attack = attack
+    stats.defense = defense
+    return stats
+
+def acquire_enemy(name: str, stats: Stats, level: int = 1, attack_pattern: Optional[List[str]] = None,
+                  loot_table: Optional[Dict[str, float]] = None, experience_value: int = 0,
+                  is_mini_boss: bool = False) -> Enemy:
+    enemy = ENEMY_POOL.acquire()
+    enemy.name = name
+    enemy.stats = stats
+    enemy.level = level
+    if attack_pattern:
+        enemy.attack_pattern.extend(attack_pattern)
+    if loot_table:
+        enemy.loot_table.update(loot_table)
+    enemy.experience_value = experience_value
+    enemy.is_mini_boss = is_mini_boss
+    return enemy
+
+def acquire_item(template_id: str, effect_value: int, rarity: str = 'common',
+                 durability: Optional[int] = None) -> Item:
+    item = ITEM_POOL.acquire()
+    item.template_id = template_id
+    item.effect_value = effect_value
+    item.rarity = rarity
+    item.durability = durability
+    return item
+
+def acquire_room(room_type: str, description: str) -> Room:
+    room = ROOM_POOL.acquire()
+    room.room_type = room_type
+    room.description = description
+    return room
+
+def release_enemy(enemy: Enemy) -> None:
+    """Return an enemy and its stats. Store-backed views are left alone."""
+    if type(enemy) is not Enemy:
+        return
+    if enemy.stats is not None:
+        STATS_POOL.release(enemy.stats)
+    ENEMY_POOL.release(enemy)
+
+def release_room(room: Room) -> None:
+    """Return a room with the enemies and items still in it.
+
+    Items the player picked up must already be removed from room.items.
+    """
+    for enemy in room.enemies:
+        release_enemy(enemy)
+    for item in room.items:
+        ITEM_POOL.release(item)
+    ROOM_POOL.release(room)
+
+def release_world(rooms: Iterable[Room]) -> None:
+    """Return every room of a finished run."""
+    for room in rooms:
+        release_room(room)
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    """Counters for every entity pool, keyed by pool name."""
+    return {pool.name: pool.stats() for pool in POOLS}
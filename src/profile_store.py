@@ -0,0 +1,160 @@
+import json
+import os
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Many player profiles in one SQLite database in WAL mode, so readers never
+# wait for the writer. Player and upgrade state are rows keyed by profile id
+# (the primary keys are the lookup indexes); the remaining save sections are
+# JSON blobs. Every save is one transaction of batched statements, and SQL
+# text is constant so each pooled connection reuses its prepared statements.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id TEXT PRIMARY KEY,
+    memory_shards INTEGER NOT NULL,
+    player TEXT NOT NULL,
+    updated REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS upgrades (
+    profile_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    purchased INTEGER NOT NULL,
+    PRIMARY KEY (profile_id, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS stash (
+    profile_id TEXT NOT NULL,
+    template_id TEXT NOT NULL,
+    rarity TEXT NOT NULL,
+    effect_value INTEGER NOT NULL,
+    durability INTEGER NOT NULL,  -- -1 for items without durability
+    count INTEGER NOT NULL,
+    PRIMARY KEY (profile_id, template_id, rarity, effect_value, durability)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS sections (
+    profile_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (profile_id, name)
+) WITHOUT ROWID;
+"""
+
+UPSERT_PROFILE = ("INSERT INTO profiles (id, memory_shards, player, updated) VALUES (?, ?, ?, ?) "
+                  "ON CONFLICT (id) DO UPDATE SET memory_shards = excluded.memory_shards, "
+                  "player = excluded.player, updated = excluded.updated")
+UPSERT_UPGRADE = ("INSERT INTO upgrades (profile_id, key, purchased) VALUES (?, ?, ?) "
+                  "ON CONFLICT (profile_id, key) DO UPDATE SET purchased = excluded.purchased")
+UPSERT_SECTION = ("INSERT INTO sections (profile_id, name, data) VALUES (?, ?, ?) "
+                  "ON CONFLICT (profile_id, name) DO UPDATE SET data = excluded.data")
+UPSERT_STASH = ("INSERT INTO stash (profile_id, template_id, rarity, effect_value, durability, count) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (profile_id, template_id, rarity, effect_value, durability) "
+                "DO UPDATE SET count = excluded.count")
+DELETE_STASH = ("DELETE FROM stash WHERE profile_id = ? AND template_id = ? AND rarity = ? "
+                "AND effect_value = ? AND durability = ?")
+
+class ProfileStore:
+    """Pooled connections to a profile database."""
+
+    def __init__(self, path: str = 'saves/profiles.db', pool_size: int = 4, timeout: float = 5.0):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._pool: 'queue.Queue[sqlite3.Connection]' = queue.Queue()
+        self._connections: List[sqlite3.Connection] = []
+        for _ in range(pool_size):
+            # Transactions are explicit (BEGIN IMMEDIATE for writes)
+            connection = sqlite3.connect(path, timeout=timeout, isolation_level=None,
+                                         check_same_thread=False, cached_statements=64)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")  # Durable at checkpoints; safe with WAL
+            self._connections.append(connection)
+            self._pool.put(connection)
+        with self._connection() as connection:
+            connection.executescript(SCHEMA)
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def save_profile(self, profile_id: str, sections: Dict[str, Any]) -> None:
+        """Write one profile's save sections (as built by GameManager.save_game)."""
+        self.save_profiles([(profile_id, sections)])
+
+    def save_profiles(self, profiles: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Write many profiles in a single transaction."""
+        now = time.time()
+        profile_rows, upgrade_rows, section_rows = [], [], []
+        for profile_id, sections in profiles:
+            player = sections['player']
+            profile_rows.append((profile_id, player['memory_shards'], json.dumps(player), now))
+            upgrade_rows.extend((profile_id, key, purchased) for key, purchased in sections['upgrades'].items())
+            section_rows.extend((profile_id, name, json.dumps(value)) for name, value in sections.items()
+                                if name not in ('player', 'upgrades'))
+        with self._transaction() as connection:
+            connection.executemany(UPSERT_PROFILE, profile_rows)
+            connection.executemany(UPSERT_UPGRADE, upgrade_rows)
+            connection.executemany(UPSERT_SECTION, section_rows)
+
+    def load_profile(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        """The sections saved for profile_id, or None if there is no such profile."""
+        with self._connection() as connection:
+            row = connection.execute("SELECT player FROM profiles WHERE id = ?", (profile_id,)).fetchone()
+            if row is None:
+                return None
+            sections = {'player': json.loads(row[0])}
+            sections['upgrades'] = dict(connection.execute(
+                "SELECT key, purchased FROM upgrades WHERE profile_id = ?", (profile_id,)))
+            for name, data in connection.execute(
+                    "SELECT name, data FROM sections WHERE profile_id = ?", (profile_id,)):
+                sections[name] = json.loads(data)
+        return sections
+
+    def update_stash(self, profile_id: str, changes: Iterable[Tuple[tuple, int]]) -> None:
+        """Set the stash count of each (stack_key, count) in one transaction; count 0 removes it."""
+        upserts, deletes = [], []
+        for (template_id, rarity, effect_value, durability), count in changes:
+            key = (profile_id, template_id, rarity, effect_value, -1 if durability is None else durability)
+            if count:
+                upserts.append(key + (count,))
+            else:
+                deletes.append(key)
+        with self._transaction() as connection:
+            connection.executemany(UPSERT_STASH, upserts)
+            connection.executemany(DELETE_STASH, deletes)
+
+    def stash(self, profile_id: str) -> List[Tuple[tuple, int]]:
+        """(stack_key, count) pairs in profile_id's stash."""
+        with self._connection() as connection:
+            rows = connection.execute(
+                "SELECT template_id, rarity, effect_value, durability, count FROM stash WHERE profile_id = ?",
+                (profile_id,)).fetchall()
+        return [((template_id, rarity, effect_value, None if durability == -1 else durability), count)
+                for template_id, rarity, effect_value, durability, count in rows]
+
+    def delete_profile(self, profile_id: str) -> None:
+        with self._transaction() as connection:
+            for table, column in (('profiles', 'id'), ('upgrades', 'profile_id'),
+                                  ('stash', 'profile_id'), ('sections', 'profile_id')):
+                connection.execute(f"DELETE FROM {table} WHERE {column} = ?", (profile_id,))
+
+    def close(self) -> None:
+        for connection in self._connections:
+            connection.close()
+        self._connections = []
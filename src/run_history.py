@@ -0,0 +1,156 @@
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, fields
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List, Optional
+
+# Every finished run, kept in SQLite. Each query the game asks is answered
+# by walking the head of an index (leaderboard per metric, per profile and
+# per seed), so the cost depends on the rows returned, not on how many runs
+# have ever been recorded.
+
+@dataclass(frozen=True, slots=True)
+class RunRecord:
+    profile: str
+    seed: int
+    ended: float  # Unix time
+    duration: float  # In seconds
+    cause: str  # What killed the player, or why the run stopped
+    upgrade_tier: int  # Highest Memory Forge tier owned (0: none)
+    rooms_explored: int
+    enemies_defeated: int
+    shards_earned: int
+    damage_dealt: int
+    damage_taken: int
+    fights: int
+    max_health: int
+    attack: int
+    defense: int
+
+COLUMNS = tuple(field.name for field in fields(RunRecord))
+_row = attrgetter(*COLUMNS)
+METRICS = ('shards_earned', 'rooms_explored', 'enemies_defeated')  # Leaderboards, best first
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    profile TEXT NOT NULL,
+    seed INTEGER NOT NULL,
+    ended REAL NOT NULL,
+    duration REAL NOT NULL,
+    cause TEXT NOT NULL,
+    {', '.join(f'{name} INTEGER NOT NULL' for name in COLUMNS[5:])}
+);
+CREATE INDEX IF NOT EXISTS runs_seed ON runs (seed, shards_earned DESC);
+""" + ''.join(f"""
+CREATE INDEX IF NOT EXISTS runs_{metric} ON runs ({metric} DESC);
+CREATE INDEX IF NOT EXISTS runs_profile_{metric} ON runs (profile, {metric} DESC);
+""" for metric in METRICS)
+
+# Schema changes: MIGRATIONS[v] turns a version v database into version v + 1
+MIGRATIONS: Dict[int, str] = {
+    0: "ALTER TABLE runs ADD COLUMN upgrade_tier INTEGER NOT NULL DEFAULT 0",
+}
+SCHEMA_VERSION = len(MIGRATIONS)
+
+INSERT_RUN = f"INSERT INTO runs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+SELECT_RUNS = f"SELECT {', '.join(COLUMNS)} FROM runs"
+
+class RunHistory:
+    """Recorded runs and the leaderboards over them."""
+
+    def __init__(self, path: str = 'saves/history.db', timeout: float = 5.0):
+        self.path = os.path.abspath(path)
+        self.timeout = timeout
+        self._connection: Optional[sqlite3.Connection] = None  # Opened on first use
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None,
+                                 check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            version = db.execute("PRAGMA user_version").fetchone()[0]
+            if db.execute("SELECT 1 FROM sqlite_master WHERE name = 'runs'").fetchone():
+                for old in range(version, SCHEMA_VERSION):
+                    db.execute(MIGRATIONS[old])
+            db.executescript(SCHEMA)
+            db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._connection = db
+        return self._connection
+
+    def record(self, run: RunRecord) -> int:
+        """Store one run and return its id."""
+        return self._db.execute(INSERT_RUN, _row(run)).lastrowid
+
+    def record_many(self, runs: Iterable[RunRecord]) -> None:
+        """Store many runs in one transaction."""
+        db = self._db
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(INSERT_RUN, map(_row, runs))
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def _select(self, where: str, params: tuple, metric: str, limit: int) -> List[RunRecord]:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown leaderboard metric: {metric}")
+        rows = self._db.execute(f"{SELECT_RUNS} {where} ORDER BY {metric} DESC LIMIT ?", params + (limit,))
+        return [RunRecord(*row) for row in rows]
+
+    def leaderboard(self, metric: str = 'shards_earned', limit: int = 10,
+                    profile: Optional[str] = None) -> List[RunRecord]:
+        """The best limit runs by metric, of everyone or of one profile."""
+        if profile is None:
+            return self._select("", (), metric, limit)
+        return self._select("WHERE profile = ?", (profile,), metric, limit)
+
+    def personal_best(self, profile: str, metric: str = 'shards_earned') -> Optional[RunRecord]:
+        best = self.leaderboard(metric, 1, profile)
+        return best[0] if best else None
+
+    def personal_bests(self, profile: str) -> Dict[str, int]:
+        """metric -> profile's best value, for every metric it has a run for."""
+        bests = {}
+        for metric in METRICS:
+            best = self.personal_best(profile, metric)
+            if best:
+                bests[metric] = getattr(best, metric)
+        return bests
+
+    def seed_runs(self, seed: int, metric: str = 'shards_earned', limit: int = 10) -> List[RunRecord]:
+        """The best runs played on one seed, for comparing players on the same world."""
+        return self._select("WHERE seed = ?", (seed,), metric, limit)
+
+    def close(self) -> None:
+        if self._connection:
+            self._connection.close()
+            self._connection = None
+
+def run_record(manager: Any, cause: str) -> RunRecord:
+    """Summarize manager's run, which has just ended."""
+    run = manager.run_stats.run
+    stats = manager.player_entity.stats
+    return RunRecord(
+        profile=manager.profile or '',
+        seed=manager.run_seed,
+        ended=time.time(),
+        duration=run['play_time'],
+        cause=cause,
+        upgrade_tier=max((upgrade['tier'] for upgrade in manager.memory_forge_upgrades.values()
+                          if upgrade['purchased']), default=0),
+        rooms_explored=manager.rooms_explored,
+        enemies_defeated=manager.enemies_defeated,
+        shards_earned=int(run['memory_shards_collected']),
+        damage_dealt=int(run['total_damage_dealt']),
+        damage_taken=int(run['total_damage_taken']),
+        fights=int(run['fights']),
+        max_health=stats.max_health,
+        attack=stats.attack,
+        defense=stats.defense,
+    )
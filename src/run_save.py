@@ -0,0 +1,99 @@
+import random
+from typing import Any, Dict, List, Optional
+
+from entities import Enemy, Item, NPC
+from modifiers import COMBAT, RUN, Modifier
+from pools import acquire_enemy, acquire_item, acquire_room, acquire_stats
+from templates import resolve_item_template
+
+# Save-anywhere run state: the world graph, inventory, run-scoped modifiers,
+# run counters and RNG state. Rooms are stored as a list and connections as
+# indexes into it. capture_run only builds plain lists of scalars, cheap
+# enough to autosave on every room transition; encoding and writing happen
+# on the save thread.
+
+def _item(item: Item) -> list:
+    return [item.template_id, item.effect_value, item.rarity, item.durability]
+
+def _restore_item(data: list) -> Optional[Item]:
+    template_id, effect_value, rarity, durability = data
+    if not resolve_item_template(template_id):
+        return None
+    return acquire_item(template_id, effect_value, rarity, durability)
+
+def _enemy(enemy: Enemy) -> list:
+    stats = enemy.stats
+    return [enemy.name, enemy.level, stats.health, stats.max_health, stats.attack, stats.defense,
+            list(enemy.attack_pattern), dict(enemy.loot_table), enemy.experience_value, enemy.is_mini_boss]
+
+def _restore_enemy(data: list) -> Enemy:
+    name, level, health, max_health, attack, defense, pattern, loot, experience, mini_boss = data
+    return acquire_enemy(name, acquire_stats(health, max_health, attack, defense), level,
+                         pattern, loot, experience, mini_boss)
+
+def capture_run(manager: Any) -> Dict[str, Any]:
+    """Sections for save_format.encode describing the run in progress."""
+    rooms = manager.all_rooms
+    index = {id(room): i for i, room in enumerate(rooms)}
+    player = manager.player_entity
+    world_gen = manager.world_gen
+    state = random.getstate()
+    return {
+        'world': {
+            'rooms': [
+                [room.room_type, room.description, room.visited, room.event_id,
+                 [_enemy(enemy) for enemy in room.enemies],
+                 [_item(item) for item in room.items],
+                 [npc.template_id for npc in room.npcs],
+                 {direction: index[id(other)] for direction, other in room.connections.items()}]
+                for room in rooms
+            ],
+            'current': index[id(manager.current_room)],
+            'mini_bosses': [world_gen.mini_boss_defeated, world_gen.next_mini_boss],
+        },
+        'run': {
+            'health': player.stats.health,
+            'modifiers': [[m.stat, m.amount, m.source, m.lifetime] for m in player.modifiers.modifiers
+                          if m.lifetime in (RUN, COMBAT)],
+            'inventory': [[_item(stack.item), stack.count] for stack in player.inventory.stacks],
+            'counters': dict(manager.run_stats.run),
+            'elapsed': manager.run_stats.run_time(),
+            'rng': [state[0], list(state[1]), state[2]],
+            'seed': manager.run_seed,
+        },
+    }
+
+def restore_run(manager: Any, save: Any) -> None:
+    """Replace manager's world and run state with a captured run.
+
+    The manager's previous world must already have been released.
+    """
+    world = save['world']
+    rooms: List[Any] = []
+    for room_type, description, visited, event_id, enemies, items, npcs, _ in world['rooms']:
+        room = acquire_room(room_type, description)
+        room.visited = visited
+        room.event_id = event_id
+        room.enemies.extend(_restore_enemy(enemy) for enemy in enemies)
+        room.items.extend(item for item in map(_restore_item, items) if item)
+        room.npcs.extend(NPC.from_template(template_id) for template_id in npcs)
+        rooms.append(room)
+    for room, data in zip(rooms, world['rooms']):
+        room.connections.update((direction, rooms[i]) for direction, i in data[7].items())
+    manager.all_rooms = rooms
+    manager.current_room = rooms[world['current']]
+    manager.world_gen.mini_boss_defeated, manager.world_gen.next_mini_boss = world['mini_bosses']
+
+    run = save['run']
+    player = manager.player_entity
+    for lifetime in (RUN, COMBAT):
+        player.modifiers.expire(lifetime)
+    for stat, amount, source, lifetime in run['modifiers']:
+        player.modifiers.add(Modifier(stat, amount, source, lifetime))
+    player.stats.health = min(run['health'], player.stats.max_health)
+    stacks = [(_restore_item(item), count) for item, count in run['inventory']]
+    player.inventory.load_stacks([(item, count) for item, count in stacks if item])
+    manager.run_stats.resume_run(run['counters'], run['elapsed'])
+    manager.run_seed = run.get('seed', 0)
+    version, internal, gauss = run['rng']
+    random.setstate((version, tuple(internal), gauss))
@@ -0,0 +1,172 @@
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Tuple
+
+from event_bus import (DamageDealt, DamageTaken, EnemyDefeated, EventBus, EventResolved, FightEnded,
+                       FightStarted, RoomExplored, RunEnded, RunStarted, ShardsGained, UpgradePurchased)
+
+# Run and lifetime statistics, fed by game events on the bus. Every hook is
+# O(1), so summaries never have to walk the world.
+
+COUNTERS = (
+    'enemies_defeated',
+    'rooms_explored',
+    'fights',
+    'events',
+    'memory_shards_collected',
+    'upgrades_purchased',
+    'total_damage_dealt',
+    'total_damage_taken',
+    'play_time',  # In seconds
+    'deaths',
+)
+
+class RollingMean:
+    """Mean of the last window values, kept with a running total."""
+
+    def __init__(self, window: int = 20):
+        self.values: Deque[float] = deque(maxlen=window)
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+        if len(self.values) == self.values.maxlen:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+    @property
+    def mean(self) -> float:
+        return self.total / len(self.values) if self.values else 0.0
+
+class RollingRate:
+    """Per-minute rate of amounts recorded in the last window seconds."""
+
+    def __init__(self, window: float = 300.0, clock: Callable[[], float] = time.monotonic):
+        self.window = window
+        self.clock = clock
+        self.reset()
+
+    def reset(self) -> None:
+        self.events: Deque[Tuple[float, float]] = deque()
+        self.total = 0.0
+        self.started = self.clock()
+
+    def _expire(self, now: float) -> None:
+        # Each event is appended and expired once, so this is amortized O(1)
+        while self.events and self.events[0][0] <= now - self.window:
+            self.total -= self.events.popleft()[1]
+
+    def add(self, amount: float) -> None:
+        now = self.clock()
+        self._expire(now)
+        self.events.append((now, amount))
+        self.total += amount
+
+    def per_minute(self) -> float:
+        now = self.clock()
+        self._expire(now)
+        span = min(self.window, now - self.started)
+        return self.total * 60 / span if span > 0 else 0.0
+
+class RunStats:
+    """Per-run and lifetime counters plus rolling aggregates."""
+
+    def __init__(self, fight_window: int = 20, rate_window: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self.run: Dict[str, float] = dict.fromkeys(COUNTERS, 0)
+        self.lifetime: Dict[str, float] = dict.fromkeys(COUNTERS, 0)
+        self.damage_per_fight = RollingMean(fight_window)
+        self.shard_rate = RollingRate(rate_window, clock)
+        self._run_start = clock()
+        self._fight_damage = 0
+
+    def attach(self, bus: EventBus) -> None:
+        """Count what is reported on bus from now on."""
+        bus.subscribe(RunStarted, lambda event: self.on_run_start())
+        bus.subscribe(RunEnded, lambda event: self.on_run_end(event.died))
+        bus.subscribe(RoomExplored, lambda event: self.on_room_explored())
+        bus.subscribe(FightStarted, lambda event: self.on_fight_start())
+        bus.subscribe(FightEnded, lambda event: self.on_fight_end())
+        bus.subscribe(DamageDealt, lambda event: self.on_damage_dealt(event.amount))
+        bus.subscribe(DamageTaken, lambda event: self.on_damage_taken(event.amount))
+        bus.subscribe(EnemyDefeated, lambda event: self.on_enemy_defeated())
+        bus.subscribe(EventResolved, lambda event: self.on_event())
+        bus.subscribe(UpgradePurchased, lambda event: self.on_upgrade())
+        bus.subscribe(ShardsGained, self._on_shards_gained)
+
+    def add(self, counter: str, amount: float = 1) -> None:
+        self.run[counter] += amount
+        self.lifetime[counter] += amount
+
+    # Hooks
+    def on_run_start(self) -> None:
+        self.run = dict.fromkeys(COUNTERS, 0)
+        self.shard_rate.reset()
+        self._run_start = self.clock()
+
+    def resume_run(self, counters: Dict[str, float], elapsed: float) -> None:
+        """Continue a saved run that had been going for elapsed seconds."""
+        self.on_run_start()
+        self.run.update((key, value) for key, value in counters.items() if key in self.run)
+        self._run_start = self.clock() - elapsed
+
+    def on_run_end(self, died: bool = True) -> None:
+        self.add('play_time', self.clock() - self._run_start)
+        if died:
+            self.add('deaths')
+
+    def on_room_explored(self) -> None:
+        self.add('rooms_explored')
+
+    def on_fight_start(self) -> None:
+        self.add('fights')
+        self._fight_damage = 0
+
+    def on_fight_end(self) -> None:
+        self.damage_per_fight.add(self._fight_damage)
+
+    def on_damage_dealt(self, amount: int) -> None:
+        self.add('total_damage_dealt', amount)
+        self._fight_damage += amount
+
+    def on_damage_taken(self, amount: int) -> None:
+        self.add('total_damage_taken', amount)
+
+    def on_enemy_defeated(self) -> None:
+        self.add('enemies_defeated')
+
+    def on_event(self) -> None:
+        self.add('events')
+
+    def on_shards(self, amount: int) -> None:
+        if amount > 0:
+            self.add('memory_shards_collected', amount)
+            self.shard_rate.add(amount)
+
+    def on_upgrade(self) -> None:
+        self.add('upgrades_purchased')
+
+    def _on_shards_gained(self, event: ShardsGained) -> None:
+        if event.source != 'idle':  # Idle income accrues between runs, not in one
+            self.on_shards(event.amount)
+
+    # Aggregates
+    @property
+    def mean_damage_per_fight(self) -> float:
+        return self.damage_per_fight.mean
+
+    @property
+    def shards_per_minute(self) -> float:
+        return self.shard_rate.per_minute()
+
+    def run_time(self) -> float:
+        return self.clock() - self._run_start
+
+    # Persistence (lifetime totals only)
+    def to_dict(self) -> Dict[str, float]:
+        return dict(self.lifetime)
+
+    def load(self, data: Dict[str, float]) -> None:
+        self.lifetime = dict.fromkeys(COUNTERS, 0)
+        self.lifetime.update((key, value) for key, value in data.items() if key in self.lifetime)
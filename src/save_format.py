@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""Binary save format: versioned header, section table, lazily decoded sections.
+
+Layout (little endian):
+    header   magic 'ESAV', version u16, section count u16
+    table    per section: name (16 bytes, NUL padded), offset u32,
+             stored length u32, flags u8 (1 = zlib)
+    payload  one compact JSON document per section
+
+Opening a save reads the header and table only; a section is read and
+decoded the first time it is accessed; read() decodes them all up front,
+for loaders that use every section. Older versions are migrated forward
+on open. JSON export/import is kept for debugging:
+
+    python src/save_format.py export saves/save.dat save.json
+    python src/save_format.py import save.json saves/save.dat
+"""
+
+import argparse
+import json
+import struct
+import zlib
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional, Tuple
+
+from save_service import write_atomic
+
+MAGIC = b'ESAV'
+VERSION = 2
+HEADER = struct.Struct('<4sHH')
+ENTRY = struct.Struct('<16sIIB')
+ZLIB = 1
+COMPRESS_OVER = 256  # Smaller sections are stored as is
+
+class SaveFormatError(ValueError):
+    """The file is not a save, or was written by a newer version."""
+
+def encode(sections: Dict[str, Any], version: int = VERSION) -> bytes:
+    """Serialize {section name: JSON-compatible value} to the binary format."""
+    payloads = []
+    for name, value in sections.items():
+        raw = json.dumps(value, separators=(',', ':')).encode()
+        if len(raw) > COMPRESS_OVER:
+            payloads.append((name, zlib.compress(raw), ZLIB))
+        else:
+            payloads.append((name, raw, 0))
+    offset = HEADER.size + ENTRY.size * len(payloads)
+    table = []
+    for name, data, flags in payloads:
+        if len(name.encode()) > 16:
+            raise ValueError(f"Section name too long: {name}")
+        table.append(ENTRY.pack(name.encode(), offset, len(data), flags))
+        offset += len(data)
+    return b''.join([HEADER.pack(MAGIC, version, len(payloads)), *table,
+                     *(data for _, data, _ in payloads)])
+
+# Forward migrations: MIGRATIONS[v] turns a version v save into version v + 1.
+def _upgrade_counts(save: 'SaveFile') -> None:
+    # Version 1 stored whole upgrade definitions; only purchase counts are state
+    upgrades = save.get('upgrades', {})
+    save['upgrades'] = {key: upgrade['purchased'] for key, upgrade in upgrades.items()}
+
+MIGRATIONS: Dict[int, Callable[['SaveFile'], None]] = {
+    1: _upgrade_counts,
+}
+
+class SaveFile:
+    """A save's sections, decoded on first access."""
+
+    def __init__(self, version: int, entries: Dict[str, Tuple[int, int, int]],
+                 file: Optional[BinaryIO] = None):
+        self.version = version
+        self._entries = entries  # name -> (offset, length, flags) in file
+        self._file = file
+        self._decoded: Dict[str, Any] = {}
+
+    @classmethod
+    def open(cls, path: str) -> 'SaveFile':
+        """Read the header and section table of path and migrate it to VERSION."""
+        file = open(path, 'rb')  # Held open: a save written meanwhile replaces the name, not this file
+        try:
+            magic, version, count = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC:
+                raise SaveFormatError(f"{path} is not a save file")
+            if version > VERSION:
+                raise SaveFormatError(f"{path} has version {version}; this game reads up to {VERSION}")
+            entries = {}
+            for _ in range(count):
+                name, offset, length, flags = ENTRY.unpack(file.read(ENTRY.size))
+                entries[name.rstrip(b'\0').decode()] = (offset, length, flags)
+        except (struct.error, UnicodeDecodeError):
+            file.close()
+            raise SaveFormatError(f"{path} is truncated or corrupt")
+        except BaseException:
+            file.close()
+            raise
+        save = cls(version, entries, file)
+        save.migrate()
+        return save
+
+    @classmethod
+    def from_sections(cls, sections: Dict[str, Any], version: int = VERSION) -> 'SaveFile':
+        save = cls(version, {})
+        save._decoded = dict(sections)
+        save.migrate()
+        return save
+
+    def migrate(self) -> None:
+        while self.version < VERSION:
+            MIGRATIONS[self.version](self)
+            self.version += 1
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._decoded or name in self._entries
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._decoded
+        yield from (name for name in self._entries if name not in self._decoded)
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._decoded:
+            offset, length, flags = self._entries[name]
+            self._file.seek(offset)
+            data = self._file.read(length)
+            try:
+                if flags & ZLIB:
+                    data = zlib.decompress(data)
+                self._decoded[name] = json.loads(data)
+            except (zlib.error, ValueError):
+                raise SaveFormatError(f"{self._file.name}: section {name} is corrupt")
+        return self._decoded[name]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self[name] if name in self else default
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        self._decoded[name] = value
+
+    def sections(self) -> Dict[str, Any]:
+        """Every section, decoded."""
+        return {name: self[name] for name in self}
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> 'SaveFile':
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+def read(path: str) -> SaveFile:
+    """Open path and decode every section now, so a corrupt one fails here, before any is used."""
+    save = SaveFile.open(path)
+    try:
+        save.sections()
+    except BaseException:
+        save.close()
+        raise
+    return save
+
+def from_json(data: Dict[str, Any]) -> SaveFile:
+    """A SaveFile from an export, or from a version 1 flat JSON save."""
+    if 'sections' in data:
+        return SaveFile.from_sections(data['sections'], data['version'])
+    sections = {key: value for key, value in data.items() if key != 'journal_seq'}
+    sections['meta'] = {'journal_seq': data.get('journal_seq', 0)}
+    return SaveFile.from_sections(sections, version=1)
+
+def export_json(path: str, out: str) -> None:
+    with SaveFile.open(path) as save:
+        data = {'version': save.version, 'sections': save.sections()}
+    with open(out, 'w') as f:
+        json.dump(data, f, indent=2)
+
+def import_json(source: str, path: str) -> None:
+    with open(source) as f:
+        save = from_json(json.load(f))
+    write_atomic(path, encode(save.sections()))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('command', choices=['export', 'import'])
+    parser.add_argument('source')
+    parser.add_argument('destination')
+    args = parser.parse_args()
+    if args.command == 'export':
+        export_json(args.source, args.destination)
+    else:
+        import_json(args.source, args.destination)
+
+if __name__ == '__main__':
+    main()
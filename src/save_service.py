@@ -0,0 +1,156 @@
+import atexit
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Saves are snapshotted on the calling thread and written by one background
+# thread. Requests for the same path coalesce: if several arrive before the
+# writer gets to them, only the latest snapshot is written. Failed writes are
+# logged and kept until the game takes them to warn the player.
+
+Encoder = Callable[[Any], bytes]
+
+log = logging.getLogger(__name__)
+
+def encode_json(data: Any) -> bytes:
+    return json.dumps(data, separators=(',', ':')).encode()
+
+def write_atomic(path: str, data: bytes) -> None:
+    """Replace path with data so readers see the old or the new file, never a torn one."""
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    if hasattr(os, 'O_DIRECTORY'):
+        # Persist the rename itself
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+class SaveService:
+    """Coalescing background writer for save files."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay  # Wait this long after a request for more to coalesce
+        self.writes = 0
+        self.errors: List[Tuple[str, BaseException]] = []  # (path, error) not yet taken
+        self._reset()
+        atexit.register(self.close)  # The writer is a daemon thread
+        if hasattr(os, 'register_at_fork'):
+            # A forked child has no writer thread, and the parent writes its own queue
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self) -> None:
+        self._pending: Dict[str, tuple] = {}  # path -> submit() arguments
+        self._in_flight: Dict[str, tuple] = {}
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def submit(self, path: str, snapshot: Any, encode: Encoder = encode_json,
+               on_written: Optional[Callable[[], None]] = None,
+               write: Optional[Callable[[Any], None]] = None,
+               on_failed: Optional[Callable[[BaseException], None]] = None) -> None:
+        """Queue snapshot to be encoded and written to path. snapshot must not be mutated afterwards.
+
+        on_written runs on the writer thread once this snapshot is on disk, and
+        on_failed with the error if encoding or writing it raised; both are
+        dropped with the snapshot if a newer one for the same path replaces it.
+        write, if given, stores the snapshot instead (path is then only the
+        coalescing key).
+        """
+        path = os.path.abspath(path)  # The working directory may change before the write
+        with self._cond:
+            self._pending[path] = (snapshot, encode, on_written, write, on_failed)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='save-writer', daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def wait(self, path: Optional[str] = None, timeout: Optional[float] = None) -> bool:
+        """Block until path (default: everything) is on disk. Returns False on timeout."""
+        path = path and os.path.abspath(path)
+        def done() -> bool:
+            if path is None:
+                return not self._pending and not self._in_flight
+            return path not in self._pending and path not in self._in_flight
+        with self._cond:
+            return self._cond.wait_for(done, timeout)
+
+    def take_errors(self, path: Optional[str] = None) -> List[Tuple[str, BaseException]]:
+        """Remove and return the failed writes to path (default: all of them)."""
+        path = path and os.path.abspath(path)
+        with self._cond:
+            taken = [error for error in self.errors if path is None or error[0] == path]
+            self.errors = [error for error in self.errors if path is not None and error[0] != path]
+        return taken
+
+    def discard(self, path: str) -> None:
+        """Drop any queued write for path and delete the file."""
+        path = os.path.abspath(path)
+        with self._cond:
+            self._pending.pop(path, None)
+            self._cond.wait_for(lambda: path not in self._in_flight)
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> List[Tuple[str, BaseException]]:
+        """Write everything still queued, stop the writer thread and return the failed writes not yet taken."""
+        with self._cond:
+            thread = self._thread
+            self._closed = True
+            self._cond.notify_all()
+        if thread:
+            thread.join()
+        with self._cond:
+            self._closed = False  # A later submit starts a new writer
+        return self.take_errors()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    self._thread = None  # Closed and drained
+                    return
+                if self.delay:
+                    self._cond.wait_for(lambda: self._closed, self.delay)
+                self._in_flight, self._pending = self._pending, {}
+                batch = self._in_flight
+            for path, (snapshot, encode, on_written, write, on_failed) in batch.items():
+                try:
+                    if write:
+                        write(snapshot)
+                    else:
+                        write_atomic(path, encode(snapshot))
+                    self.writes += 1
+                    if on_written:
+                        on_written()
+                except Exception as error:
+                    log.error("Saving %s failed", path, exc_info=error)
+                    with self._cond:
+                        self.errors.append((path, error))
+                    if on_failed:
+                        on_failed(error)
+            with self._cond:
+                self._in_flight = {}
+                self._cond.notify_all()
+
+# Shared by everything that writes under saves/, so a read can wait for
+# whatever is still queued for its file
+SAVES = SaveService()
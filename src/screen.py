@@ -0,0 +1,107 @@
+import io
+import os
+import re
+import shutil
+import sys
+from typing import Callable, List, Optional, Set, TextIO, Tuple
+
+# Terminal renderer. Once installed as sys.stdout, everything printed between
+# two clear_screen() calls is one frame, kept off screen. A flush draws it:
+# rows that already show the right text are skipped, the rest are rewritten
+# in place with cursor moves, and the whole update goes out in one write.
+# input() flushes stdout before it reads, so every prompt sees a whole frame.
+# Frames too big to address (taller or wider than the terminal) are written
+# out plainly and allowed to scroll.
+
+ANSI = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+HOME = '\x1b[H'
+ERASE_SCREEN = '\x1b[2J'
+ERASE_LINE = '\x1b[K'  # From the cursor to the end of the line
+ERASE_BELOW = '\x1b[J'  # From the cursor to the end of the screen
+
+def visible_width(line: str) -> int:
+    return len(ANSI.sub('', line))
+
+class Screen(io.TextIOBase):
+    """Frame buffer in front of a terminal stream."""
+
+    def __init__(self, stream: TextIO, color: bool = True,
+                 size: Callable[[], Tuple[int, int]] = shutil.get_terminal_size):
+        self.stream = stream
+        self.color = color  # False strips colors and styles from everything written
+        self.size = size  # () -> (columns, rows)
+        self.bytes_written = 0
+        self._frame: List[str] = []
+        self._presented = 0  # Length of the frame text already drawn
+        self._shown: Optional[List[Optional[str]]] = None  # Terminal rows (None: unknown)
+        self._shown_size: Optional[Tuple[int, int]] = None
+        self._prompt_rows: Set[int] = set()  # Rows where input was typed this frame
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self._frame.append(text if self.color else ANSI.sub('', text))
+        return len(text)
+
+    def clear(self) -> None:
+        """Start a new frame; nothing is drawn until the next flush."""
+        if self._shown is not None:
+            for row in self._prompt_rows:
+                if row < len(self._shown):
+                    self._shown[row] = None  # Still shows what was typed there
+        self._prompt_rows = set()
+        self._frame = []
+        self._presented = 0
+
+    def flush(self) -> None:
+        """Draw the frame so far. A flush is taken to precede input, which ends the last line."""
+        text = ''.join(self._frame)
+        lines = text.split('\n')
+        size = tuple(self.size())
+        columns, rows = size
+        fits = len(lines) < rows and all(visible_width(line) < columns for line in lines)
+        out = []
+        if fits and self._shown is not None and size == self._shown_size:
+            shown = self._shown
+            for row, line in enumerate(lines):
+                if row >= len(shown) or shown[row] != line:
+                    out.append(f"\x1b[{row + 1};1H{line}{ERASE_LINE}")
+            if len(shown) > len(lines):
+                out.append(f"\x1b[{len(lines) + 1};1H{ERASE_BELOW}")
+            out.append(f"\x1b[{len(lines)};{visible_width(lines[-1]) + 1}H")
+            self._shown = list(lines)
+        else:
+            # Unknown or unaddressable screen: write the new text and let it scroll
+            if self._presented == 0:
+                out.append(HOME + ERASE_SCREEN)
+            out.append(text[self._presented:])
+            self._shown = list(lines) if fits and self._presented == 0 else None
+        self._shown_size = size
+        self._prompt_rows.add(len(lines) - 1)
+        self._frame = [text, '\n']  # The Enter that ends the input moves the cursor down
+        self._presented = len(text) + 1
+        data = ''.join(out)
+        self.bytes_written += len(data)
+        self.stream.write(data)
+        self.stream.flush()
+
+    @property
+    def encoding(self) -> str:
+        return self.stream.encoding
+
+    def isatty(self) -> bool:
+        return self.stream.isatty()
+
+def clear() -> None:
+    """Start a new screen, installing a Screen over stdout if it is a terminal.
+
+    Output that is not a terminal (pipes, files, tests) is left alone: there is
+    nothing to clear and no cursor to move.
+    """
+    out = sys.stdout
+    if not isinstance(out, Screen):
+        if not out.isatty():
+            return
+        out = sys.stdout = Screen(out, color='NO_COLOR' not in os.environ)
+    out.clear()
@@ -0,0 +1,155 @@
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Tuple
+from entities import Player, Room
+
+# Copy-on-write run history. Taking a snapshot only records a marker; an
+# object's state is copied into the newest snapshot the first time it is
+# touched afterwards. Rewinding replays those saved states newest-first, so
+# only rooms and entities that actually changed are ever copied.
+#
+# Callers must touch() a room or the player before mutating it. In the game
+# only the current room and the player change, so GameManager touches both at
+# the top of the handle_room loop and on every room transition.
+
+def _capture_stats(stats: Any) -> Tuple[Any, int, int, int, int]:
+    return (stats, stats.health, stats.max_health, stats.attack, stats.defense)
+
+def _restore_stats(saved: Tuple[Any, int, int, int, int]) -> Any:
+    stats, stats.health, stats.max_health, stats.attack, stats.defense = saved
+    return stats
+
+def _capture_room(room: Room) -> tuple:
+    return (
+        room.visited,
+        list(room.enemies),
+        [_capture_stats(enemy.stats) for enemy in room.enemies],
+        list(room.items),
+        list(room.npcs),
+        dict(room.connections),
+        room.event_id
+    )
+
+def _restore_room(room: Room, saved: tuple) -> None:
+    visited, enemies, enemy_stats, items, npcs, connections, event_id = saved
+    room.visited = visited
+    room.enemies[:] = enemies
+    for stats in enemy_stats:
+        _restore_stats(stats)
+    room.items[:] = items
+    room.npcs[:] = npcs
+    room.connections.clear()
+    room.connections.update(connections)
+    room.event_id = event_id
+
+def _capture_player(player: Player) -> tuple:
+    return (
+        _capture_stats(player.stats),
+        player.modifiers.state(),
+        player.memory_shards,
+        player.level,
+        [(stack.item, stack.count) for stack in player.inventory.stacks],
+        player.max_inventory
+    )
+
+def saved_items(saved: tuple) -> list:
+    """The items in a captured player state's inventory."""
+    return [item for item, _ in saved[4]]
+
+def _restore_player(player: Player, saved: tuple) -> None:
+    stats, modifiers, player.memory_shards, player.level, stacks, player.max_inventory = saved
+    player.stats = _restore_stats(stats)
+    player.modifiers.restore(modifiers)
+    player.inventory.load_stacks(stacks)
+
+_HANDLERS: Dict[type, Tuple[Callable[[Any], Any], Callable[[Any, Any], None]]] = {
+    Room: (_capture_room, _restore_room),
+    Player: (_capture_player, _restore_player),
+}
+
+class Snapshot:
+    """Marker in the timeline plus the states saved since it was taken."""
+    __slots__ = ('label', 'run_state', 'saved')
+
+    def __init__(self, label: str, run_state: Dict[str, Any]):
+        self.label = label
+        self.run_state = run_state  # Small scalars such as the current room and run counters
+        self.saved: Dict[int, Tuple[Any, Any]] = {}  # id(obj) -> (obj, state)
+
+class Timeline:
+    """The last max_snapshots snapshots of a run, rewindable to any of them."""
+
+    def __init__(self, max_snapshots: int = 10):
+        self.max_snapshots = max_snapshots
+        self._snapshots: Deque[Snapshot] = deque()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    @property
+    def labels(self) -> list:
+        return [snapshot.label for snapshot in self._snapshots]
+
+    def snapshot(self, label: str = "", **run_state: Any) -> int:
+        """Take a snapshot in O(1) and return its index (0 is the oldest kept)."""
+        if len(self._snapshots) == self.max_snapshots:
+            # Dropping the oldest log is safe: nothing can rewind to it anymore
+            self._snapshots.popleft()
+        self._snapshots.append(Snapshot(label, run_state))
+        return len(self._snapshots) - 1
+
+    def touch(self, obj: Any) -> None:
+        """Save obj's state into the newest snapshot unless already saved there."""
+        if not self._snapshots:
+            return
+        saved = self._snapshots[-1].saved
+        key = id(obj)
+        if key not in saved:
+            capture, _ = _HANDLERS[type(obj)]
+            saved[key] = (obj, capture(obj))
+
+    def rewind(self, steps_back: int = 0) -> Optional[Dict[str, Any]]:
+        """Restore the state at a recent snapshot and return its run_state.
+
+        steps_back=0 rewinds to the newest snapshot, 1 to the one before, and
+        so on. Later snapshots are discarded; the target stays available.
+        """
+        if steps_back >= len(self._snapshots):
+            return None
+        target = len(self._snapshots) - 1 - steps_back
+        while len(self._snapshots) - 1 > target:
+            self._apply(self._snapshots.pop())
+        snapshot = self._snapshots[-1]
+        self._apply(snapshot)
+        snapshot.saved = {}
+        return dict(snapshot.run_state)
+
+    def peek(self, obj: Any, steps_back: int = 0) -> Optional[Any]:
+        """The state rewind(steps_back) would restore obj to, or None if it would leave obj as is."""
+        if steps_back >= len(self._snapshots):
+            return None
+        snapshots = list(self._snapshots)[len(self._snapshots) - 1 - steps_back:]
+        for snapshot in snapshots:  # The target's own capture is applied last, so it wins
+            if id(obj) in snapshot.saved:
+                return snapshot.saved[id(obj)][1]
+        return None
+
+    def _apply(self, snapshot: Snapshot) -> None:
+        for obj, state in snapshot.saved.values():
+            _, restore = _HANDLERS[type(obj)]
+            restore(obj, state)
+
+    def clear(self) -> None:
+        self._snapshots.clear()
+
+    @contextmanager
+    def what_if(self, label: str = "what-if", **run_state: Any) -> Iterator[int]:
+        """Explore a branch and undo everything it touched on exit."""
+        index = self.snapshot(label, **run_state)
+        marker = self._snapshots[-1]
+        try:
+            yield index
+        finally:
+            if marker in self._snapshots:
+                self.rewind(len(self._snapshots) - 1 - self._snapshots.index(marker))
+                self._snapshots.pop()
@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# Shared, immutable definitions for items and NPCs. Instances keep only a
+# template id plus their own rolled values; names and descriptions are
+# rendered from the template when displayed.
+
+@dataclass(frozen=True, slots=True)
+class ItemTemplate:
+    id: str
+    name: str  # Format pattern; may use {rarity}, {Rarity} and {value}
+    description: str  # Format pattern, as for name
+    effect_type: str
+    special_effect: Optional[str] = None
+
+    def render_name(self, rarity: str, value: int) -> str:
+        return self.name.format(rarity=rarity, Rarity=rarity.capitalize(), value=value)
+
+    def render_description(self, rarity: str, value: int) -> str:
+        return self.description.format(rarity=rarity, Rarity=rarity.capitalize(), value=value)
+
+@dataclass(frozen=True, slots=True)
+class NPCTemplate:
+    id: str
+    name: str
+    dialogue_id: str
+    sprite_id: Optional[str] = None
+    health: int = 100
+
+ITEM_TEMPLATES: Dict[str, ItemTemplate] = {}
+NPC_TEMPLATES: Dict[str, NPCTemplate] = {}
+
+# (name, description, effect_type, special_effect) -> template id, for ad-hoc items
+_ADHOC_ITEMS: Dict[Tuple[str, str, str, Optional[str]], str] = {}
+
+def register_item_template(template: ItemTemplate) -> ItemTemplate:
+    """Add an item template, returning the already registered one if the id exists."""
+    return ITEM_TEMPLATES.setdefault(template.id, template)
+
+def register_npc_template(template: NPCTemplate) -> NPCTemplate:
+    """Add an NPC template, returning the already registered one if the id exists."""
+    return NPC_TEMPLATES.setdefault(template.id, template)
+
+def intern_item_template(name: str, description: str, effect_type: str,
+                         special_effect: Optional[str] = None) -> str:
+    """Return the id of a template with fixed name and description text.
+
+    Used for items built directly from literal strings rather than a known
+    template; identical literals share one template.
+    """
+    key = (name, description, effect_type, special_effect)
+    template_id = _ADHOC_ITEMS.get(key)
+    if template_id is None:
+        template_id = f"custom_{len(_ADHOC_ITEMS)}"
+        register_item_template(ItemTemplate(
+            id=template_id,
+            name=name.replace('{', '{{').replace('}', '}}'),
+            description=description.replace('{', '{{').replace('}', '}}'),
+            effect_type=effect_type,
+            special_effect=special_effect
+        ))
+        _ADHOC_ITEMS[key] = template_id
+    return template_id
+
+# Treasure-room items from WorldGenerator.generate_item
+for _id, _name, _effect, _desc in [
+    ('health_potion', 'Health Potion', 'heal', 'restores {value} health to target'),
+    ('damage_crystal', 'Damage Crystal', 'damage', 'deals up to {value} damage to target'),
+    ('shield_shard', 'Shield Shard', 'defense', 'temporarily grants {value} defense to self'),
+    ('power_fragment', 'Power Fragment', 'attack', 'temporarily grants {value} attack to self'),
+]:
+    register_item_template(ItemTemplate(_id, '{Rarity} ' + _name, 'A {rarity} item that ' + _desc, _effect))
+
+# Legendary items from WorldGenerator.generate_legendary_item
+for _id, _name, _desc, _effect, _special in [
+    ('phoenix_elixir', 'Phoenix Elixir', 'A legendary potion that fully restores health', 'heal', 'resurrect'),
+    ('void_shard', 'Void Shard', 'A crystal infused with pure void energy', 'damage', None),
+    ('time_fragment', 'Time Fragment', 'A crystallized moment of time', 'heal', 'time_stop'),
+    ('memory_crystal', 'Memory Crystal', 'Contains the memories of a powerful being', 'buff', 'skill_boost'),
+    ('eternity_shard', 'Eternity Shard', 'A fragment of endless possibility', 'special', 'reroll'),
+]:
+    register_item_template(ItemTemplate(_id, _name, _desc, _effect, _special))
+
+def loot_item_template(item_name: str, legendary: bool = False) -> str:
+    """Return the template id for a CombatSystem loot drop, registering it on first use."""
+    template_id = f"loot_{item_name}_legendary" if legendary else f"loot_{item_name}"
+    if template_id in ITEM_TEMPLATES:
+        return template_id
+
+    title = item_name.replace('_', ' ').title()
+    effect_type = item_name.split('_')[0]
+    if legendary:
+        if item_name == 'health_potion':
+            name, description = "Phoenix Elixir", "A legendary potion that provides massive healing"
+        elif item_name == 'damage_crystal':
+            name, description = "Void Shard", "A crystal infused with void energy"
+        else:
+            name, description = f"Legendary {title}", "A legendary item of immense power"
+    else:
+        name = '{Rarity} ' + title
+        description = 'A {rarity} item that provides {value} ' + effect_type
+    register_item_template(ItemTemplate(template_id, name, description, effect_type))
+    return template_id
+
+def resolve_item_template(template_id: str) -> bool:
+    """Make sure template_id is registered, rebuilding loot templates on demand.
+
+    Returns False for ids that can't be rebuilt (ad-hoc templates of another session).
+    """
+    if template_id in ITEM_TEMPLATES:
+        return True
+    if template_id.startswith('loot_'):
+        item_name = template_id[len('loot_'):]
+        legendary = item_name.endswith('_legendary')
+        if legendary:
+            item_name = item_name[:-len('_legendary')]
+        loot_item_template(item_name, legendary)
+        return True
+    return False
+
+register_npc_template(NPCTemplate(
+    id='mysterious_stranger',
+    name="Mysterious Stranger",
+    dialogue_id="sage_intro",
+    sprite_id="stranger_type_1"
+))
@@ -0,0 +1,217 @@
+import bisect
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+# Memory Forge upgrades compiled into a dependency graph. The upgrade dicts
+# stay the source of truth (saves serialize them as-is); the graph keeps
+# derived state - unmet requirement counts, the open upgrades of each tier
+# and the total purchase count - up to date one purchase at a time.
+
+class UpgradeGraph:
+    """Upgrade DAG with incrementally maintained availability."""
+
+    def __init__(self, upgrades: Dict[str, Dict]):
+        self.version = 0  # Bumped on every change, for render caches
+        self.rebuild(upgrades)
+
+    def rebuild(self, upgrades: Dict[str, Dict]) -> None:
+        """Compile upgrades from scratch, e.g. after loading a save."""
+        self.upgrades = upgrades
+        self.dependents: Dict[str, List[str]] = {key: [] for key in upgrades}
+        for key, upgrade in upgrades.items():
+            for req_key in upgrade.get('requires', {}):
+                if req_key not in upgrades:
+                    raise ValueError(f"Upgrade {key!r} requires unknown upgrade {req_key!r}")
+                self.dependents[req_key].append(key)
+        self.order = self._topological_order()
+
+        self.unmet: Dict[str, int] = {
+            key: sum(1 for req_key, amount in upgrade.get('requires', {}).items()
+                     if upgrades[req_key]['purchased'] < amount)
+            for key, upgrade in upgrades.items()
+        }
+        # tier -> open (not maxed) upgrade keys, in definition order
+        self.tiers: Dict[int, Dict[str, None]] = {}
+        for key, upgrade in upgrades.items():
+            if upgrade['purchased'] < upgrade['max_purchases']:
+                self.tiers.setdefault(upgrade.get('tier', 1), {})[key] = None
+        self.total_purchased = sum(upgrade['purchased'] for upgrade in upgrades.values())
+        self.version += 1
+
+    def _topological_order(self) -> List[str]:
+        """Requirements before dependents (Kahn's algorithm)."""
+        indegree = {key: len(upgrade.get('requires', {})) for key, upgrade in self.upgrades.items()}
+        ready = deque(key for key, count in indegree.items() if count == 0)
+        order = []
+        while ready:
+            key = ready.popleft()
+            order.append(key)
+            for dependent in self.dependents[key]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) != len(self.upgrades):
+            cycle = sorted(key for key, count in indegree.items() if count)
+            raise ValueError(f"Upgrade requirements form a cycle: {', '.join(cycle)}")
+        return order
+
+    def requirements_met(self, key: str) -> bool:
+        return self.unmet[key] == 0
+
+    def is_available(self, key: str) -> bool:
+        """Requirements met and not yet maxed out."""
+        upgrade = self.upgrades[key]
+        return self.unmet[key] == 0 and upgrade['purchased'] < upgrade['max_purchases']
+
+    def open_by_tier(self) -> Dict[int, List[str]]:
+        """Upgrades that are not maxed out, grouped by tier in ascending order."""
+        return {tier: list(self.tiers[tier]) for tier in sorted(self.tiers) if self.tiers[tier]}
+
+    @property
+    def difficulty_tier(self) -> int:
+        return max(1, self.total_purchased // 3)  # Every 3 upgrades increases difficulty tier
+
+    def purchase(self, key: str) -> List[str]:
+        """Record one purchase of key and return dependents that just unlocked."""
+        upgrade = self.upgrades[key]
+        upgrade['purchased'] += 1
+        self.total_purchased += 1
+        self.version += 1
+        if upgrade['purchased'] >= upgrade['max_purchases']:
+            tier = self.tiers.get(upgrade.get('tier', 1), {})
+            tier.pop(key, None)
+
+        unlocked = []
+        for dependent in self.dependents[key]:
+            # A requirement flips to met exactly when the count reaches it
+            if self.upgrades[dependent]['requires'][key] == upgrade['purchased']:
+                self.unmet[dependent] -= 1
+                if self.unmet[dependent] == 0:
+                    unlocked.append(dependent)
+        return unlocked
+
+# Purchase planning. Costs are flat per purchase and every requirement is a
+# minimum count, so a plan is fully described by how many of each upgrade it
+# buys; buying them in topological order always satisfies the requirements.
+
+def plan_cheapest(upgrades: Dict[str, Dict], target: str,
+                  count: Optional[int] = None) -> Optional[Tuple[int, List[str]]]:
+    """Cheapest purchase order that brings target to count purchases.
+
+    count defaults to one more than currently purchased. Returns (cost,
+    purchases) or None when a requirement exceeds an upgrade's max_purchases.
+    With flat costs the cheapest plan is exactly the requirement closure:
+    anything less leaves a requirement unmet, anything more costs more.
+    """
+    graph = UpgradeGraph(upgrades)
+    need = {key: upgrade['purchased'] for key, upgrade in upgrades.items()}
+    need[target] = max(need[target], upgrades[target]['purchased'] + 1 if count is None else count)
+    for key in reversed(graph.order):
+        if need[key] > upgrades[key]['purchased']:
+            for req_key, amount in upgrades[key].get('requires', {}).items():
+                need[req_key] = max(need[req_key], amount)
+
+    cost, purchases = 0, []
+    for key in graph.order:
+        upgrade = upgrades[key]
+        if need[key] > upgrade['max_purchases']:
+            return None
+        extra = need[key] - upgrade['purchased']
+        cost += extra * upgrade['cost']
+        purchases.extend([key] * extra)
+    return cost, purchases
+
+def plan_best_value(upgrades: Dict[str, Dict], budget: int,
+                    values: Optional[Dict[str, float]] = None) -> Tuple[float, List[str]]:
+    """Purchase order with the highest total value within budget.
+
+    values gives the worth of one purchase of each upgrade (default 1, i.e.
+    as many upgrades as possible). Memoized DP over upgrades in topological
+    order; the state is the index, the remaining budget (capped at the cost
+    of everything left) and which requirement thresholds the earlier
+    upgrades reach. Branches are cut with a fractional knapsack bound.
+    """
+    graph = UpgradeGraph(upgrades)
+    order = graph.order
+    n = len(order)
+    position = {key: i for i, key in enumerate(order)}
+    worths = [1.0 if values is None else values.get(key, 0.0) for key in order]
+    open_counts = [max(0, upgrades[key]['max_purchases'] - upgrades[key]['purchased']) for key in order]
+    # Requirement thresholds on earlier upgrades that upgrade i or later still check.
+    # Only which thresholds a count reaches matters, so states compare those.
+    frontier: List[Tuple[Tuple[str, Tuple[int, ...]], ...]] = []
+    for i in range(n):
+        thresholds: Dict[str, set] = {}
+        for key in order[i:]:
+            for req_key, amount in upgrades[key].get('requires', {}).items():
+                if position.get(req_key, n) < i:
+                    thresholds.setdefault(req_key, set()).add(amount)
+        frontier.append(tuple((key, tuple(sorted(thresholds[key]))) for key in order[:i] if key in thresholds))
+    # Cheapest open upgrade from i on; below it nothing more can be bought
+    min_cost_after = [float('inf')] * (n + 1)
+    # Cost of buying everything from i on; shards beyond it are left over whatever the plan
+    cost_after = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        cost = upgrades[order[i]]['cost']
+        min_cost_after[i] = min(min_cost_after[i + 1], cost if open_counts[i] else float('inf'))
+        cost_after[i] = cost_after[i + 1] + cost * open_counts[i]
+    # Upgrades from i on by value per shard, for the fractional bound below
+    by_ratio = [sorted(((worths[j], upgrades[order[j]]['cost'], open_counts[j]) for j in range(i, n)
+                        if worths[j] > 0 and open_counts[j]),
+                       key=lambda item: -item[0] / item[1] if item[1] else -float('inf'))
+                for i in range(n + 1)]
+
+    def bound(i: int, left: int) -> float:
+        """Most value from i on if requirements were ignored and purchases could be split."""
+        total = 0.0
+        for worth, cost, count in by_ratio[i]:
+            if cost * count <= left:
+                total += worth * count
+                left -= cost * count
+            else:
+                return total + worth * left / cost
+        return total
+
+    final = {key: upgrade['purchased'] for key, upgrade in upgrades.items()}
+    memo: Dict[tuple, Tuple[float, int, Tuple[int, ...]]] = {}
+
+    def best(i: int, left: int) -> Tuple[float, int, Tuple[int, ...]]:
+        """(value, shards left over, extra purchases per upgrade from i on)."""
+        if i == n or left < min_cost_after[i]:
+            return 0.0, left, (0,) * (n - i)
+        excess = max(0, left - cost_after[i])
+        left -= excess
+        memo_key = (i, left, tuple(bisect.bisect_right(amounts, final[key]) for key, amounts in frontier[i]))
+        result = memo.get(memo_key)
+        if result is None:
+            result = memo[memo_key] = choose(i, left)
+        return result[0], result[1] + excess, result[2]
+
+    def choose(i: int, left: int) -> Tuple[float, int, Tuple[int, ...]]:
+        key = order[i]
+        upgrade = upgrades[key]
+        max_extra = open_counts[i]
+        if upgrade['cost'] > 0:
+            max_extra = min(max_extra, left // upgrade['cost'])
+        if any(final[req_key] < amount for req_key, amount in upgrade.get('requires', {}).items()):
+            max_extra = 0
+        worth = worths[i]
+
+        result = (-1.0, 0, ())
+        for extra in range(max_extra, -1, -1):
+            remaining = left - extra * upgrade['cost']
+            if extra * worth + bound(i + 1, remaining) < result[0] - 1e-9:
+                continue  # Cannot match the best found
+            final[key] = upgrade['purchased'] + extra
+            value, spare, rest = best(i + 1, remaining)
+            # Equal value goes to the plan that leaves more shards
+            if (extra * worth + value, spare) > result[:2]:
+                result = (extra * worth + value, spare, (extra,) + rest)
+        final[key] = upgrade['purchased']
+        return result
+
+    value, _, extras = best(0, budget)
+    purchases = []
+    for key, extra in zip(order, extras):
+        purchases.extend([key] * extra)
+    return value, purchases
@@ -1,18 +1,21 @@
-import os
+import copy
 import json
 import random
 from typing import Any, Dict, List, Optional
 from colorama import Fore, Style, init
+import screen
+from save_service import SAVES
 
 # Initialize colorama
 init()
 
 def clear_screen() -> None:
-    """Clear the terminal screen."""
-    os.system('cls' if os.name == 'nt' else 'clear')
+    """Start a new screen; only the lines that differ from the last one are redrawn."""
+    screen.clear()
 
 def load_json_data(filepath: str) -> Dict[str, Any]:
     """Load JSON data from a file."""
+    SAVES.wait(filepath)
     try:
         with open(filepath, 'r') as f:
             return json.load(f)
@@ -20,14 +23,14 @@ def load_json_data(filepath: str) -> Dict[str, Any]:
         return {}
 
 def save_json_data(filepath: str, data: Dict[str, Any]) -> None:
-    """Save data to a JSON file."""
-    with open(filepath, 'w') as f:
-        json.dump(data, f, indent=2)
+    """Save data to a JSON file atomically, in the background."""
+    SAVES.submit(filepath, copy.deepcopy(data))
 
 def print_colored(text: str, color: str = Fore.WHITE, bold: bool = False, end: str = '\n') -> None:
     """Print colored text."""
-    style = Style.BRIGHT if bold else ""
-    print(f"{style}{color}{text}{Style.RESET_ALL}", end=end)
+    style = (Style.BRIGHT if bold else "") + color
+    # Styled line by line, so each line can be redrawn on its own
+    print('\n'.join(f"{style}{line}{Style.RESET_ALL}" if line else line for line in text.split('\n')), end=end)
 
 def get_input(prompt: str, valid_options: Optional[List[str]] = None, allow_compound: bool = False) -> str:
     """Get user input with validation.
@@ -1,12 +1,28 @@
 import random
 from typing import Dict, List, Optional, Tuple
 from entities import Room, Enemy, Item, Stats, NPC # Added NPC import
+from entity_store import EnemyStore
+from pools import STATS_POOL, acquire_stats, acquire_enemy, acquire_item, acquire_room
 from utils import chance
 
+# Stat curves: stat = base * difficulty ** exponent * type multiplier.
+# Module-level so balance tooling can tune them.
+ENEMY_STAT_CURVES: Dict[str, Tuple[float, float]] = {
+    'health': (25, 1.5),
+    'attack': (8, 1.3),
+    'defense': (3, 1.2),
+}
+MINI_BOSS_STAT_CURVES: Dict[str, Tuple[float, float]] = {
+    'health': (50, 1.6),
+    'attack': (15, 1.4),
+    'defense': (5, 1.3),
+}
+
 class WorldGenerator:
-    def __init__(self, depth: int = 5, width: int = 5):
+    def __init__(self, depth: int = 5, width: int = 5, enemy_store: Optional[EnemyStore] = None):
         self.depth = depth
         self.width = width
+        self.enemy_store = enemy_store  # When set, enemies are rows in this store
         self.room_types = ['combat', 'treasure', 'event']
         self.directions = ['north', 'south', 'east', 'west']
         self.mini_boss_defeated = 0  # Track number of mini-bosses defeated
@@ -69,10 +85,10 @@ class WorldGenerator:
         name, health_mult, attack_mult, defense_mult, abilities = random.choice(mini_boss_types)
         
         # Mini-boss stats scale even higher than normal enemies
+        multipliers = {'health': health_mult, 'attack': attack_mult, 'defense': defense_mult}
         base_stats = {
-            'health': int(50 * (difficulty ** 1.6) * health_mult),
-            'attack': int(15 * (difficulty ** 1.4) * attack_mult),
-            'defense': int(5 * (difficulty ** 1.3) * defense_mult)
+            stat: int(base * (difficulty ** exponent) * multipliers[stat])
+            for stat, (base, exponent) in MINI_BOSS_STAT_CURVES.items()
         }
         
         # Less random variation for mini-bosses to ensure consistent challenge
@@ -81,7 +97,7 @@ class WorldGenerator:
             base_stats[stat] = int(base_stats[stat] * random.uniform(1 - variation, 1 + variation))
             
         base_stats['max_health'] = base_stats['health']
-        stats = Stats(**base_stats)
+        stats = acquire_stats(**base_stats)
         
         # Mini-bosses have guaranteed better loot
         loot_table = {
@@ -90,7 +106,21 @@ class WorldGenerator:
             'legendary_item': 0.3  # Chance for legendary item
         }
         
-        return Enemy(
+        if self.enemy_store is not None:
+            enemy = self.enemy_store.add(
+                name=f"Mini-Boss: {name} (Lvl {difficulty})",
+                stats=stats,
+                level=difficulty,
+                archetype=name,
+                attack_pattern=abilities,
+                loot_table=loot_table,
+                experience_value=difficulty * 25,
+                is_mini_boss=True
+            )
+            STATS_POOL.release(stats)  # Copied into the store's columns
+            return enemy
+        
+        return acquire_enemy(
             name=f"Mini-Boss: {name} (Lvl {difficulty})",
             stats=stats,
             level=difficulty,
@@ -125,10 +155,10 @@ class WorldGenerator:
         name, health_mult, attack_mult, defense_mult, _ = random.choice(possible_types)
         
         # Base stats scale exponentially with difficulty
+        multipliers = {'health': health_mult, 'attack': attack_mult, 'defense': defense_mult}
         base_stats = {
-            'health': int(25 * (scaled_difficulty ** 1.5) * health_mult),
-            'attack': int(8 * (scaled_difficulty ** 1.3) * attack_mult),
-            'defense': int(3 * (scaled_difficulty ** 1.2) * defense_mult)
+            stat: int(base * (scaled_difficulty ** exponent) * multipliers[stat])
+            for stat, (base, exponent) in ENEMY_STAT_CURVES.items()
         }
         
         # Add random variation
@@ -142,7 +172,7 @@ class WorldGenerator:
         base_stats['defense'] = max(1, base_stats['defense'])
         base_stats['max_health'] = base_stats['health']
         
-        stats = Stats(**base_stats)
+        stats = acquire_stats(**base_stats)
         
         # Get abilities based on enemy type and difficulty
         abilities = self.get_enemy_abilities(name, scaled_difficulty)
@@ -153,7 +183,20 @@ class WorldGenerator:
             'damage_crystal': 0.2 + (scaled_difficulty * 0.05)
         }
         
-        return Enemy(
+        if self.enemy_store is not None:
+            enemy = self.enemy_store.add(
+                name=f"Lvl {scaled_difficulty} {name}",
+                stats=stats,
+                level=scaled_difficulty,
+                archetype=name,
+                attack_pattern=abilities,
+                loot_table=loot_table,
+                experience_value=scaled_difficulty * 10
+            )
+            STATS_POOL.release(stats)  # Copied into the store's columns
+            return enemy
+        
+        return acquire_enemy(
             name=f"Lvl {scaled_difficulty} {name}",
             stats=stats,
             level=scaled_difficulty,
@@ -171,28 +214,14 @@ class WorldGenerator:
             'legendary': 3.0
         }
         
-        item_types = [
-            ('Health Potion', 'heal', 20, 'restores {} health'),
-            ('Damage Crystal', 'damage', 15, 'deals up to {} damage'),
-            ('Shield Shard', 'defense', 5, 'temporarily grants {} defense'),
-            ('Power Fragment', 'attack', 3, 'temporarily grants {} attack')
-        ]
+        template_ids = ['health_potion', 'damage_crystal', 'shield_shard', 'power_fragment']
+        base_values = {'health_potion': 20, 'damage_crystal': 15, 'shield_shard': 5, 'power_fragment': 3}
         
-        name_base, effect_type, base_value, desc_template = random.choice(item_types)
-        value = int(base_value * rarity_multiplier[rarity])
-        
-        # Adjust description based on effect type
-        if effect_type in ['attack', 'defense']:
-            target = 'self'
-        else:
-            target = 'target'
-            
-        description = f"A {rarity} item that {desc_template.format(value)} to {target}"
+        template_id = random.choice(template_ids)
+        value = int(base_values[template_id] * rarity_multiplier[rarity])
         
-        return Item(
-            name=f"{rarity.capitalize()} {name_base}",
-            description=description,
-            effect_type=effect_type,
+        return acquire_item(
+            template_id=template_id,
             effect_value=value,
             rarity=rarity,
             durability=random.randint(3, 5) if chance(0.3) else None
@@ -224,7 +253,7 @@ class WorldGenerator:
         room_type = random.choice(self.room_types)
         description = self.generate_room_description(room_type)
         
-        room = Room(room_type=room_type, description=description)
+        room = acquire_room(room_type=room_type, description=description)
         
         # Check if this should be a mini-boss room
         current_floor = (difficulty - 1) // 2  # Approximate floor number
@@ -245,12 +274,8 @@ class WorldGenerator:
             room.event_id = f"event_{random.randint(1, 5)}"
             # Chance to spawn an NPC in an event room
             if chance(0.3): # 30% chance
-                npc_stats = Stats(health=100, max_health=100, attack=0, defense=0)
-                # Using "sage_intro" which we defined in dialogue_data.py
-                new_npc = NPC(name="Mysterious Stranger", 
-                              stats=npc_stats, 
-                              dialogue_id="sage_intro", 
-                              sprite_id="stranger_type_1") # Added sprite_id
+                # Template uses "sage_intro" which we defined in dialogue_data.py
+                new_npc = NPC.from_template('mysterious_stranger')
                 room.npcs.append(new_npc)
                 print(f"Spawned NPC '{new_npc.name}' (Sprite: {new_npc.sprite_id}) in an event room.") # Debug print
             
@@ -306,47 +331,16 @@ class WorldGenerator:
     def generate_legendary_item(self) -> Item:
         """Generate a special legendary item."""
         legendary_items = [
-            {
-                'name': 'Phoenix Elixir',
-                'description': 'A legendary potion that fully restores health',
-                'effect_type': 'heal',
-                'effect_value': 999,  # Full heal
-                'special_effect': 'resurrect'  # Could be used for future mechanics
-            },
-            {
-                'name': 'Void Shard',
-                'description': 'A crystal infused with pure void energy',
-                'effect_type': 'damage',
-                'effect_value': 50
-            },
-            {
-                'name': 'Time Fragment',
-                'description': 'A crystallized moment of time',
-                'effect_type': 'heal',
-                'effect_value': 100,
-                'special_effect': 'time_stop'  # Could be used for future mechanics
-            },
-            {
-                'name': 'Memory Crystal',
-                'description': 'Contains the memories of a powerful being',
-                'effect_type': 'buff',
-                'effect_value': 20,
-                'special_effect': 'skill_boost'
-            },
-            {
-                'name': 'Eternity Shard',
-                'description': 'A fragment of endless possibility',
-                'effect_type': 'special',
-                'effect_value': 0,
-                'special_effect': 'reroll'  # Could be used for future mechanics
-            }
+            ('phoenix_elixir', 999),  # Full heal
+            ('void_shard', 50),
+            ('time_fragment', 100),
+            ('memory_crystal', 20),
+            ('eternity_shard', 0)
         ]
         
-        item_data = random.choice(legendary_items)
-        return Item(
-            name=item_data['name'],
-            description=item_data['description'],
-            effect_type=item_data['effect_type'],
-            effect_value=item_data['effect_value'],
+        template_id, value = random.choice(legendary_items)
+        return acquire_item(
+            template_id=template_id,
+            effect_value=value,
             rarity='legendary'
-        ) 
\ No newline at end of file
+        )
@@ -0,0 +1,46 @@
+from achievements import AchievementEngine, Achievement, enemy_kind
+from event_bus import EventBus, EnemyDefeated, FightEnded, RunStarted, ShardsGained
+from game import GameManager
+
+def test_achievements_follow_bus_topics():
+    """Test counters, per-run resets and unsubscribing once everything is unlocked."""
+    bus = EventBus()
+    engine = AchievementEngine((
+        Achievement('stalkers', "Stalkers", "", EnemyDefeated,
+                    when=lambda e: enemy_kind(e.name) == 'Void Stalker', count=2),
+        Achievement('streak', "Streak", "", EnemyDefeated, count=2, reset_on=(RunStarted,)),
+        Achievement('bare', "Bare", "", FightEnded, when=lambda e: e.mini_boss and not e.items_used),
+    ), clock=lambda: 7.0)
+    engine.attach(bus)
+    assert not bus.wants(ShardsGained)  # Only topics with achievements are observed
+
+    bus.emit(EnemyDefeated, "Lvl 3 Void Stalker", 3, False)
+    bus.emit(RunStarted)
+    bus.emit(EnemyDefeated, "Lvl 1 Shadow Wisp", 1, False)
+    bus.emit(FightEnded, True, True, 1, 4)  # Used an item
+    bus.flush()
+    assert engine.progress == {'stalkers': 1, 'streak': 1, 'bare': 0}
+    assert not engine.unlocked
+
+    bus.emit(EnemyDefeated, "Mini-Boss: Void Stalker (Lvl 5)", 5, True)
+    bus.emit(FightEnded, True, True, 0, 2)
+    bus.flush()
+    assert engine.unlocked == {'stalkers': 7.0, 'streak': 7.0, 'bare': 7.0}
+    assert [a.key for a in engine.pop_recent()] == ['stalkers', 'streak', 'bare']
+    assert not bus.wants(EnemyDefeated) and not bus.wants(RunStarted)
+
+def test_achievements_persist_with_save(tmp_path, monkeypatch):
+    """Test that unlocks and progress round-trip through save_game/load_game."""
+    monkeypatch.chdir(tmp_path)
+    manager = GameManager()
+    manager.bus.emit(EnemyDefeated, "Lvl 1 Void Stalker", 1, False)
+    manager.bus.flush()
+    manager.save_game()
+
+    loaded = GameManager()
+    assert loaded.load_game()
+    assert 'first_blood' in loaded.achievements.unlocked
+    assert loaded.achievements.progress['stalker_bane'] == 1
+    loaded.bus.emit(EnemyDefeated, "Lvl 1 Void Stalker", 1, False)
+    loaded.bus.flush()
+    assert loaded.achievements.progress['stalker_bane'] == 2
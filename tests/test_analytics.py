@@ -0,0 +1,42 @@
+import csv
+
+import numpy as np
+
+from analytics import analyze, write_csv, write_html
+from run_history import RunHistory, RunRecord
+
+def run(tier, rooms, shards, minutes, cause, profile=''):
+    return RunRecord(profile, 0, 0.0, minutes * 60, cause, tier, rooms, 0, shards, 0, 0, 0, 80, 10, 5)
+
+def test_chunked_report(tmp_path):
+    """Test that aggregates streamed in small chunks match the runs, and both reports are written."""
+    path = str(tmp_path / "history.db")
+    history = RunHistory(path)
+    history.record_many([
+        run(0, 2, 20, 1.0, "Lvl 1 Shard Golem"),
+        run(0, 4, 40, 3.0, "Lvl 2 Shard Golem"),
+        run(0, 9, 90, 2.0, "Trapped Chest"),
+        run(2, 12, 300, 5.0, "Mini-Boss: Void Stalker (Lvl 4), Lvl 5 Void Stalker"),
+        run(2, 99, 600, 10.0, "Lvl 9 Void Stalker", profile='bob'),
+    ])
+    history.close()
+
+    analytics = analyze(path, chunk_size=2)
+    assert analytics.runs == 5
+    tier0, tier2 = analytics.tier_summary()
+    assert tier0 == {'tier': 0, 'runs': 3, 'mean_depth': 5.0, 'median_depth': 4, 'p90_depth': 9,
+                     'shards_per_minute': 25.0}
+    assert tier2['runs'] == 2 and tier2['shards_per_minute'] == 60.0
+    assert analytics.depths[2, analytics.max_depth] == 1  # Deeper runs share the last bin
+    assert analytics.killers == {'Void Stalker': 3, 'Shard Golem': 2, 'Trapped Chest': 1}
+    assert analytics.rates.sum() == 5
+    assert np.array_equal(analyze(path).depths, analytics.depths)
+    assert analyze(path, profile='bob').runs == 1
+
+    write_html(analytics, str(tmp_path / "report.html"))
+    assert "Void Stalker" in (tmp_path / "report.html").read_text()
+    write_csv(analytics, str(tmp_path / "report.csv"))
+    with open(tmp_path / "report.csv") as f:
+        rows = list(csv.DictReader(f))
+    assert {'report': 'killers', 'group': '', 'key': 'Void Stalker', 'value': '3'} in rows
+    assert {'report': 'tier_summary', 'group': 'tier 2', 'key': 'runs', 'value': '2'} in rows
@@ -0,0 +1,31 @@
+import world_gen
+from balance import PARAMETERS, BalanceOptimizer, apply_parameters
+
+class FakeManager:
+    def __init__(self):
+        self.memory_forge_upgrades = {'attack': {'cost': 150}}
+        self.event_system = type('Events', (), {'events': {}})()
+
+def test_parameters_apply_and_snap():
+    """Test that parameters snap to their grid and reach the game constants."""
+    param = PARAMETERS['upgrade_cost_scale']
+    assert param.snap(1.0004) == param.snap(0.9996) == 1.0
+    assert param.snap(99) == param.high
+
+    setup = apply_parameters({'enemy_health_base': 30, 'upgrade_cost_scale': 2.0})
+    try:
+        assert world_gen.ENEMY_STAT_CURVES['health'] == (30, 1.5)
+        manager = FakeManager()
+        setup(manager)
+        assert manager.memory_forge_upgrades['attack']['cost'] == 300
+    finally:
+        apply_parameters({})
+    assert world_gen.ENEMY_STAT_CURVES['health'] == (25, 1.5)
+
+def test_optimizer_uses_score_cache():
+    """Test that cached and nearby vectors are not simulated again."""
+    optimizer = BalanceOptimizer({'tier2_run': 8}, names=['upgrade_cost_scale'])
+    optimizer.cache[((1.0,), 2)] = {'tier2_run': 10, 'tier3_run': 20, 'clear_rate': 0.5, 'mean_depth': 6}
+    scores = optimizer.evaluate([{'upgrade_cost_scale': 1.0}, {'upgrade_cost_scale': 1.001}], players=2)
+    assert scores == [0.0625, 0.0625]
+    assert optimizer.simulated == 0
@@ -83,4 +83,22 @@ def test_combat():
     # Test that combat system is properly initialized
     assert len(combat.enemies) == 1
     assert combat.turn_count == 0
-    assert combat.player == player 
\ No newline at end of file
+    assert combat.player == player
+
+def test_item_templates():
+    """Test that items render from shared templates."""
+    world_gen = WorldGenerator()
+    item = world_gen.generate_item('rare')
+    assert item.name.startswith("Rare ")
+    assert str(item.effect_value) in item.description
+    
+    copy = Item(template_id=item.template_id, effect_value=item.effect_value,
+                rarity='rare', durability=item.durability)
+    assert copy == item
+    assert copy.stack_key == item.stack_key
+    
+    # Items built from literal text share an interned template
+    a = Item(name="Odd Stone", description="Hums quietly", effect_type="heal", effect_value=1, rarity="common")
+    b = Item(name="Odd Stone", description="Hums quietly", effect_type="heal", effect_value=1, rarity="common")
+    assert a.template_id == b.template_id
+    assert a.name == "Odd Stone"
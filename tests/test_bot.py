@@ -0,0 +1,15 @@
+import builtins
+import game
+from bot import play, POLICIES
+
+def test_bot_plays_full_runs(tmp_path, monkeypatch):
+    """Test that every policy completes runs without crashes or violations."""
+    monkeypatch.chdir(tmp_path)
+    for name in POLICIES:
+        report = play(name, runs=3, seed=7)
+        assert report['crashes'] == []
+        assert report['violations'] == {}
+        assert sum(report['outcomes'].values()) == 3
+    # The stubs are removed afterwards
+    assert game.get_input.__module__ == 'utils'
+    assert builtins.input.__module__ == 'builtins'
@@ -0,0 +1,42 @@
+import pytest
+from entities import Stats, Player, Item
+from effects import compile_effect, compile_condition, EffectError
+
+def test_effect_language():
+    """Test compiled effects against a player."""
+    player = Player(
+        name="Test Hero",
+        stats=Stats(health=50, max_health=100, attack=10, defense=5)
+    )
+    
+    effect = compile_effect("amount = heal(value); shards += 2d1 + 3", "{target} +{amount}")
+    assert effect.apply(player, 20) == "Test Hero +20"
+    assert player.stats.health == 70
+    assert player.memory_shards == 5
+    
+    # Ranges roll inside their bounds
+    compile_effect("stat.attack += 2..5").apply(player)
+    assert 12 <= player.stats.attack <= 15
+    
+    # Conditionals only run their statement when they hold
+    compile_effect("if stat.attack >= 100: shards += 50").apply(player)
+    assert player.memory_shards == 5
+    assert compile_condition("stat.max_health // 2 == 50")(player)
+
+def test_effect_errors():
+    """Test that bad programs fail at compile time."""
+    for source in ["heal(", "explode(3)", "shards += missing", "value = 3"]:
+        with pytest.raises(EffectError):
+            compile_effect(source)
+
+def test_item_use_dispatch():
+    """Test that items dispatch through their compiled effect."""
+    player = Player(
+        name="Test Hero",
+        stats=Stats(health=100, max_health=100, attack=10, defense=5)
+    )
+    item = Item(name="Shard", description="", effect_type="damage", effect_value=25, rarity="common")
+    assert item.use(player) == "Test Hero took 20 damage"
+    
+    item = Item(name="Odd", description="", effect_type="special", effect_value=0, rarity="legendary")
+    assert item.use(player) == "Item had no effect"
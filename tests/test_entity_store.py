@@ -0,0 +1,36 @@
+from entities import Player, Stats
+from entity_store import EnemyStore
+from world_gen import WorldGenerator
+from combat import CombatSystem
+
+def test_enemy_views():
+    """Test that store rows behave like Enemy objects."""
+    store = EnemyStore(capacity=2)
+    world_gen = WorldGenerator(enemy_store=store)
+    enemies = [world_gen.generate_enemy(difficulty=1) for _ in range(5)]
+    
+    assert len(store) == 5
+    enemy = enemies[0]
+    assert enemy.get_next_action() == 'attack'
+    assert enemy.stats.is_alive()
+    
+    before = enemy.stats.health
+    dealt = enemy.stats.take_damage(enemy.stats.defense + 4)
+    assert dealt == 4
+    assert store.column('health')[0] == before - 4
+    
+    player = Player(name="Test Hero", stats=Stats(health=100, max_health=100, attack=10, defense=5))
+    combat = CombatSystem(player=player, enemies=enemies[:1])
+    assert combat.enemies[0].to_enemy().stats.health == before - 4
+
+def test_bulk_operations():
+    """Test column-wide regeneration."""
+    store = EnemyStore()
+    golem = store.add("Golem", Stats(50, 100, 10, 4), level=1, attack_pattern=['attack', 'regenerate'])
+    spider = store.add("Spider", Stats(50, 100, 10, 4), level=1, attack_pattern=['attack'])
+    boss = store.add("Boss", Stats(50, 100, 10, 4), level=1, is_mini_boss=True)
+    
+    store.regenerate(30)
+    assert golem.stats.health == 80
+    assert spider.stats.health == 50
+    assert boss.stats.health == 50  # No regenerate ability
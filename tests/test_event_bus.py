@@ -0,0 +1,34 @@
+from entities import Stats, Player, Enemy
+from combat import CombatSystem
+from event_bus import EventBus, DamageDealt, EnemyDefeated, FightEnded, FightStarted, ShardsGained
+
+def test_bus_batches_by_topic():
+    """Test that events are queued per topic and delivered in order on flush."""
+    bus = EventBus()
+    bus.emit(ShardsGained, 5, 'idle')  # No subscribers: dropped
+    seen = []
+    bus.subscribe(ShardsGained, seen.append)
+    bus.subscribe(DamageDealt, lambda event: bus.emit(ShardsGained, event.amount, 'chain'))
+    bus.emit(ShardsGained, 1, 'event')
+    bus.emit(DamageDealt, 2)
+    assert seen == []  # Nothing delivered before the flush
+    assert bus.flush() == 3
+    assert [(e.amount, e.source) for e in seen] == [(1, 'event'), (2, 'chain')]
+
+    bus.unsubscribe(ShardsGained, seen.append)
+    assert not bus.wants(ShardsGained)
+    bus.emit(ShardsGained, 3, 'event')
+    assert bus.flush() == 0
+
+def test_combat_publishes_events(monkeypatch):
+    """Test that a fight reports its start, kills and outcome on the bus."""
+    monkeypatch.setattr('builtins.input', lambda prompt="": "attack")
+    bus = EventBus()
+    seen = []
+    for topic in (FightStarted, EnemyDefeated, FightEnded):
+        bus.subscribe(topic, seen.append)
+    player = Player(name="Hero", stats=Stats(100, 100, 50, 5))
+    enemy = Enemy(name="Slime", stats=Stats(10, 10, 1, 0))
+    survived, _ = CombatSystem(player, [enemy], bus=bus).run_combat()
+    assert survived
+    assert seen == [FightStarted(1, False), EnemyDefeated("Slime", 1, False), FightEnded(True, False, 0, 0)]
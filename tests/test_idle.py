@@ -0,0 +1,53 @@
+from entities import Player, Stats
+from game import GameManager
+from idle import IdleGenerator, OFFLINE_CAP_SECONDS, offline_shards
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def _upgrades(wells, echoes=0):
+    return {
+        'shard_well': {'value': 0.05, 'purchased': wells},
+        'echo_chamber': {'value': 0.5, 'purchased': echoes},
+    }
+
+def test_live_accrual_carries_fractions():
+    """Test per-frame ticks add up to the same shards as one long tick."""
+    clock = FakeClock()
+    idle = IdleGenerator(clock)
+    player = Player(name="Hero", stats=Stats(health=10, max_health=10, attack=1, defense=1))
+    upgrades = _upgrades(2)  # 0.1 shards per second
+    for _ in range(660):  # 60 frames per second for 11 seconds
+        clock.now += 1 / 60
+        idle.tick(player, upgrades)
+    assert player.memory_shards == 1
+    clock.now -= 5  # Clock stepping backwards earns nothing
+    assert idle.tick(player, upgrades) == 0
+
+def test_offline_gain_is_closed_form():
+    """Test offline gain is capped and costs the same for any span."""
+    upgrades = _upgrades(4, echoes=2)  # 0.4 shards per second live
+    assert offline_shards(upgrades, 100) == 0.4 * 0.5 * 100
+    month = 30 * 24 * 3600
+    assert offline_shards(upgrades, month) == offline_shards(upgrades, OFFLINE_CAP_SECONDS)
+    assert offline_shards(_upgrades(0), month) == 0
+
+def test_offline_gain_applied_on_load(tmp_path, monkeypatch):
+    """Test load_game credits shards for the time since the save."""
+    monkeypatch.chdir(tmp_path)
+    clock = FakeClock()
+    manager = GameManager()
+    manager.idle = IdleGenerator(clock)
+    manager.memory_forge_upgrades['shard_well']['purchased'] = 2
+    manager.save_game()
+
+    clock.now = 1000.0
+    loaded = GameManager()
+    loaded.idle = IdleGenerator(clock)
+    assert loaded.load_game()
+    assert loaded.player_entity.memory_shards == 50  # 0.1/s at half rate for 1000s
+    assert loaded.memory_forge_upgrades['shard_well']['purchased'] == 2
@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+
+from entities import Player, Stats, Item
+from inventory import Inventory, Stash, PickupRules, auto_pickup
+
+def make_potion(value=20):
+    return Item(template_id='health_potion', effect_value=value, rarity='common')
+
+def test_stacking_and_best_query():
+    """Test that identical items share a slot and best() tracks the top value."""
+    player = Player(name="Test Hero", stats=Stats(health=100, max_health=100, attack=10, defense=5),
+                    max_inventory=2)
+    for _ in range(3):
+        assert player.add_item(make_potion())
+    assert len(player.inventory) == 1
+    assert player.inventory.count(0) == 3
+    
+    assert player.add_item(make_potion(40))
+    assert player.inventory.best('heal').item.effect_value == 40
+    
+    # Slots are full, but matching items still stack
+    assert not player.can_add_item(make_potion(60))
+    assert player.can_add_item(make_potion())
+    
+    taken = player.inventory.take_best('heal')
+    assert taken.effect_value == 40
+    assert player.inventory.best('heal').item.effect_value == 20
+
+def test_auto_pickup_skips_past_full_slots():
+    """Test that pickup keeps going when a later item can still stack."""
+    player = Player(name="Test Hero", stats=Stats(health=100, max_health=100, attack=10, defense=5),
+                    max_inventory=1)
+    player.add_item(make_potion())
+    crystal = Item(template_id='damage_crystal', effect_value=15, rarity='rare')
+    picked, left = auto_pickup(player, [crystal, make_potion()], PickupRules())
+    assert left == [crystal]
+    assert len(picked) == 1
+    assert player.inventory.count(0) == 2
+
+def test_stash_persists_changed_buckets(tmp_path):
+    """Test that the stash round-trips and only rewrites touched buckets."""
+    stash = Stash(str(tmp_path), buckets=8)
+    for value in range(100):
+        stash.deposit(make_potion(value))
+    stash.save()
+    files = {path.name: path.stat().st_ino for path in tmp_path.iterdir()}
+    
+    reloaded = Stash(str(tmp_path), buckets=8)
+    assert reloaded.count(make_potion(7).stack_key) == 1
+    assert sum(count for _, count in reloaded.entries()) == 100
+    
+    item = reloaded.withdraw(make_potion(7).stack_key)
+    assert item == make_potion(7)
+    reloaded.save()
+    changed = [path.name for path in tmp_path.iterdir() if path.stat().st_ino != files[path.name]]
+    assert len(changed) == 1
+
+def test_stash_loot_survives_restart(tmp_path):
+    """Test that lazily registered loot reloads in a fresh process and ad-hoc items are purged."""
+    deposit = (
+        "from inventory import Stash\n"
+        "from entities import Item\n"
+        "from templates import intern_item_template, loot_item_template\n"
+        f"stash = Stash({str(tmp_path)!r}, buckets=8)\n"
+        "stash.deposit(Item(template_id=loot_item_template('health_potion'), effect_value=30, rarity='rare'))\n"
+        "stash.deposit(Item(template_id=intern_item_template('Odd Rock', 'Just a rock', 'heal'), effect_value=1))\n"
+        "stash.save()\n"
+    )
+    withdraw = (
+        "from inventory import Stash\n"
+        f"stash = Stash({str(tmp_path)!r}, buckets=8)\n"
+        "entries = list(stash.entries())\n"
+        "assert [key[0] for key, _ in entries] == ['loot_health_potion'], entries\n"
+        "print(stash.withdraw(entries[0][0]).name)\n"
+        "stash.save()\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.path.join(os.path.dirname(__file__), '..', 'src'))
+    subprocess.run([sys.executable, '-c', deposit], env=env, check=True)
+    result = subprocess.run([sys.executable, '-c', withdraw], env=env, check=True, capture_output=True, text=True)
+    assert result.stdout.strip() == "Rare Health Potion"
+    assert list(Stash(str(tmp_path), buckets=8).entries()) == []
@@ -0,0 +1,100 @@
+import save_format
+from event_bus import ShardsGained, UpgradePurchased
+from game import GameManager
+from journal import Journal
+from save_service import SAVES
+
+def test_journal_appends_and_compacts(tmp_path):
+    """Test sequencing, torn-line tolerance and truncation."""
+    path = tmp_path / "journal.log"
+    journal = Journal(str(path))
+    for shards in (10, 20, 30):
+        journal.append('shards', shards)
+    journal.close()
+    with open(path, 'a') as f:
+        f.write('[4,"shar')  # Crash mid-append
+
+    reopened = Journal(str(path))
+    assert reopened.seq == 3
+    assert [record[2] for record in reopened.records(after=1)] == [20, 30]
+    assert reopened.append('shards', 40) == 4
+    assert [record[2] for record in reopened.records()] == [10, 20, 30, 40]  # Not glued to the torn line
+    reopened.truncate(2)
+    assert list(reopened.records()) == [[3, 'shards', 30], [4, 'shards', 40]]
+
+def test_progress_replays_after_last_save(tmp_path, monkeypatch):
+    """Test that load_game rebuilds progress from the save plus the journal."""
+    monkeypatch.chdir(tmp_path)
+    manager = GameManager()
+    manager.save_game()
+    manager.player_entity.memory_shards = 500
+    manager.bus.emit(ShardsGained, 500, 'event')
+    manager.memory_forge_upgrades['shard_well']['purchased'] = 1
+    manager.bus.emit(UpgradePurchased, 'shard_well', 1)
+    manager.bus.flush()
+    SAVES.wait()
+    assert manager.journal.size > 0  # Not compacted: no full save since
+
+    loaded = GameManager()
+    assert loaded.load_game()
+    assert loaded.player_entity.memory_shards == 500
+    assert loaded.memory_forge_upgrades['shard_well']['purchased'] == 1
+
+    loaded.journal.compact_bytes = 1  # Every change now triggers a compaction
+    loaded.player_entity.memory_shards = 600
+    loaded.bus.emit(ShardsGained, 100, 'event')
+    loaded.bus.flush()
+    SAVES.wait()
+    assert loaded.journal.size == 0 and not loaded.journal.compacting
+    again = GameManager()
+    assert again.load_game()
+    assert again.player_entity.memory_shards == 600
+
+def test_progress_survives_compaction_and_restart(tmp_path, monkeypatch):
+    """Test that a session after a compaction numbers its records after the save's seq."""
+    monkeypatch.chdir(tmp_path)
+    first = GameManager()
+    for shards in (100, 200, 300):
+        first.player_entity.memory_shards = shards
+        first.bus.emit(ShardsGained, 100, 'event')
+        first.bus.flush()
+    first.save_game()
+    SAVES.wait()
+    first.journal.close()
+    assert first.journal.size == 0  # Compacted: the save holds journal_seq 3
+
+    second = GameManager()
+    assert second.load_game()
+    second.player_entity.memory_shards = 600
+    second.bus.emit(ShardsGained, 300, 'event')
+    second.bus.flush()
+    second.journal.close()
+
+    third = GameManager()
+    assert third.load_game()
+    assert third.player_entity.memory_shards == 600
+
+def test_failed_compaction_is_retried(tmp_path, monkeypatch):
+    """Test that a compacting save that fails lets the next change compact again."""
+    monkeypatch.chdir(tmp_path)
+    manager = GameManager()
+    manager.journal.compact_bytes = 1
+    encode = save_format.encode
+
+    def full_disk(sections):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(save_format, 'encode', full_disk)
+    manager.bus.emit(ShardsGained, 100, 'event')
+    manager.bus.flush()
+    SAVES.wait()
+    assert SAVES.take_errors()
+    assert not manager.journal.compacting and manager.journal.size > 0
+
+    monkeypatch.setattr(save_format, 'encode', encode)
+    manager.player_entity.memory_shards = 200
+    manager.bus.emit(ShardsGained, 100, 'event')
+    manager.bus.flush()
+    SAVES.wait()
+    assert manager.journal.size == 0 and not manager.journal.compacting
+    manager.journal.close()
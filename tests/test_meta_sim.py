@@ -0,0 +1,15 @@
+import csv
+from meta_sim import FIELDS, first_run_reaching, simulate_player, write_csv
+
+def test_simulated_player_progression(tmp_path, monkeypatch):
+    """Test that a simulated player's rows form a progression curve."""
+    monkeypatch.chdir(tmp_path)
+    rows = simulate_player((0, 'greedy', 5, 3))
+    assert [row['run'] for row in rows] == [1, 2, 3, 4, 5]
+    owned = [row['upgrades_owned'] for row in rows]
+    assert owned == sorted(owned)  # Upgrades are never lost
+    assert first_run_reaching(rows, 'upgrades_owned', owned[-1])[0] <= 5
+
+    write_csv(rows, 'progression.csv')
+    with open('progression.csv') as f:
+        assert next(csv.reader(f)) == FIELDS
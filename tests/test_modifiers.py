@@ -0,0 +1,40 @@
+from entities import Stats, Player, Enemy, Item
+from effects import compile_effect
+from modifiers import Modifier, COMBAT, RUN
+
+def test_modifier_stack():
+    """Test that modifiers update cached stats and expire by lifetime."""
+    player = Player(
+        name="Test Hero",
+        stats=Stats(health=100, max_health=100, attack=10, defense=5)
+    )
+    modifiers = player.modifiers
+
+    modifiers.add(Modifier('attack', 5, 'upgrade:attack'))
+    modifiers.add(Modifier('defense', 2, 'status:guard', COMBAT))
+    Item(name="Power Shard", description="", effect_type='attack', effect_value=3).use(player)
+    assert (player.stats.attack, player.stats.defense) == (18, 7)
+
+    modifiers.expire(COMBAT)
+    modifiers.expire(RUN)
+    assert (player.stats.attack, player.stats.defense) == (15, 5)
+
+    # Lowering max health clamps current health
+    modifiers.add(Modifier('max_health', -30, 'curse'))
+    assert player.stats.health == player.stats.max_health == 70
+
+def test_run_bonus_does_not_compound():
+    """Test that setting a source's bonus repeatedly applies it once."""
+    player = Player(
+        name="Test Hero",
+        stats=Stats(health=100, max_health=100, attack=10, defense=5)
+    )
+    for _ in range(5):
+        player.modifiers.set('run:battle_mastery', 'attack', 3)
+    assert player.stats.attack == 13
+    assert not player.modifiers.set('run:battle_mastery', 'attack', 3)
+
+    # Enemies have no modifier stack, so 'mod.' writes to their stats
+    enemy = Enemy(name="Dummy", stats=Stats(10, 10, 1, 1))
+    compile_effect("mod.attack += 4").apply(enemy)
+    assert enemy.stats.attack == 5
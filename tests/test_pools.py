@@ -0,0 +1,52 @@
+from entities import Item
+from game import GameManager
+from pools import ObjectPool, ROOM_POOL, ENEMY_POOL, release_world
+from world_gen import WorldGenerator
+
+def test_pool_counters():
+    """Test hit/miss and high-water accounting."""
+    pool = ObjectPool('test', factory=list, reset=list.clear)
+    first = pool.acquire()
+    second = pool.acquire()
+    first.append(1)
+    pool.release(first)
+    assert pool.acquire() is first
+    assert first == []
+    assert pool.stats()['hits'] == 1
+    assert pool.stats()['misses'] == 2
+    assert pool.stats()['high_water'] == 2
+
+def test_world_reuse():
+    """Test that released worlds are reset and reused."""
+    world_gen = WorldGenerator(depth=3, width=3)
+    _, rooms = world_gen.generate_world()
+    release_world(rooms)
+    assert all(not room.connections and not room.enemies for room in rooms)
+    
+    hits = ROOM_POOL.hits
+    _, new_rooms = world_gen.generate_world()
+    assert ROOM_POOL.hits >= hits + 9
+    assert len(new_rooms) == 9
+
+def test_item_kill_is_a_defeat(tmp_path, monkeypatch):
+    """Test that an enemy killed by a thrown item is counted and released with the world."""
+    monkeypatch.chdir(tmp_path)
+    manager = GameManager(journal=False)
+    room = manager.current_room
+    enemy = manager.world_gen.generate_enemy(difficulty=1)
+    enemy.stats.health = 1
+    room.room_type, room.visited, room.enemies = 'combat', False, [enemy]
+    manager.player_entity.inventory.clear()
+    manager.player_entity.add_item(Item(template_id='damage_crystal', effect_value=50))
+    answers = iter(["use 1", "1"])
+    monkeypatch.setattr('builtins.input', lambda prompt="": next(answers))
+
+    manager.show_inventory()
+    manager.bus.flush()
+    assert room.enemies == [] and manager.spent_enemies == [enemy]
+    assert manager.enemies_defeated == 1
+    assert manager.run_stats.run['total_damage_dealt'] >= 1
+
+    releases = ENEMY_POOL.releases + sum(len(room.enemies) for room in manager.all_rooms)
+    manager._release_world()
+    assert ENEMY_POOL.releases == releases + 1  # The room enemies and the one killed
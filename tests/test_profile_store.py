@@ -0,0 +1,66 @@
+import sqlite3
+
+from entities import Item
+from game import GameManager
+from profile_store import ProfileStore
+from save_service import SAVES
+from templates import loot_item_template
+
+def test_profiles_round_trip(tmp_path, monkeypatch):
+    """Test that profiles save and load independently through GameManager."""
+    monkeypatch.chdir(tmp_path)
+    store = ProfileStore(str(tmp_path / "profiles.db"), pool_size=2)
+    alice = GameManager(profile='alice', profile_store=store)
+    alice.player_entity.memory_shards = 120
+    alice.memory_forge_upgrades['attack']['purchased'] = 3
+    alice.save_game()
+    bob = GameManager(profile='bob', profile_store=store)
+    bob.player_entity.memory_shards = 7
+    bob.save_game()
+    SAVES.wait()
+
+    loaded = GameManager(profile='alice', profile_store=store)
+    assert loaded.load_game()
+    assert loaded.player_entity.memory_shards == 120
+    assert loaded.memory_forge_upgrades['attack']['purchased'] == 3
+    assert not GameManager(profile='carol', profile_store=store).load_game()
+
+    store.update_stash('bob', [(('loot_health_potion', 'rare', 40, None), 2), (('void_shard', 'legendary', 9, 3), 1)])
+    store.update_stash('bob', [(('void_shard', 'legendary', 9, 3), 0)])
+    assert store.stash('bob') == [(('loot_health_potion', 'rare', 40, None), 2)]
+    assert store.stash('alice') == []
+    store.close()
+
+def test_profiles_keep_separate_stashes(tmp_path, monkeypatch):
+    """Test that each profile's stash lives in its own rows."""
+    monkeypatch.chdir(tmp_path)
+    store = ProfileStore(str(tmp_path / "profiles.db"), pool_size=2)
+    potion = Item(template_id=loot_item_template('health_potion'), effect_value=30, rarity='rare')
+    alice = GameManager(profile='alice', profile_store=store)
+    alice.stash.deposit(potion, 2)
+    alice.stash.save()
+    assert store.stash('alice') == [(potion.stack_key, 2)]
+    assert list(GameManager(profile='bob', profile_store=store).stash.entries()) == []
+    assert list(GameManager(journal=False).stash.entries()) == []
+
+    again = GameManager(profile='alice', profile_store=store)
+    assert again.stash.withdraw(potion.stack_key).effect_value == 30
+    again.stash.save()
+    assert store.stash('alice') == [(potion.stack_key, 1)]
+    again.stash.withdraw(potion.stack_key)
+    again.stash.save()
+    assert store.stash('alice') == []
+    store.close()
+
+def test_readers_not_blocked_by_writer(tmp_path):
+    """Test that WAL lets a read proceed while a write transaction is open."""
+    path = str(tmp_path / "profiles.db")
+    store = ProfileStore(path, pool_size=2)
+    store.save_profile('alice', {'player': {'memory_shards': 1}, 'upgrades': {}})
+    writer = sqlite3.connect(path, isolation_level=None, timeout=0)
+    writer.execute("BEGIN IMMEDIATE")
+    writer.execute("UPDATE profiles SET memory_shards = 2 WHERE id = 'alice'")
+    assert store.load_profile('alice')['player']['memory_shards'] == 1  # Sees the last commit
+    writer.execute("COMMIT")
+    writer.close()
+    store.close()
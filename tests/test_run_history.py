@@ -0,0 +1,61 @@
+import sqlite3
+
+from game import GameManager
+from run_history import COLUMNS, METRICS, SELECT_RUNS, RunHistory, RunRecord
+
+def run(profile, seed, shards, rooms=5, enemies=3, tier=1, cause="Lvl 2 Void Stalker", minutes=1.0):
+    return RunRecord(profile, seed, 0.0, minutes * 60, cause, tier, rooms, enemies, shards,
+                     100, 80, 4, 80, 10, 5)
+
+def test_leaderboards_use_indexes(tmp_path):
+    """Test leaderboard, personal best and seed queries, and that none of them scans or sorts the table."""
+    history = RunHistory(str(tmp_path / "history.db"))
+    history.record_many(run(profile, seed, shards, rooms=shards % 7)
+                        for profile, seed, shards in [('alice', 1, 50), ('bob', 1, 90), ('alice', 2, 70),
+                                                      ('carol', 3, 20), ('bob', 2, 10)])
+    assert [r.shards_earned for r in history.leaderboard(limit=3)] == [90, 70, 50]
+    assert [r.profile for r in history.seed_runs(1)] == ['bob', 'alice']
+    assert history.personal_best('alice').seed == 2
+    assert history.personal_bests('bob') == {'shards_earned': 90, 'rooms_explored': 6, 'enemies_defeated': 3}
+    assert history.personal_best('dave') is None
+
+    for metric in METRICS:
+        for where, params in (("", ()), ("WHERE profile = ?", ('alice',)), ("WHERE seed = ?", (1,))):
+            if where.startswith("WHERE seed") and metric != 'shards_earned':
+                continue  # A seed's runs are few; only the default order is indexed
+            plan = [row[-1] for row in history._db.execute(
+                f"EXPLAIN QUERY PLAN {SELECT_RUNS} {where} ORDER BY {metric} DESC LIMIT 10", params)]
+            assert all('INDEX' in step and 'TEMP B-TREE' not in step for step in plan), plan
+    history.close()
+
+def test_death_records_run(tmp_path, monkeypatch):
+    """Test that handle_death records the run with its seed and cause."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('builtins.input', lambda prompt="": "")
+    manager = GameManager()
+    manager.run_stats.on_run_start()
+    manager.run_seed = 1234
+    manager.rooms_explored = 6
+    manager.handle_death("Mini-Boss: Shard Golem")
+
+    best = manager.history.personal_best('')
+    assert best.seed == 1234 and best.cause == "Mini-Boss: Shard Golem"
+    assert best.rooms_explored == 6 and best.shards_earned == 6 * 10 + 5
+    assert manager.history.seed_runs(1234) == [best] and best.upgrade_tier == 0
+    manager.history.close()
+
+def test_history_schema_migrates(tmp_path):
+    """Test that a history from before upgrade tiers were recorded gains the column."""
+    path = str(tmp_path / "history.db")
+    old = sqlite3.connect(path)
+    old.execute(f"CREATE TABLE runs (id INTEGER PRIMARY KEY, "
+                f"{', '.join(name for name in COLUMNS if name != 'upgrade_tier')})")
+    old.execute("INSERT INTO runs (profile, seed, ended, duration, cause, rooms_explored, enemies_defeated, "
+                "shards_earned, damage_dealt, damage_taken, fights, max_health, attack, defense) "
+                "VALUES ('', 7, 0, 60, 'Trapped Chest', 4, 2, 50, 30, 90, 2, 80, 10, 5)")
+    old.commit()
+    old.close()
+    history = RunHistory(path)
+    history.record(run('', 8, 60, tier=2))
+    assert [(r.seed, r.upgrade_tier) for r in history.leaderboard()] == [(8, 2), (7, 0)]
+    history.close()
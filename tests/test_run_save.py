@@ -0,0 +1,54 @@
+import random
+import time
+
+import save_format
+from game import GameManager
+from pools import release_world
+from run_save import capture_run, restore_run
+from world_gen import WorldGenerator
+
+def _layout(manager):
+    index = {id(room): i for i, room in enumerate(manager.all_rooms)}
+    return [
+        (room.room_type, room.visited, [enemy.name for enemy in room.enemies],
+         [item.stack_key for item in room.items],
+         {direction: index[id(other)] for direction, other in room.connections.items()})
+        for room in manager.all_rooms
+    ]
+
+def test_run_round_trips_through_save(tmp_path, monkeypatch):
+    """Test that the world, inventory, counters and RNG survive a save and restore."""
+    monkeypatch.chdir(tmp_path)
+    random.seed(5)
+    manager = GameManager()
+    manager.current_room = manager.all_rooms[3]
+    manager.all_rooms[0].visited = True
+    manager.player_entity.add_item(manager.world_gen.generate_legendary_item())
+    manager.run_stats.run['rooms_explored'] = 4
+    path = tmp_path / "run.dat"
+    path.write_bytes(save_format.encode(capture_run(manager)))
+    expected_roll = random.random()
+
+    resumed = GameManager()
+    release_world(resumed.all_rooms)
+    with save_format.SaveFile.open(str(path)) as save:
+        restore_run(resumed, save)
+    assert _layout(resumed) == _layout(manager)
+    assert resumed.all_rooms.index(resumed.current_room) == 3
+    assert [s.item.stack_key for s in resumed.player_entity.inventory.stacks] == \
+           [s.item.stack_key for s in manager.player_entity.inventory.stacks]
+    assert resumed.rooms_explored == 4
+    assert random.random() == expected_roll
+
+def test_capture_is_fast_enough_to_autosave(tmp_path, monkeypatch):
+    """Test that capturing a 10x10 world stays well under the 5 ms autosave budget."""
+    monkeypatch.chdir(tmp_path)
+    manager = GameManager()
+    manager.world_gen = WorldGenerator(depth=10, width=10)
+    release_world(manager.all_rooms)
+    manager.current_room, manager.all_rooms = manager.world_gen.generate_world()
+    capture_run(manager)  # Warm up
+    start = time.perf_counter()
+    for _ in range(20):
+        capture_run(manager)
+    assert (time.perf_counter() - start) / 20 < 0.005
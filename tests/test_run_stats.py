@@ -0,0 +1,59 @@
+from entities import Stats, Player, Enemy
+from combat import CombatSystem
+from event_bus import EventBus, ShardsGained
+from run_stats import RunStats, RollingMean
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def test_run_stats_counters():
+    """Test run and lifetime counters and the rolling aggregates."""
+    clock = FakeClock()
+    stats = RunStats(rate_window=60.0, clock=clock)
+    for damage in (10, 30):
+        stats.on_fight_start()
+        stats.on_damage_dealt(damage)
+        stats.on_fight_end()
+    stats.on_shards(50)
+    clock.now = 30.0
+    assert stats.mean_damage_per_fight == 20
+    assert stats.shards_per_minute == 100
+    clock.now = 90.0
+    assert stats.shards_per_minute == 0  # Outside the window
+
+    stats.on_run_end()
+    stats.on_run_start()
+    assert stats.run['fights'] == 0
+    assert stats.lifetime['fights'] == 2
+    assert stats.lifetime['deaths'] == 1 and stats.lifetime['play_time'] == 90.0
+
+    restored = RunStats()
+    restored.load(stats.to_dict())
+    assert restored.lifetime == stats.lifetime
+
+    window = RollingMean(window=2)
+    for value in (1, 2, 6):
+        window.add(value)
+    assert window.mean == 4
+
+def test_combat_hooks(monkeypatch):
+    """Test that combat reports fights, damage and defeated enemies through the bus."""
+    monkeypatch.setattr('builtins.input', lambda prompt="": "attack")
+    player = Player(name="Hero", stats=Stats(100, 100, 50, 5))
+    enemy = Enemy(name="Slime", stats=Stats(10, 10, 1, 0))
+    stats = RunStats()
+    bus = EventBus()
+    stats.attach(bus)
+    survived, _ = CombatSystem(player, [enemy], bus).run_combat()
+    assert survived
+    assert stats.run['fights'] == 1 and stats.run['enemies_defeated'] == 1
+    assert stats.mean_damage_per_fight == stats.run['total_damage_dealt'] >= 48
+
+    bus.emit(ShardsGained, 30, 'event')
+    bus.emit(ShardsGained, 7, 'idle')
+    bus.flush()
+    assert stats.run['memory_shards_collected'] == 30
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+
+import save_format
+from save_format import SaveFile, SaveFormatError
+from game import GameManager
+
+def test_sections_decode_lazily(tmp_path):
+    """Test round-tripping, compression and decoding only the sections accessed."""
+    path = tmp_path / "save.dat"
+    history = [{'run': i, 'rooms': i % 7} for i in range(500)]
+    data = save_format.encode({'player': {'memory_shards': 42}, 'history': history})
+    path.write_bytes(data)
+    assert len(data) < len(json.dumps(history)) // 4  # The big section is compressed
+
+    with SaveFile.open(str(path)) as save:
+        assert save['player'] == {'memory_shards': 42}
+        assert 'history' in save and 'history' not in save._decoded
+        assert save['history'] == history
+
+    path.write_bytes(data[:4] + (save_format.VERSION + 1).to_bytes(2, 'little') + data[6:])
+    with pytest.raises(SaveFormatError):
+        SaveFile.open(str(path))
+
+def test_unreadable_saves_are_set_aside(tmp_path, monkeypatch, capsys):
+    """Test that a corrupt or future save is moved aside and the game starts fresh."""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "saves").mkdir()
+    (tmp_path / "saves" / "save.dat").write_bytes(b"this is not a save file")
+    manager = GameManager()
+    assert not manager.load_game()
+    assert "not a save file" in capsys.readouterr().out
+    assert (tmp_path / "saves" / "save.dat.unreadable").read_bytes() == b"this is not a save file"
+    assert not (tmp_path / "saves" / "save.dat").exists()
+
+    data = save_format.encode({'world': {}, 'run': {}})
+    (tmp_path / manager.run_path).write_bytes(data[:-2])  # Header intact, a section cut short
+    assert manager.has_saved_run()
+    assert not manager.continue_run()
+    assert "is corrupt" in capsys.readouterr().out
+    assert not manager.has_saved_run()
+
+def test_legacy_json_save_migrates(tmp_path, monkeypatch):
+    """Test that a flat JSON save loads, and survives export and import."""
+    monkeypatch.chdir(tmp_path)
+    manager = GameManager()
+    upgrades = {key: dict(upgrade) for key, upgrade in manager.memory_forge_upgrades.items()}
+    upgrades['attack']['purchased'] = 2
+    legacy = {
+        'player': {'stats': {'health': 50, 'max_health': 80, 'attack': 20, 'defense': 5},
+                   'memory_shards': 300},
+        'upgrades': upgrades,
+    }
+    (tmp_path / "saves").mkdir()
+    (tmp_path / "saves" / "save.json").write_text(json.dumps(legacy))
+
+    loaded = GameManager()
+    assert loaded.load_game()
+    assert loaded.memory_forge_upgrades['attack']['purchased'] == 2
+    assert loaded.player_entity.stats.attack == 20 and loaded.player_entity.memory_shards == 300
+
+    loaded.save_game()
+    assert loaded.load_game()  # Waits for the binary save
+    save_format.export_json('saves/save.dat', 'export.json')
+    save_format.import_json('export.json', 'copy.dat')
+    with SaveFile.open('copy.dat') as copy:
+        assert copy['upgrades']['attack'] == 2
+        assert copy['player']['memory_shards'] == 300
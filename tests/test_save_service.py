@@ -0,0 +1,71 @@
+import json
+import threading
+
+import save_format
+from game import GameManager
+from save_service import SAVES, SaveService, write_atomic
+
+def test_write_atomic_replaces_file(tmp_path):
+    """Test that the target is replaced whole and no temp files are left behind."""
+    path = tmp_path / "save.json"
+    write_atomic(str(path), b"old")
+    write_atomic(str(path), b"new")
+    assert path.read_bytes() == b"new"
+    assert [p.name for p in tmp_path.iterdir()] == ["save.json"]
+
+def test_save_requests_coalesce(tmp_path):
+    """Test that a burst of saves to one path becomes a single write of the latest snapshot."""
+    service = SaveService(delay=0.2)
+    path = str(tmp_path / "save.json")
+    caller = threading.current_thread()
+    encoded_on = []
+
+    def encode(data):
+        encoded_on.append(threading.current_thread())
+        return json.dumps(data).encode()
+
+    for shards in range(50):
+        service.submit(path, {'memory_shards': shards}, encode)
+    assert service.wait(path, timeout=5)
+    assert json.loads(open(path).read()) == {'memory_shards': 49}
+    assert service.writes == 1 and not service.errors
+    assert caller not in encoded_on  # Serialized and written off the calling thread
+    service.close()
+
+def test_failed_writes_are_reported(tmp_path, caplog):
+    """Test that a failed write is logged, kept until taken and handed to on_failed."""
+    service = SaveService(delay=0)
+    path = str(tmp_path / "save.json")
+    failed = []
+
+    def encode(data):
+        raise OSError(28, "No space left on device")
+
+    service.submit(path, {'memory_shards': 1}, encode, on_written=lambda: failed.append('written'),
+                   on_failed=failed.append)
+    assert service.wait(path, timeout=5)
+    assert [type(error) for error in failed] == [OSError]
+    assert "Saving" in caplog.text and path in caplog.text
+    assert service.take_errors(str(tmp_path / "other.json")) == []
+    assert [(p, str(error)) for p, error in service.take_errors(path)] == [(path, "[Errno 28] No space left on device")]
+    assert service.take_errors() == []
+
+    service.submit(path, {'memory_shards': 2}, encode)
+    assert [p for p, _ in service.close()] == [path]
+    assert not service.errors
+
+def test_game_warns_about_lost_saves(tmp_path, monkeypatch, capsys):
+    """Test that GameManager tells the player when a background save failed."""
+    monkeypatch.chdir(tmp_path)
+    manager = GameManager(journal=False)
+
+    def full_disk(sections):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(save_format, 'encode', full_disk)
+    manager.save_game()
+    SAVES.wait()
+    capsys.readouterr()
+    assert not manager.load_game()
+    assert "could not save" in capsys.readouterr().out
+    assert not SAVES.errors
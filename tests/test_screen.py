@@ -0,0 +1,60 @@
+import io
+import sys
+
+import screen
+from screen import Screen
+from utils import Fore, Style, clear_screen, print_colored
+
+def frame(term, *lines, prompt="Choose action: "):
+    term.clear()
+    for line in lines:
+        print(line, file=term)
+    term.write(prompt)
+    out = term.stream
+    out.seek(0)
+    out.truncate()
+    term.flush()  # As input() does
+    return out.getvalue()
+
+def test_only_changed_lines_are_redrawn():
+    """Test that a new frame rewrites only the rows that differ, in one write."""
+    term = Screen(io.StringIO(), size=lambda: (80, 24))
+    first = frame(term, "=== COMBAT ROOM ===", "You: Hero [HP: 80/80]", "Exits: north, east")
+    assert first.startswith(screen.HOME + screen.ERASE_SCREEN) and "Exits: north, east" in first
+
+    second = frame(term, "=== COMBAT ROOM ===", "You: Hero [HP: 64/80]", "Exits: north, east")
+    assert "HP: 64/80" in second and "COMBAT ROOM" not in second and "Exits" not in second
+    assert "\x1b[2;1H" in second  # Row 2, rewritten in place
+    assert "Choose action" in second  # Redrawn to wipe the last answer typed there
+
+    third = frame(term, "=== TREASURE ROOM ===")
+    assert screen.ERASE_BELOW in third and "TREASURE" in third
+
+def test_oversized_frames_scroll():
+    """Test that a frame taller than the terminal is written out plainly, then redrawn in full."""
+    term = Screen(io.StringIO(), size=lambda: (80, 5))
+    out = frame(term, *(f"line {i}" for i in range(10)))
+    assert "line 0\nline 1\n" in out and "\x1b[1;1H" not in out
+    term.stream.seek(0)
+    term.stream.truncate()
+    print("You hit for 5 damage", file=term)
+    term.flush()
+    assert term.stream.getvalue() == "You hit for 5 damage\n"  # Appended below the answered prompt
+    assert frame(term, "short").startswith(screen.HOME + screen.ERASE_SCREEN)
+
+def test_no_color_and_no_tty(monkeypatch):
+    """Test that colors can be stripped, and that clear_screen leaves non-terminal output alone."""
+    term = Screen(io.StringIO(), color=False, size=lambda: (80, 24))
+    term.clear()
+    term.write(f"{Fore.RED}Danger{Fore.RESET}")
+    term.flush()
+    assert "Danger" in term.stream.getvalue() and Fore.RED not in term.stream.getvalue()
+
+    stdout = io.StringIO()
+    monkeypatch.setattr(sys, 'stdout', stdout)
+    monkeypatch.setattr('os.system', lambda command: 1 / 0)  # No clear subprocess
+    clear_screen()
+    assert sys.stdout is stdout and stdout.getvalue() == ""
+    print_colored("\n=== STASH ===", Fore.CYAN, bold=True)
+    assert stdout.getvalue().split('\n')[0] == ""  # Each line carries its own style
+    assert stdout.getvalue().split('\n')[1].startswith(Style.BRIGHT + Fore.CYAN)
@@ -0,0 +1,93 @@
+import pytest
+
+from entities import Player, Stats, Item
+from game import GameManager
+from idle import IdleGenerator
+from snapshots import Timeline
+from world_gen import WorldGenerator
+
+def test_rewind_restores_touched_state():
+    """Test rewinding rooms and the player across several snapshots."""
+    player = Player(name="Test Hero", stats=Stats(health=100, max_health=100, attack=10, defense=5))
+    _, rooms = WorldGenerator(depth=2, width=2).generate_world()
+    first, second = rooms[0], rooms[1]
+    timeline = Timeline(max_snapshots=3)
+    
+    timeline.snapshot("start", current_room=first)
+    timeline.touch(player)
+    timeline.touch(first)
+    player.stats.health = 40
+    player.memory_shards = 25
+    first.visited = True
+    
+    timeline.snapshot("second", current_room=second)
+    timeline.touch(player)
+    timeline.touch(second)
+    player.add_item(Item(template_id='health_potion', effect_value=20, rarity='common'))
+    player.stats.health = 10
+    second.visited = True
+    second.enemies.clear()
+    
+    state = timeline.rewind()
+    assert state['current_room'] is second
+    assert player.stats.health == 40
+    assert len(player.inventory) == 0
+    assert not second.visited
+    
+    state = timeline.rewind(1)
+    assert state['current_room'] is first
+    assert player.stats.health == 100
+    assert player.memory_shards == 0
+    assert not first.visited
+    assert len(timeline) == 1
+
+def test_what_if_branch():
+    """Test that a what-if branch leaves no trace."""
+    player = Player(name="Test Hero", stats=Stats(health=100, max_health=100, attack=10, defense=5))
+    timeline = Timeline()
+    with timeline.what_if():
+        timeline.touch(player)
+        player.stats.take_damage(50)
+    assert player.stats.health == 100
+    assert len(timeline) == 0
+
+def test_resurrect_needs_item_from_before_the_room(tmp_path, monkeypatch):
+    """Test that a Phoenix Elixir picked up in the current room can't pay for rewinding it."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('builtins.input', lambda prompt="": "")
+    manager = GameManager()
+    manager.timeline.snapshot("combat", current_room=manager.current_room, enemies_defeated=0, rooms_explored=1)
+    manager.timeline.touch(manager.player_entity)
+    manager.player_entity.add_item(Item(template_id='phoenix_elixir', effect_value=100, rarity='legendary'))
+    assert not manager.try_resurrect()
+    assert len(manager.timeline) == 1 and len(manager.player_entity.inventory) == 1  # No free rewind
+
+    manager.timeline.snapshot("next room", current_room=manager.current_room, enemies_defeated=0, rooms_explored=2)
+    manager.timeline.touch(manager.player_entity)
+    manager.player_entity.stats.health = 0
+    assert manager.try_resurrect()
+    assert manager.rooms_explored == 2 and len(manager.player_entity.inventory) == 0
+
+def test_rewind_drops_idle_shards_credited_in_the_room(tmp_path, monkeypatch):
+    """Test that shards credited on entering a room are undone by rewinding to it."""
+    monkeypatch.chdir(tmp_path)
+    manager = GameManager(journal=False)
+    manager.memory_forge_upgrades['shard_well']['purchased'] = 5
+    now = [0.0]
+    manager.idle = IdleGenerator(clock=lambda: now[0])
+    room = manager.current_room
+    room.room_type, room.visited, room.items, room.enemies = 'treasure', False, [], []
+    now[0] = 600.0  # Ten minutes of Shard Wells, credited on the room's first update
+
+    class Stop(Exception):
+        pass
+
+    def stop(prompt=""):
+        raise Stop
+
+    monkeypatch.setattr('builtins.input', stop)
+    with pytest.raises(Stop):
+        manager.handle_room()
+    assert manager.player_entity.memory_shards > 0
+    manager.timeline.rewind()
+    assert manager.player_entity.memory_shards == 0
@@ -0,0 +1,62 @@
+import pytest
+from upgrades import UpgradeGraph, plan_best_value, plan_cheapest
+
+def make_upgrade(tier=1, max_purchases=1, cost=100, requires=None):
+    upgrade = {'name': '', 'description': '', 'cost': cost, 'value': 1,
+               'purchased': 0, 'max_purchases': max_purchases, 'tier': tier}
+    if requires:
+        upgrade['requires'] = requires
+    return upgrade
+
+def test_upgrade_graph_availability():
+    """Test that purchases unlock dependents and update tiers incrementally."""
+    upgrades = {
+        'mastery': make_upgrade(tier=2, requires={'attack': 2, 'defense': 1}),
+        'attack': make_upgrade(max_purchases=3),
+        'defense': make_upgrade(),
+    }
+    graph = UpgradeGraph(upgrades)
+    assert graph.order.index('mastery') > graph.order.index('attack')
+    assert graph.open_by_tier() == {1: ['attack', 'defense'], 2: ['mastery']}
+    assert not graph.is_available('mastery')
+
+    assert graph.purchase('attack') == []
+    assert graph.purchase('defense') == []
+    assert graph.purchase('attack') == ['mastery']
+    assert graph.is_available('mastery')
+    assert graph.open_by_tier() == {1: ['attack'], 2: ['mastery']}
+    assert graph.difficulty_tier == 1
+
+    # Rebuilding from the same dicts gives the same derived state
+    rebuilt = UpgradeGraph(upgrades)
+    assert rebuilt.unmet == graph.unmet
+    assert rebuilt.total_purchased == graph.total_purchased == 3
+
+def test_upgrade_graph_errors():
+    """Test that unknown requirements and cycles are rejected."""
+    with pytest.raises(ValueError):
+        UpgradeGraph({'a': make_upgrade(requires={'missing': 1})})
+    with pytest.raises(ValueError):
+        UpgradeGraph({'a': make_upgrade(requires={'b': 1}), 'b': make_upgrade(requires={'a': 1})})
+
+def test_upgrade_planner():
+    """Test the cheapest path and best-value plans on a small tree."""
+    upgrades = {
+        'attack': make_upgrade(max_purchases=3, cost=100),
+        'defense': make_upgrade(max_purchases=3, cost=150),
+        'mastery': make_upgrade(tier=2, cost=500, requires={'attack': 2, 'defense': 1}),
+    }
+    assert plan_cheapest(upgrades, 'mastery') == (850, ['attack', 'attack', 'defense', 'mastery'])
+    upgrades['attack']['purchased'] = 1
+    assert plan_cheapest(upgrades, 'mastery') == (750, ['attack', 'defense', 'mastery'])
+    assert plan_cheapest(upgrades, 'attack', count=4) is None
+
+    # Mastery is worth more than everything else combined but needs its chain
+    value, purchases = plan_best_value(upgrades, 800, {'attack': 1, 'defense': 1, 'mastery': 10})
+    assert value == 12 and purchases == ['attack', 'defense', 'mastery']
+    value, purchases = plan_best_value(upgrades, 400)
+    assert value == 3 and purchases == ['attack', 'attack', 'defense']
+    # More than the whole tree costs buys everything; worthless upgrades are skipped
+    value, purchases = plan_best_value(upgrades, 10_000)
+    assert value == 6 and sorted(purchases) == ['attack', 'attack', 'defense', 'defense', 'defense', 'mastery']
+    assert plan_best_value(upgrades, 10_000, {'attack': -1}) == (0, [])